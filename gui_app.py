@@ -10,15 +10,16 @@ import networkx as nx
 
 from src.core.graph import Graph, GraphType
 from src.algorithms.traversal import bfs, dfs
-from src.algorithms.shortest_path import dijkstra, bellman_ford, find_shortest_path
+from src.algorithms.shortest_path import dijkstra, bellman_ford, find_shortest_path, euclidean_heuristic
 from src.algorithms.bipartite import is_bipartite, get_bipartite_sets
 from src.algorithms.minimum_spanning_tree import prim, kruskal
 from src.algorithms.max_flow import ford_fulkerson
 from src.algorithms.eulerian import is_eulerian, fleury, hierholzer
-from src.core.representations import AdjacencyMatrix, AdjacencyList, EdgeList
+from src.core.representations import convert_representation
 from src.core.file_io import save_graph, load_graph
+from src.core.journal import GraphJournal
 from src.utils.helpers import get_graph_info, generate_random_graph
-from src.utils.config import WINDOW_TITLE
+from src.utils.config import WINDOW_TITLE, JOURNAL_SUFFIX
 from src.visualization.algorithm_visualizer import AlgorithmVisualizer
 
 
@@ -33,6 +34,7 @@ class GraphGUI:
         self.root.configure(bg='#E6F3FF')  # Màu xanh nhạt
         
         self.graph = Graph(GraphType.UNDIRECTED)  # Đồ thị hiện tại
+        self.journal = None  # Nhật ký tự động lưu (sau khi lưu/tải file)
         self.pos = {}  # Vị trí các đỉnh (để kéo thả)
         self.dragging_node = None  # Đỉnh đang được kéo
         
@@ -313,9 +315,16 @@ class GraphGUI:
     def new_graph(self):
         """Tạo đồ thị mới rỗng"""
         graph_type = GraphType.DIRECTED if self.graph_type_var.get() == "directed" else GraphType.UNDIRECTED
+        self.stop_journal()
         self.graph = Graph(graph_type)
         self.update_graph_display()
         self.log_result("Đã tạo đồ thị mới")
+    
+    def stop_journal(self):
+        """Ngừng tự động lưu đồ thị hiện tại vào nhật ký"""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
         
     def random_graph(self):
         """Tạo đồ thị ngẫu nhiên"""
@@ -355,6 +364,7 @@ class GraphGUI:
                     return
                 
                 graph_type = GraphType.DIRECTED if self.graph_type_var.get() == "directed" else GraphType.UNDIRECTED
+                self.stop_journal()
                 self.graph = Graph(graph_type)
                 
                 # Tạo danh sách tên đỉnh
@@ -746,7 +756,12 @@ Liên thông: {'Có' if info['is_connected'] else 'Không'}
                 messagebox.showerror("Lỗi", "Đỉnh không tồn tại!")
                 return
             
-            path, distance = find_shortest_path(self.graph, start, end)
+            if self.pos:
+                # Có tọa độ vẽ: A* với heuristic Euclid (đã nhân hệ số để luôn cho kết quả tối ưu)
+                path, distance = find_shortest_path(self.graph, start, end, method='astar',
+                                                    heuristic=euclidean_heuristic(self.graph, self.pos))
+            else:
+                path, distance = find_shortest_path(self.graph, start, end)
             
             if path:
                 result = f"Đường đi ngắn nhất từ {start} đến {end}:\n"
@@ -980,8 +995,8 @@ Liên thông: {'Có' if info['is_connected'] else 'Không'}
         matrix_text = scrolledtext.ScrolledText(matrix_frame, width=80, height=30, wrap=tk.NONE, font=('Courier', 10))
         matrix_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        adj_matrix = AdjacencyMatrix(self.graph)
-        vertices = sorted(self.graph.get_vertices())
+        adj_matrix = convert_representation(self.graph, 'matrix')
+        vertices = adj_matrix.vertices
         matrix = adj_matrix.get_matrix()
         
         # Header
@@ -990,8 +1005,8 @@ Liên thông: {'Có' if info['is_connected'] else 'Không'}
         matrix_text.insert(tk.END, "-" * len(header) + "\n")
         
         # Rows
-        for i, v in enumerate(vertices):
-            row = f"{v:>4} |" + "".join([f"{matrix[i][j]:>6.1f}" for j in range(len(vertices))])
+        for v, values in zip(vertices, matrix.tolist()):
+            row = f"{v:>4} |" + "".join([f"{x:>6.1f}" for x in values])
             matrix_text.insert(tk.END, row + "\n")
         
         matrix_text.config(state=tk.DISABLED)
@@ -1003,7 +1018,7 @@ Liên thông: {'Có' if info['is_connected'] else 'Không'}
         list_text = scrolledtext.ScrolledText(list_frame, width=80, height=30, wrap=tk.WORD, font=('Courier', 10))
         list_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        adj_list = AdjacencyList(self.graph)
+        adj_list = convert_representation(self.graph, 'list')
         adj_dict = adj_list.get_list()
         
         for vertex in sorted(adj_dict.keys()):
@@ -1025,7 +1040,7 @@ Liên thông: {'Có' if info['is_connected'] else 'Không'}
         edge_text = scrolledtext.ScrolledText(edge_frame, width=80, height=30, wrap=tk.WORD, font=('Courier', 10))
         edge_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        edge_list = EdgeList(self.graph)
+        edge_list = convert_representation(self.graph, 'edges')
         edges = edge_list.get_edges()
         
         edge_text.insert(tk.END, f"Tổng số cạnh: {len(edges)}\n")
@@ -1178,28 +1193,33 @@ Liên thông: {'Có' if info['is_connected'] else 'Không'}
             messagebox.showerror("Lỗi", f"Không thể trực quan hóa: {str(e)}")
     
     def save_graph_file(self):
-        """Lưu đồ thị ra file JSON/TXT"""
+        """Lưu đồ thị ra file JSON/TXT/nhị phân"""
         if self.graph.vertex_count() == 0:
             messagebox.showwarning("Cảnh báo", "Đồ thị rỗng!")
             return
         
         filename = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("Text files", "*.txt"), ("All files", "*.*")],
+            filetypes=[("JSON files", "*.json"), ("Text files", "*.txt"), ("Binary graph files", "*.bin"), ("Benchmark datasets", "*.gr *.mtx"), ("Compressed files", "*.gz *.bz2 *.xz"), ("All files", "*.*")],
             initialdir="data"
         )
         
         if filename:
             try:
-                save_graph(self.graph, filename)
+                self.stop_journal()
+                if filename.lower().endswith(('.json', '.txt', '.bin')):
+                    # Ghi ảnh chụp, sau đó mỗi thay đổi chỉ được nối thêm vào nhật ký
+                    self.journal = GraphJournal(self.graph, filename)
+                else:
+                    save_graph(self.graph, filename)
                 self.log_result(f"Đã lưu đồ thị vào {filename}")
             except Exception as e:
                 messagebox.showerror("Lỗi", f"Không thể lưu file: {e}")
     
     def load_graph_file(self):
-        """Tải đồ thị từ file JSON/TXT"""
+        """Tải đồ thị từ file JSON/TXT/nhị phân"""
         filename = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("Text files", "*.txt"), ("All files", "*.*")],
+            filetypes=[("JSON files", "*.json"), ("Text files", "*.txt"), ("Binary graph files", "*.bin"), ("Benchmark datasets", "*.gr *.max *.mtx"), ("Compressed files", "*.gz *.bz2 *.xz"), ("All files", "*.*")],
             initialdir="data"
         )
         
@@ -1211,7 +1231,18 @@ Liên thông: {'Có' if info['is_connected'] else 'Không'}
                     messagebox.showerror("Lỗi", "File rỗng!")
                     return
                 
+                self.stop_journal()
                 self.graph = load_graph(filename)
+                if os.path.exists(filename + JOURNAL_SUFFIX):
+                    try:
+                        # Tiếp tục tự động lưu vào nhật ký của file
+                        self.journal = GraphJournal(self.graph, filename, resume=True)
+                    except ValueError:
+                        # Nhật ký không khớp file: không ghi đè file, chỉ cảnh báo
+                        messagebox.showwarning(
+                            "Cảnh báo",
+                            f"Nhật ký {filename + JOURNAL_SUFFIX} không khớp với file và đã bị bỏ qua.\n"
+                            "Tự động lưu chỉ bật lại sau khi lưu file.")
                 self.pos = {}  # Reset vị trí đỉnh
                 self.update_graph_display()
                 self.log_result(f"Đã tải đồ thị từ {filename}")
@@ -1238,6 +1269,8 @@ Liên thông: {'Có' if info['is_connected'] else 'Không'}
         # Nếu click đủ gần đỉnh (bán kính 0.05)
         if min_dist < 0.05:
             self.dragging_node = closest_node
+            # Kéo trên dictionary mới để heuristic A* tính lại hệ số theo tọa độ mới
+            self.pos = dict(self.pos)
     
     def on_mouse_release(self, event):
         """Xử lý khi thả chuột - kết thúc kéo"""
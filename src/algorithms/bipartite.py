@@ -16,27 +16,29 @@ def is_bipartite_with_coloring(graph: Graph) -> Tuple[bool, Dict[int, int]]:
     if not vertices:
         return True, {}
     
-    color = {v: -1 for v in vertices}  # -1: chưa tô, 0/1: màu
+    ids = graph.vertex_ids()
+    color = [-1] * len(vertices)  # Theo mã đỉnh; -1: chưa tô, 0/1: màu
     
     for start in vertices:
-        if color[start] == -1:
+        if color[ids[start]] == -1:
             queue = deque([start])
-            color[start] = 0
+            color[ids[start]] = 0
             
             while queue:
                 u = queue.popleft()
-                current_color = color[u]
+                current_color = color[ids[u]]
                 next_color = 1 - current_color
                 
-                for v in graph.get_neighbors(u):
-                    if color[v] == -1:
-                        color[v] = next_color
+                for v in graph.iter_neighbors(u):
+                    j = ids[v]
+                    if color[j] == -1:
+                        color[j] = next_color
                         queue.append(v)
-                    elif color[v] == current_color:
+                    elif color[j] == current_color:
                         # Đỉnh kề cùng màu => không phải đồ thị 2 phía
                         return False, {}
     
-    return True, color
+    return True, {v: color[ids[v]] for v in vertices}
 
 
 def get_bipartite_sets(graph: Graph) -> Tuple[bool, List[int], List[int]]:
@@ -76,30 +78,32 @@ def is_bipartite_with_callback(graph: Graph,
     if not vertices:
         return True, {}
     
-    color = {v: -1 for v in vertices}
+    ids = graph.vertex_ids()
+    color = [-1] * len(vertices)
     
     for start in vertices:
-        if color[start] == -1:
+        if color[ids[start]] == -1:
             queue = deque([start])
-            color[start] = 0
+            color[ids[start]] = 0
             callback(start, 0, 'coloring')
             
             while queue:
                 u = queue.popleft()
-                current_color = color[u]
+                current_color = color[ids[u]]
                 next_color = 1 - current_color
                 
-                for v in graph.get_neighbors(u):
-                    if color[v] == -1:
-                        color[v] = next_color
+                for v in graph.iter_neighbors(u):
+                    j = ids[v]
+                    if color[j] == -1:
+                        color[j] = next_color
                         callback(v, next_color, 'coloring')
                         queue.append(v)
-                    elif color[v] == current_color:
+                    elif color[j] == current_color:
                         callback(v, current_color, 'conflict')
                         return False, {}
     
     callback(-1, -1, 'done')
-    return True, color
+    return True, {v: color[ids[v]] for v in vertices}
 
 
 def find_odd_cycle(graph: Graph) -> Optional[List[int]]:
@@ -118,25 +122,27 @@ def find_odd_cycle(graph: Graph) -> Optional[List[int]]:
     if not vertices:
         return None
     
-    color = {v: -1 for v in vertices}
+    ids = graph.vertex_ids()
+    color = [-1] * len(vertices)
     parent = {v: None for v in vertices}
     
     for start in vertices:
-        if color[start] == -1:
+        if color[ids[start]] == -1:
             queue = deque([start])
-            color[start] = 0
+            color[ids[start]] = 0
             
             while queue:
                 u = queue.popleft()
-                current_color = color[u]
+                current_color = color[ids[u]]
                 next_color = 1 - current_color
                 
-                for v in graph.get_neighbors(u):
-                    if color[v] == -1:
-                        color[v] = next_color
+                for v in graph.iter_neighbors(u):
+                    j = ids[v]
+                    if color[j] == -1:
+                        color[j] = next_color
                         parent[v] = u
                         queue.append(v)
-                    elif color[v] == current_color:
+                    elif color[j] == current_color:
                         # Tìm thấy chu trình lẻ, truy vết đường đi
                         cycle = [v]
                         
@@ -178,7 +184,15 @@ def is_complete_bipartite(graph: Graph) -> bool:
     if not is_bip:
         return False
     
-    # Kiểm tra mọi cặp đỉnh giữa 2 tập có cạnh nối không
+    # Mọi cạnh đều nối 2 tập, nên đồ thị vô hướng là 2 phía đầy đủ
+    # khi và chỉ khi số cạnh đúng bằng số cặp đỉnh giữa 2 tập
+    pairs = len(set1) * len(set2)
+    if not graph.is_directed():
+        return graph.edge_count() == pairs
+    if graph.edge_count() < pairs:
+        return False
+    
+    # Có hướng: kiểm tra từng cặp (tập 1 -> tập 2), tối đa O(E) cặp sau phép đếm trên
     for u in set1:
         for v in set2:
             if not graph.has_edge(u, v):
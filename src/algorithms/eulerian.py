@@ -16,19 +16,19 @@ def is_eulerian(graph: Graph) -> str:
         return 'none'
     
     if graph.is_directed():
-        # Đồ thị có hướng
-        in_degree = {v: 0 for v in vertices}
-        out_degree = {v: 0 for v in vertices}
-        
-        for u, v, _ in graph.get_edges():
-            out_degree[u] += 1
-            in_degree[v] += 1
-        
+        # Đồ thị có hướng - bậc vào/ra lấy trực tiếp từ chỉ mục của đồ thị
+        in_degree = graph.in_degree
+        if isinstance(graph, Graph) and graph._predecessors is None:
+            # Không có chỉ mục ngược: đếm bậc vào bằng một lượt qua các cạnh, O(E)
+            counts = {v: 0 for v in vertices}
+            for _, v, _ in graph.iter_edges():
+                counts[v] += 1
+            in_degree = counts.__getitem__
         start_vertices = 0  # Đỉnh có out > in
         end_vertices = 0    # Đỉnh có in > out
         
         for v in vertices:
-            diff = out_degree[v] - in_degree[v]
+            diff = graph.out_degree(v) - in_degree(v)
             if diff > 1 or diff < -1:
                 return 'none'
             if diff == 1:
@@ -179,7 +179,7 @@ def hierholzer(graph: Graph, start: Optional[int] = None) -> Optional[List[Tuple
     
     # Tạo dictionary lưu các cạnh chưa thăm
     edges = defaultdict(list)
-    for u, v, _ in graph.get_edges():
+    for u, v, _ in graph.iter_edges():
         edges[u].append(v)
         if not graph.is_directed():
             edges[v].append(u)
@@ -14,7 +14,7 @@ def ford_fulkerson(graph: Graph, source: int, sink: int) -> Tuple[float, Dict[Tu
     for v in vertices:
         residual[v] = {}
     
-    for u, v, capacity in graph.get_edges():
+    for u, v, capacity in graph.iter_edges():
         residual[u][v] = capacity
         if v not in residual:
             residual[v] = {}
@@ -54,7 +54,7 @@ def ford_fulkerson(graph: Graph, source: int, sink: int) -> Tuple[float, Dict[Tu
     flow = {}  # Luồng trên mỗi cạnh
     
     # Khởi tạo luồng = 0
-    for u, v, _ in graph.get_edges():
+    for u, v, _ in graph.iter_edges():
         flow[(u, v)] = 0.0
     
     # Tìm đường tăng luồng
@@ -125,7 +125,7 @@ def ford_fulkerson_with_callback(graph: Graph, source: int, sink: int,
     for v in vertices:
         residual[v] = {}
     
-    for u, v, capacity in graph.get_edges():
+    for u, v, capacity in graph.iter_edges():
         residual[u][v] = capacity
         if v not in residual:
             residual[v] = {}
@@ -162,7 +162,7 @@ def ford_fulkerson_with_callback(graph: Graph, source: int, sink: int,
     max_flow = 0.0
     flow = {}
     
-    for u, v, _ in graph.get_edges():
+    for u, v, _ in graph.iter_edges():
         flow[(u, v)] = 0.0
     
     while True:
@@ -215,7 +215,7 @@ def find_min_cut(graph: Graph, source: int, sink: int) -> Tuple[List[int], List[
     for v in vertices:
         residual[v] = {}
     
-    for u, v, capacity in graph.get_edges():
+    for u, v, capacity in graph.iter_edges():
         actual_flow = flow.get((u, v), 0.0)
         residual[u][v] = capacity - actual_flow
         if v not in residual:
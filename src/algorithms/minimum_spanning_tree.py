@@ -2,6 +2,7 @@
 from typing import List, Tuple, Set, Dict, Callable, Optional
 import heapq
 from src.core.graph import Graph, GraphType
+from src.utils.indexed_heap import IndexedHeap
 
 
 class UnionFind:
@@ -36,7 +37,8 @@ class UnionFind:
         return True
 
 
-def prim(graph: Graph, start: Optional[int] = None) -> Tuple[List[Tuple[int, int, float]], float]:
+def prim(graph: Graph, start: Optional[int] = None,
+         decrease_key: bool = False) -> Tuple[List[Tuple[int, int, float]], float]:
     """
     Thuật toán Prim tìm cây khung nhỏ nhất
     
@@ -49,6 +51,7 @@ def prim(graph: Graph, start: Optional[int] = None) -> Tuple[List[Tuple[int, int
     Args:
         graph: Đồ thị cần tìm MST (phải là đồ thị vô hướng, liên thông)
         start: Đỉnh bắt đầu (None = chọn ngẫu nhiên)
+        decrease_key: True để dùng IndexedHeap thay cho heapq (xem src.utils.indexed_heap)
     Returns:
         Tuple (danh_sách_cạnh_MST, tổng_trọng_số)
     """
@@ -62,6 +65,8 @@ def prim(graph: Graph, start: Optional[int] = None) -> Tuple[List[Tuple[int, int
     # Chọn đỉnh bắt đầu
     if start is None:
         start = vertices[0]
+    if decrease_key:
+        return _prim_decrease_key(graph, start)
     
     mst_edges = []  # Các cạnh trong MST
     total_weight = 0.0  # Tổng trọng số
@@ -71,8 +76,7 @@ def prim(graph: Graph, start: Optional[int] = None) -> Tuple[List[Tuple[int, int
     pq = []
     
     # Thêm tất cả cạnh từ đỉnh bắt đầu vào heap
-    for neighbor in graph.get_neighbors(start):
-        weight = graph.get_weight(start, neighbor)
+    for neighbor, weight in graph.neighbor_items(start):
         heapq.heappush(pq, (weight, start, neighbor))
     
     # Lặp cho đến khi có đủ (n-1) cạnh
@@ -89,14 +93,45 @@ def prim(graph: Graph, start: Optional[int] = None) -> Tuple[List[Tuple[int, int
         visited.add(v)
         
         # Thêm các cạnh từ v vào heap
-        for neighbor in graph.get_neighbors(v):
+        for neighbor, w in graph.neighbor_items(v):
             if neighbor not in visited:
-                w = graph.get_weight(v, neighbor)
                 heapq.heappush(pq, (w, v, neighbor))
     
     return mst_edges, total_weight
 
 
+def _prim_decrease_key(graph: Graph, start: int) -> Tuple[List[Tuple[int, int, float]], float]:
+    """Prim với IndexedHeap: khóa của đỉnh ngoài cây = trọng số cạnh nhẹ nhất nối vào cây"""
+    ids = graph.vertex_ids()
+    if start not in ids:
+        return [], 0.0
+    labels = graph.vertex_labels()
+    
+    mst_edges = []
+    total_weight = 0.0
+    in_tree = [False] * len(labels)  # Đỉnh đã vào cây (theo mã)
+    link = [-1] * len(labels)  # Đỉnh trong cây ở đầu kia của cạnh nhẹ nhất tới mỗi đỉnh
+    pq = IndexedHeap(len(labels))
+    
+    def add_to_tree(i: int):
+        """Đưa đỉnh mã i vào cây và cập nhật khóa các đỉnh kề ngoài cây"""
+        in_tree[i] = True
+        for neighbor, weight in graph.neighbor_items(labels[i]):
+            j = ids[neighbor]
+            if not in_tree[j] and pq.push_or_decrease(j, weight):
+                link[j] = i
+    
+    add_to_tree(ids[start])
+    
+    while pq and len(mst_edges) < len(labels) - 1:
+        j, weight = pq.pop()
+        mst_edges.append((labels[link[j]], labels[j], weight))
+        total_weight += weight
+        add_to_tree(j)
+    
+    return mst_edges, total_weight
+
+
 def kruskal(graph: Graph) -> Tuple[List[Tuple[int, int, float]], float]:
     """
     Thuật toán Kruskal tìm cây khung nhỏ nhất
@@ -116,13 +151,11 @@ def kruskal(graph: Graph) -> Tuple[List[Tuple[int, int, float]], float]:
         raise ValueError("Thuật toán Kruskal chỉ áp dụng cho đồ thị vô hướng")
     
     vertices = graph.get_vertices()
-    edges = graph.get_edges()
-    
     if not vertices:
         return [], 0.0
     
     # Sắp xếp các cạnh theo trọng số tăng dần
-    edges.sort(key=lambda e: e[2])
+    edges = sorted(graph.iter_edges(), key=lambda e: e[2])
     
     # Khởi tạo Union-Find
     uf = UnionFind(vertices)
@@ -154,6 +187,8 @@ def prim_with_callback(graph: Graph, start: Optional[int],
         start: Đỉnh bắt đầu
         callback: Hàm callback(u, v, weight, state)
                  state: 'considering', 'added', 'rejected'
+                 Mỗi cạnh lấy ra khỏi heap (theo trọng số tăng dần) nhận đúng 2 sự kiện:
+                 'considering' rồi 'added' (v chưa trong cây) hoặc 'rejected' (v đã trong cây)
     Returns:
         Tuple (danh_sách_cạnh_MST, tổng_trọng_số)
     """
@@ -173,8 +208,7 @@ def prim_with_callback(graph: Graph, start: Optional[int],
     pq = []
     
     # Thêm cạnh từ đỉnh bắt đầu
-    for neighbor in graph.get_neighbors(start):
-        weight = graph.get_weight(start, neighbor)
+    for neighbor, weight in graph.neighbor_items(start):
         heapq.heappush(pq, (weight, start, neighbor))
     
     while pq and len(mst_edges) < len(vertices) - 1:
@@ -193,9 +227,8 @@ def prim_with_callback(graph: Graph, start: Optional[int],
         callback(u, v, weight, 'added')
         
         # Thêm các cạnh mới
-        for neighbor in graph.get_neighbors(v):
+        for neighbor, w in graph.neighbor_items(v):
             if neighbor not in visited:
-                w = graph.get_weight(v, neighbor)
                 heapq.heappush(pq, (w, v, neighbor))
     
     return mst_edges, total_weight
@@ -217,12 +250,10 @@ def kruskal_with_callback(graph: Graph,
         raise ValueError("Thuật toán Kruskal chỉ áp dụng cho đồ thị vô hướng")
     
     vertices = graph.get_vertices()
-    edges = graph.get_edges()
-    
     if not vertices:
         return [], 0.0
     
-    edges.sort(key=lambda e: e[2])
+    edges = sorted(graph.iter_edges(), key=lambda e: e[2])
     uf = UnionFind(vertices)
     
     mst_edges = []
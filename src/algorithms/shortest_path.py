@@ -1,35 +1,140 @@
-"""Đường đi ngắn nhất: Dijkstra, Bellman-Ford, Floyd-Warshall"""
-from typing import Dict, List, Optional, Tuple, Callable
+"""Đường đi ngắn nhất: Dijkstra, A*, Bellman-Ford, Floyd-Warshall"""
+from typing import Any, Dict, List, Optional, Tuple, Callable
 import heapq
+import math
+import weakref
+import numpy as np
 from src.core.graph import Graph
+from src.core.csr import CSRGraph
 from src.utils.config import INFINITY
+from src.utils.indexed_heap import IndexedHeap
 
 
-def dijkstra(graph: Graph, start: int) -> Tuple[Dict[int, float], Dict[int, Optional[int]]]:
-    """Dijkstra - tìm đường ngắn nhất từ start, trả về (distances, parent)"""
-    vertices = graph.get_vertices()
-    distances = {v: INFINITY for v in vertices}
-    parent = {v: None for v in vertices}
+def dijkstra(graph: Graph, start: int,
+             decrease_key: bool = False) -> Tuple[Dict[int, float], Dict[int, Optional[int]]]:
+    """
+    Dijkstra - tìm đường ngắn nhất từ start, trả về (distances, parent)
+    Args:
+        graph: Đồ thị (Graph hoặc CSRGraph)
+        start: Đỉnh bắt đầu
+        decrease_key: True để dùng IndexedHeap thay cho heapq (xem src.utils.indexed_heap)
+    """
+    if isinstance(graph, CSRGraph):
+        if decrease_key:
+            raise ValueError("decrease_key không hỗ trợ CSRGraph")
+        return _dijkstra_csr(graph, start)
+    
+    ids = graph.vertex_ids()
+    if start not in ids:
+        return _unreachable_result(graph, start)
+    
+    # Trạng thái lưu theo mã đỉnh (0..n-1), chỉ đổi sang nhãn khi trả kết quả
+    labels = graph.vertex_labels()
+    n = len(labels)
+    dist = [INFINITY] * n
+    parent = [-1] * n
+    done = [False] * n
+    
+    s = ids[start]
+    dist[s] = 0
+    if decrease_key:
+        return _dijkstra_decrease_key(graph, s, dist, parent, done)
+    pq = [(0, s)]  # Priority queue: (distance, mã đỉnh)
+    
+    while pq:
+        current_dist, i = heapq.heappop(pq)
+        if done[i]:
+            continue
+        done[i] = True
+        u = labels[i]
+        
+        for v, weight in graph.neighbor_items(u):
+            j = ids[v]
+            new_dist = current_dist + weight
+            if new_dist < dist[j]:
+                dist[j] = new_dist
+                parent[j] = i
+                heapq.heappush(pq, (new_dist, j))
+    
+    return _to_label_dicts(graph, dist, parent)
+
+
+def _dijkstra_decrease_key(graph: Graph, s: int, dist: List[float], parent: List[int],
+                           done: List[bool]) -> Tuple[Dict[int, float], Dict[int, Optional[int]]]:
+    """Vòng lặp Dijkstra với IndexedHeap (xem tham số decrease_key của dijkstra)"""
+    ids = graph.vertex_ids()
+    labels = graph.vertex_labels()
+    pq = IndexedHeap(len(labels))  # Hàng đợi ưu tiên theo mã đỉnh, khóa = khoảng cách
+    pq.push(s, 0)
+    
+    while pq:
+        i, current_dist = pq.pop()
+        done[i] = True
+        u = labels[i]
+        
+        for v, weight in graph.neighbor_items(u):
+            j = ids[v]
+            new_dist = current_dist + weight
+            if new_dist < dist[j]:
+                dist[j] = new_dist
+                parent[j] = i
+                if not done[j]:
+                    pq.push_or_decrease(j, new_dist)
+    
+    return _to_label_dicts(graph, dist, parent)
+
+
+def _unreachable_result(graph: Graph, start: int) -> Tuple[Dict[int, float], Dict[int, Optional[int]]]:
+    """Kết quả khi start không thuộc đồ thị: mọi đỉnh đều vô cực"""
+    distances = {v: INFINITY for v in graph.get_vertices()}
     distances[start] = 0
+    return distances, {v: None for v in distances}
+
+
+def _to_label_dicts(graph: Graph, dist: List[float],
+                    parent: List[int]) -> Tuple[Dict[int, float], Dict[int, Optional[int]]]:
+    """Chuyển mảng theo mã đỉnh về dictionary theo nhãn (giữ thứ tự get_vertices)"""
+    ids = graph.vertex_ids()
+    labels = graph.vertex_labels()
+    distances = {}
+    parents = {}
+    for v in graph.get_vertices():
+        i = ids[v]
+        distances[v] = dist[i]
+        parents[v] = labels[parent[i]] if parent[i] >= 0 else None
+    return distances, parents
+
+
+def _dijkstra_csr(graph: CSRGraph, start: int) -> Tuple[Dict[int, float], Dict[int, Optional[int]]]:
+    """Dijkstra trên ảnh chụp CSR - duyệt trực tiếp mảng offsets/indices/weights"""
+    if start not in graph.index_of:
+        return _unreachable_result(graph, start)
     
-    pq = [(0, start)]  # Priority queue: (distance, vertex)
-    visited = set()
+    offsets, indices, weights = graph.offsets, graph.indices, graph.weights
+    n = len(graph.labels)
+    dist = [INFINITY] * n
+    parent = [-1] * n
+    done = [False] * n
+    
+    s = graph.vertex_id(start)
+    dist[s] = 0
+    pq = [(0, s)]
     
     while pq:
         current_dist, u = heapq.heappop(pq)
-        if u in visited:
+        if done[u]:
             continue
-        visited.add(u)
+        done[u] = True
         
-        for v in graph.get_neighbors(u):
-            weight = graph.get_weight(u, v)
-            new_dist = current_dist + weight
-            if new_dist < distances[v]:
-                distances[v] = new_dist
+        for k in range(offsets[u], offsets[u + 1]):
+            v = indices[k]
+            new_dist = current_dist + weights[k]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
                 parent[v] = u
                 heapq.heappush(pq, (new_dist, v))
     
-    return distances, parent
+    return _to_label_dicts(graph, dist, parent)
 
 
 def bellman_ford(graph: Graph, start: int) -> Tuple[Dict[int, float], Dict[int, Optional[int]], bool]:
@@ -50,20 +155,29 @@ def bellman_ford(graph: Graph, start: int) -> Tuple[Dict[int, float], Dict[int,
     Returns:
         Tuple (khoảng_cách, đỉnh_cha, có_chu_trình_âm)
     """
-    vertices = graph.get_vertices()
-    edges = graph.get_edges()
+    ids = graph.vertex_ids()
+    if start not in ids:
+        distances, parent = _unreachable_result(graph, start)
+        return distances, parent, False
+    
+    # Đổi cạnh sang mã đỉnh một lần, vòng lặp chỉ làm việc với số nguyên
+    edges = [(ids[u], ids[v], weight) for u, v, weight in graph.iter_edges()]
+    if not graph.is_directed():
+        # Đồ thị vô hướng: cạnh đi được cả hai chiều, không phụ thuộc chiều mà iter_edges trả về
+        edges += [(v, u, weight) for u, v, weight in edges if u != v]
     
     # Khởi tạo
-    distances = {v: INFINITY for v in vertices}
-    parent = {v: None for v in vertices}
-    distances[start] = 0
+    n = graph.vertex_count()
+    dist = [INFINITY] * n
+    parent = [-1] * n
+    dist[ids[start]] = 0
     
     # Lặp (n-1) lần
-    for _ in range(len(vertices) - 1):
+    for _ in range(n - 1):
         updated = False
         for u, v, weight in edges:
-            if distances[u] != INFINITY and distances[u] + weight < distances[v]:
-                distances[v] = distances[u] + weight
+            if dist[u] != INFINITY and dist[u] + weight < dist[v]:
+                dist[v] = dist[u] + weight
                 parent[v] = u
                 updated = True
         
@@ -74,11 +188,12 @@ def bellman_ford(graph: Graph, start: int) -> Tuple[Dict[int, float], Dict[int,
     # Kiểm tra chu trình âm
     has_negative_cycle = False
     for u, v, weight in edges:
-        if distances[u] != INFINITY and distances[u] + weight < distances[v]:
+        if dist[u] != INFINITY and dist[u] + weight < dist[v]:
             has_negative_cycle = True
             break
     
-    return distances, parent, has_negative_cycle
+    distances, parents = _to_label_dicts(graph, dist, parent)
+    return distances, parents, has_negative_cycle
 
 
 def floyd_warshall(graph: Graph) -> Tuple[Dict[Tuple[int, int], float], Dict[Tuple[int, int], Optional[int]]]:
@@ -94,6 +209,7 @@ def floyd_warshall(graph: Graph) -> Tuple[Dict[Tuple[int, int], float], Dict[Tup
        - Với mỗi cặp đỉnh (i, j):
          Nếu dist[i][k] + dist[k][j] < dist[i][j]
          => Cập nhật dist[i][j] và next[i][j] = next[i][k]
+    Tính toán bằng ma trận NumPy (xem floyd_warshall_matrix), chỉ đổi sang dictionary khi trả kết quả
     
     Args:
         graph: Đồ thị cần tìm
@@ -102,38 +218,91 @@ def floyd_warshall(graph: Graph) -> Tuple[Dict[Tuple[int, int], float], Dict[Tup
         - khoảng_cách: {(u, v): khoảng_cách_ngắn_nhất}
         - đỉnh_kế_tiếp: {(u, v): đỉnh_kế_tiếp_trong_đường_đi}
     """
-    vertices = graph.get_vertices()
+    dist_matrix, next_matrix, vertices = floyd_warshall_matrix(graph)
     
-    # Khởi tạo ma trận khoảng cách
     dist = {}
     next_vertex = {}
-    
-    # Khởi tạo
-    for u in vertices:
-        for v in vertices:
-            if u == v:
-                dist[(u, v)] = 0
-                next_vertex[(u, v)] = v
-            else:
-                dist[(u, v)] = INFINITY
-                next_vertex[(u, v)] = None
-    
-    # Cập nhật khoảng cách ban đầu từ các cạnh
-    for u, v, weight in graph.get_edges():
-        dist[(u, v)] = weight
-        next_vertex[(u, v)] = v
-    
-    # Thuật toán Floyd-Warshall
-    for k in vertices:
-        for i in vertices:
-            for j in vertices:
-                if dist[(i, k)] + dist[(k, j)] < dist[(i, j)]:
-                    dist[(i, j)] = dist[(i, k)] + dist[(k, j)]
-                    next_vertex[(i, j)] = next_vertex[(i, k)]
+    successors = [None] + vertices  # next_matrix = -1 -> None
+    for u, dist_row, next_row in zip(vertices, dist_matrix.tolist(), next_matrix.tolist()):
+        for v, d, k in zip(vertices, dist_row, next_row):
+            dist[(u, v)] = d
+            next_vertex[(u, v)] = successors[k + 1]
     
     return dist, next_vertex
 
 
+def floyd_warshall_matrix(graph: Graph) -> Tuple[np.ndarray, np.ndarray, List[int]]:
+    """
+    Floyd-Warshall dạng ma trận NumPy: mỗi đỉnh trung gian k là một phép cập nhật
+    trên toàn ma trận dist = min(dist, dist[:, k] + dist[k, :]) thay cho hai vòng lặp Python
+    
+    Args:
+        graph: Đồ thị cần tìm (Graph hoặc CSRGraph); cạnh vô hướng đi được cả hai chiều
+    Returns:
+        Tuple (dist, next, vertices)
+        - dist[i, j]: khoảng cách ngắn nhất từ vertices[i] đến vertices[j] (vô cực nếu không tới được)
+        - next[i, j]: chỉ số đỉnh kế tiếp sau vertices[i] trên đường đi đó, -1 nếu không có
+        - vertices: danh sách đỉnh theo chỉ số (thứ tự get_vertices)
+    """
+    from src.core.representations import edge_index_arrays
+    vertices = graph.get_vertices()
+    n = len(vertices)
+    vertex_to_index = {v: i for i, v in enumerate(vertices)}
+    
+    dist = np.full((n, n), INFINITY)
+    next_matrix = np.full((n, n), -1, dtype=np.int32 if n < 2**31 else np.int64)
+    rows, cols, weights = edge_index_arrays(graph, vertex_to_index, both_directions=True)
+    dist[rows, cols] = weights
+    next_matrix[rows, cols] = cols
+    # Đường đi rỗng từ một đỉnh tới chính nó (khuyên âm vẫn được giữ)
+    diagonal = np.arange(n)
+    dist[diagonal, diagonal] = np.minimum(dist[diagonal, diagonal], 0)
+    next_matrix[diagonal, diagonal] = diagonal
+    
+    # Bộ đệm dùng lại qua các vòng k để tránh cấp phát ma trận n x n mỗi vòng
+    via = np.empty_like(dist)
+    improved = np.empty(dist.shape, dtype=bool)
+    for k in range(n):
+        # dist[i, k] + dist[k, j]; sao chép cột k vì dist bị ghi đè tại chỗ
+        np.add(dist[:, k].copy()[:, None], dist[k], out=via)
+        np.less(via, dist, out=improved)
+        np.minimum(dist, via, out=dist)
+        np.copyto(next_matrix, next_matrix[:, k].copy()[:, None], where=improved)
+    
+    return dist, next_matrix, vertices
+
+
+def floyd_warshall_path(next_matrix: np.ndarray, vertices: List[int], start: int, end: int,
+                        vertex_to_index: Optional[Dict[int, int]] = None) -> Optional[List[int]]:
+    """
+    Truy vết đường đi từ ma trận đỉnh kế tiếp của floyd_warshall_matrix
+    
+    Args:
+        next_matrix: Ma trận đỉnh kế tiếp
+        vertices: Danh sách đỉnh theo chỉ số
+        start: Đỉnh bắt đầu
+        end: Đỉnh kết thúc
+        vertex_to_index: Ánh xạ {đỉnh: chỉ số} (None để tự dựng, nên truyền khi truy vết nhiều lần)
+    Returns:
+        Danh sách các đỉnh trong đường đi, None nếu không có đường đi
+    """
+    if vertex_to_index is None:
+        vertex_to_index = {v: i for i, v in enumerate(vertices)}
+    i = vertex_to_index.get(start)
+    j = vertex_to_index.get(end)
+    if i is None or j is None or next_matrix[i, j] < 0:
+        return None
+    
+    path = [start]
+    # Chu trình âm làm đường đi không xác định: dừng sau n bước
+    for _ in range(len(vertices)):
+        if i == j:
+            return path
+        i = int(next_matrix[i, j])
+        path.append(vertices[i])
+    return path if i == j else None
+
+
 def get_path_from_parent(parent: Dict[int, Optional[int]], start: int, end: int) -> Optional[List[int]]:
     """
     Truy vết đường đi từ dictionary đỉnh cha
@@ -175,53 +344,358 @@ def dijkstra_with_callback(graph: Graph, start: int,
     Returns:
         Tuple (khoảng_cách, đỉnh_cha)
     """
-    vertices = graph.get_vertices()
-    distances = {v: INFINITY for v in vertices}
-    parent = {v: None for v in vertices}
-    distances[start] = 0
+    ids = graph.vertex_ids()
+    callback(start, 0, 'start')
+    if start not in ids:
+        return _unreachable_result(graph, start)
     
-    pq = [(0, start)]
-    visited = set()
+    labels = graph.vertex_labels()
+    n = len(labels)
+    dist = [INFINITY] * n
+    parent = [-1] * n
+    done = [False] * n
     
-    callback(start, 0, 'start')
+    s = ids[start]
+    dist[s] = 0
+    pq = [(0, s)]
     
     while pq:
-        current_dist, u = heapq.heappop(pq)
+        current_dist, i = heapq.heappop(pq)
         
-        if u in visited:
+        if done[i]:
             continue
         
-        visited.add(u)
+        done[i] = True
+        u = labels[i]
         callback(u, current_dist, 'visited')
         
-        for v in graph.get_neighbors(u):
-            weight = graph.get_weight(u, v)
+        for v, weight in graph.neighbor_items(u):
+            j = ids[v]
             new_dist = current_dist + weight
             
-            if new_dist < distances[v]:
-                distances[v] = new_dist
-                parent[v] = u
-                heapq.heappush(pq, (new_dist, v))
+            if new_dist < dist[j]:
+                dist[j] = new_dist
+                parent[j] = i
+                heapq.heappush(pq, (new_dist, j))
                 callback(v, new_dist, 'updated')
     
-    return distances, parent
+    return _to_label_dicts(graph, dist, parent)
 
 
-def find_shortest_path(graph: Graph, start: int, end: int) -> Tuple[Optional[List[int]], float]:
+def find_shortest_path(graph: Graph, start: int, end: int, method: str = 'dijkstra',
+                       heuristic: Optional[Callable[[Any, Any], float]] = None
+                       ) -> Tuple[Optional[List[int]], float]:
     """
     Tìm đường đi ngắn nhất từ start đến end
+    Dijkstra dừng ngay khi end được chốt, chỉ lưu trạng thái cho các đỉnh đã chạm tới
     
     Args:
         graph: Đồ thị
         start: Đỉnh bắt đầu
         end: Đỉnh kết thúc
+        method: 'dijkstra' (một chiều, mặc định), 'bidirectional' (tìm đồng thời từ hai đầu,
+            chỉ cho trọng số không âm) hoặc 'astar' (A* với heuristic)
+        heuristic: Hàm ước lượng h(đỉnh, đích) cho method='astar' (xem astar)
     Returns:
-        Tuple (đường_đi, độ_dài)
+        Tuple (đường_đi, độ_dài), (None, vô cực) nếu không có đường đi
     """
-    distances, parent = dijkstra(graph, start)
+    if method == 'bidirectional':
+        return bidirectional_dijkstra(graph, start, end)
+    if method == 'astar':
+        return astar(graph, start, end, heuristic)
+    if method != 'dijkstra':
+        raise ValueError(f"Phương pháp không hỗ trợ: {method}")
+    if isinstance(graph, CSRGraph):
+        return _dijkstra_to_target_csr(graph, start, end)
+    
+    ids = graph.vertex_ids()
+    if start not in ids or end not in ids:
+        return ([start], 0) if start == end else (None, INFINITY)
+    
+    labels = graph.vertex_labels()
+    t = ids[end]
+    s = ids[start]
+    # Trạng thái cấp phát dần theo mã đỉnh, không khởi tạo cho cả n đỉnh
+    dist = {s: 0}
+    parent = {s: -1}
+    done = set()
+    pq = [(0, s)]
     
-    if distances[end] == INFINITY:
+    while pq:
+        current_dist, i = heapq.heappop(pq)
+        if i in done:
+            continue
+        if i == t:
+            return _trace_ids(parent, labels, t), current_dist
+        done.add(i)
+        
+        for v, weight in graph.neighbor_items(labels[i]):
+            j = ids[v]
+            new_dist = current_dist + weight
+            if new_dist < dist.get(j, INFINITY):
+                dist[j] = new_dist
+                parent[j] = i
+                heapq.heappush(pq, (new_dist, j))
+    
+    return None, INFINITY
+
+
+def _dijkstra_to_target_csr(graph: CSRGraph, start: int, end: int) -> Tuple[Optional[List[int]], float]:
+    """find_shortest_path trên ảnh chụp CSR - duyệt trực tiếp mảng offsets/indices/weights"""
+    index_of = graph.index_of
+    if start not in index_of or end not in index_of:
+        return ([start], 0) if start == end else (None, INFINITY)
+    
+    offsets, indices, weights = graph.offsets, graph.indices, graph.weights
+    t = index_of[end]
+    s = index_of[start]
+    dist = {s: 0}
+    parent = {s: -1}
+    done = set()
+    pq = [(0, s)]
+    
+    while pq:
+        current_dist, u = heapq.heappop(pq)
+        if u in done:
+            continue
+        if u == t:
+            return _trace_ids(parent, graph.labels, t), current_dist
+        done.add(u)
+        
+        for k in range(offsets[u], offsets[u + 1]):
+            v = indices[k]
+            new_dist = current_dist + weights[k]
+            if new_dist < dist.get(v, INFINITY):
+                dist[v] = new_dist
+                parent[v] = u
+                heapq.heappush(pq, (new_dist, v))
+    
+    return None, INFINITY
+
+
+def bidirectional_dijkstra(graph: Graph, start: int, end: int) -> Tuple[Optional[List[int]], float]:
+    """
+    Dijkstra hai chiều: tìm xuôi từ start và ngược từ end (theo cạnh đảo chiều nếu có hướng)
+    Mỗi bước mở rộng phía có khoảng cách nhỏ nhất trong hàng đợi nhỏ hơn; dừng khi tổng
+    hai đỉnh hàng đợi không nhỏ hơn độ dài đường tốt nhất đã gặp
+    - Yêu cầu trọng số không âm: đồ thị có cạnh âm thì báo ValueError (kiểm tra O(E)
+      một lần cho mỗi phiên bản đồ thị)
+    - Khi có nhiều đường cùng độ dài, đường trả về có thể khác Dijkstra một chiều
+    
+    Args:
+        graph: Đồ thị (Graph hoặc CSRGraph)
+        start: Đỉnh bắt đầu
+        end: Đỉnh kết thúc
+    Returns:
+        Tuple (đường_đi, độ_dài), (None, vô cực) nếu không có đường đi
+    """
+    ids = graph.vertex_ids()
+    if start not in ids or end not in ids:
+        return ([start], 0) if start == end else (None, INFINITY)
+    if start == end:
+        return [start], 0
+    if _has_negative_weight(graph):
+        raise ValueError("Dijkstra hai chiều không hỗ trợ trọng số âm")
+    
+    # Hai phía: 0 = xuôi từ start, 1 = ngược từ end
+    items = (graph.neighbor_items, _reverse_neighbor_items(graph))
+    dist = ({start: 0}, {end: 0})
+    parent = ({start: None}, {end: None})
+    done = (set(), set())
+    queues = ([(0, ids[start], start)], [(0, ids[end], end)])
+    best = INFINITY
+    meet = None
+    
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        side_dist, other_dist = dist[side], dist[1 - side]
+        current_dist, _, u = heapq.heappop(queues[side])
+        if u in done[side]:
+            continue
+        done[side].add(u)
+        
+        for v, weight in items[side](u):
+            new_dist = current_dist + weight
+            if new_dist < side_dist.get(v, INFINITY):
+                side_dist[v] = new_dist
+                parent[side][v] = u
+                heapq.heappush(queues[side], (new_dist, ids[v], v))
+            # Đường đi qua cạnh (u, v) nối hai cây tìm kiếm
+            if v in other_dist and side_dist[v] + other_dist[v] < best:
+                best = side_dist[v] + other_dist[v]
+                meet = v
+    
+    if meet is None:
         return None, INFINITY
+    path = []
+    current = meet
+    while current is not None:
+        path.append(current)
+        current = parent[0][current]
+    path.reverse()
+    current = parent[1][meet]
+    while current is not None:
+        path.append(current)
+        current = parent[1][current]
+    return path, best
+
+
+def astar(graph: Graph, start: int, goal: int,
+          heuristic: Optional[Callable[[Any, Any], float]] = None,
+          pos: Optional[Dict[Any, Tuple[float, float]]] = None) -> Tuple[Optional[List[int]], float]:
+    """
+    Thuật toán A*: Dijkstra có định hướng, ưu tiên đỉnh có g(v) + h(v, goal) nhỏ nhất
+    Với heuristic chấp nhận được (không ước lượng quá khoảng cách thật) kết quả luôn tối ưu;
+    đỉnh được mở lại nếu tìm thấy đường ngắn hơn nên heuristic không cần nhất quán
     
-    path = get_path_from_parent(parent, start, end)
-    return path, distances[end]
+    Args:
+        graph: Đồ thị (trọng số không âm)
+        start: Đỉnh bắt đầu
+        goal: Đỉnh đích
+        heuristic: Hàm h(đỉnh, đích) ước lượng khoảng cách còn lại
+        pos: Tọa độ đỉnh {đỉnh: (x, y)} (vd: vị trí vẽ đồ thị) - dùng euclidean_heuristic
+            khi không truyền heuristic; không có cả hai thì A* trở thành Dijkstra
+    Returns:
+        Tuple (đường_đi, độ_dài), (None, vô cực) nếu không có đường đi
+    """
+    ids = graph.vertex_ids()
+    if start not in ids or goal not in ids:
+        return ([start], 0) if start == goal else (None, INFINITY)
+    if heuristic is None and pos is not None:
+        heuristic = euclidean_heuristic(graph, pos)
+    if heuristic is None:
+        heuristic = lambda v, target: 0
+    
+    cost = {start: 0}
+    parent = {start: None}
+    # (f, -g, mã đỉnh, đỉnh): cùng f thì ưu tiên đỉnh đã đi xa hơn (gần đích hơn)
+    pq = [(heuristic(start, goal), 0, ids[start], start)]
+    
+    while pq:
+        _, negative_cost, _, u = heapq.heappop(pq)
+        current_cost = -negative_cost
+        if current_cost > cost[u]:
+            continue  # Bản ghi cũ
+        if u == goal:
+            path = []
+            while u is not None:
+                path.append(u)
+                u = parent[u]
+            path.reverse()
+            return path, current_cost
+        
+        for v, weight in graph.neighbor_items(u):
+            new_cost = current_cost + weight
+            if new_cost < cost.get(v, INFINITY):
+                cost[v] = new_cost
+                parent[v] = u
+                heapq.heappush(pq, (new_cost + heuristic(v, goal), -new_cost, ids[v], v))
+    
+    return None, INFINITY
+
+
+def euclidean_heuristic(graph: Graph, pos: Dict[Any, Tuple[float, float]],
+                        scale: Optional[float] = None) -> Callable[[Any, Any], float]:
+    """
+    Heuristic khoảng cách Euclid theo tọa độ đỉnh, nhân hệ số để luôn chấp nhận được
+    Tọa độ vẽ không tỉ lệ với trọng số nên hệ số mặc định là min(trọng_số / độ_dài)
+    trên mọi cạnh: khi đó h(v) không vượt quá độ dài đường đi thật (và nhất quán)
+    Chỉ cần một đỉnh thiếu tọa độ là cạnh qua nó không được tính vào hệ số, nên khi đó
+    h = 0 (A* trở thành Dijkstra)
+    Hệ số được tính O(V + E) một lần cho mỗi cặp (phiên bản đồ thị, đối tượng pos);
+    khi dời đỉnh hãy truyền dictionary tọa độ mới thay vì sửa pos tại chỗ
+    
+    Args:
+        graph: Đồ thị
+        pos: Tọa độ đỉnh {đỉnh: (x, y)}
+        scale: Hệ số đã biết (vd: 1 khi trọng số chính là độ dài cạnh), None để tự tính
+    Returns:
+        Hàm h(đỉnh, đích)
+    """
+    complete, auto_scale = _euclidean_scale(graph, pos)
+    if not complete:
+        return lambda vertex, goal: 0.0
+    scale = max(auto_scale if scale is None else scale, 0.0)
+    
+    def heuristic(vertex, goal) -> float:
+        a = pos.get(vertex)
+        b = pos.get(goal)
+        if a is None or b is None:
+            return 0.0  # Đỉnh không thuộc đồ thị
+        return scale * math.dist(a, b)
+    return heuristic
+
+
+# Kết quả _euclidean_scale theo đồ thị: {đồ_thị: (phiên_bản, pos, đủ_tọa_độ, hệ_số)}
+# (giữ chính pos để so bằng "is": id của dictionary đã thu hồi có thể bị dùng lại)
+_euclidean_scale_cache: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def _euclidean_scale(graph: Graph, pos: Dict[Any, Tuple[float, float]]) -> Tuple[bool, float]:
+    """Trả về (mọi đỉnh đều có tọa độ, min(trọng_số / độ_dài) trên mọi cạnh), có lưu đệm"""
+    cached = _euclidean_scale_cache.get(graph)
+    if cached is not None and cached[0] == graph.version and cached[1] is pos:
+        return cached[2], cached[3]
+    
+    complete = all(v in pos for v in graph.get_vertices())
+    scale = INFINITY
+    if complete:
+        for u, v, weight in graph.iter_edges():
+            length = math.dist(pos[u], pos[v])
+            if length > 0:
+                scale = min(scale, weight / length)
+    if scale == INFINITY:
+        scale = 0.0
+    _euclidean_scale_cache[graph] = (graph.version, pos, complete, scale)
+    return complete, scale
+
+
+# Kết quả _has_negative_weight theo đồ thị: {đồ_thị: (phiên_bản, có_cạnh_âm)}
+_negative_weight_cache: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def _has_negative_weight(graph: Graph) -> bool:
+    """
+    Kiểm tra đồ thị có cạnh trọng số âm hay không
+    Duyệt O(E) một lần cho mỗi phiên bản đồ thị, các truy vấn sau dùng lại kết quả
+    """
+    cached = _negative_weight_cache.get(graph)
+    if cached is not None and cached[0] == graph.version:
+        return cached[1]
+    if isinstance(graph, CSRGraph):
+        weights = np.asarray(graph.weights)
+        result = weights.size > 0 and bool(weights.min() < 0)
+    else:
+        result = any(weight < 0 for _, _, weight in graph.iter_edges())
+    _negative_weight_cache[graph] = (graph.version, result)
+    return result
+
+
+def _reverse_neighbor_items(graph: Graph) -> Callable:
+    """Hàm vertex -> các cặp (đỉnh_vào, trọng_số), tức neighbor_items của đồ thị đảo chiều"""
+    if not graph.is_directed():
+        return graph.neighbor_items
+    if not isinstance(graph, CSRGraph):
+        return graph.reverse_view().neighbor_items
+    
+    offsets, indices, weights = graph.reverse_arrays()
+    labels = graph.labels
+    index_of = graph.index_of
+    
+    def neighbor_items(vertex):
+        i = index_of[vertex]
+        return [(labels[indices[k]], weights[k]) for k in range(offsets[i], offsets[i + 1])]
+    return neighbor_items
+
+
+def _trace_ids(parent: Dict[int, int], labels: List, end: int) -> List:
+    """Truy vết đường đi theo mã đỉnh (gốc có cha -1), trả về danh sách nhãn"""
+    path = []
+    i = end
+    while i != -1:
+        path.append(labels[i])
+        i = parent[i]
+    path.reverse()
+    return path
@@ -2,10 +2,13 @@
 from typing import List, Dict, Set, Callable, Optional
 from collections import deque
 from src.core.graph import Graph
+from src.core.csr import CSRGraph
 
 
 def bfs(graph: Graph, start: int) -> List[int]:
     """BFS - duyệt theo chiều rộng từ start, trả về thứ tự đỉnh"""
+    if isinstance(graph, CSRGraph):
+        return _bfs_csr(graph, start)
     if start not in graph.get_vertices():
         return []
     
@@ -17,7 +20,7 @@ def bfs(graph: Graph, start: int) -> List[int]:
     while queue:
         current = queue.popleft()
         result.append(current)
-        for neighbor in sorted(graph.get_neighbors(current)):
+        for neighbor in sorted(graph.iter_neighbors(current)):
             if neighbor not in visited:
                 visited.add(neighbor)
                 queue.append(neighbor)
@@ -25,6 +28,31 @@ def bfs(graph: Graph, start: int) -> List[int]:
     return result
 
 
+def _bfs_csr(graph: CSRGraph, start: int) -> List[int]:
+    """BFS trên ảnh chụp CSR - hàng đợi chứa mã số, chỉ đổi sang nhãn khi trả kết quả"""
+    if start not in graph.index_of:
+        return []
+    
+    labels = graph.labels
+    offsets, indices = graph.offsets, graph.indices
+    visited = [False] * len(labels)
+    s = graph.vertex_id(start)
+    visited[s] = True
+    queue = deque([s])
+    order = []
+    
+    while queue:
+        current = queue.popleft()
+        order.append(current)
+        # Giữ thứ tự duyệt theo nhãn như bản trên Graph
+        for neighbor in sorted(indices[offsets[current]:offsets[current + 1]], key=labels.__getitem__):
+            if not visited[neighbor]:
+                visited[neighbor] = True
+                queue.append(neighbor)
+    
+    return [labels[i] for i in order]
+
+
 def dfs(graph: Graph, start: int) -> List[int]:
     """DFS - duyệt theo chiều sâu từ start, trả về thứ tự đỉnh"""
     if start not in graph.get_vertices():
@@ -39,7 +67,7 @@ def dfs(graph: Graph, start: int) -> List[int]:
     while stack:
         current = stack.pop()
         result.append(current)
-        for neighbor in reversed(sorted(graph.get_neighbors(current))):
+        for neighbor in reversed(sorted(graph.iter_neighbors(current))):
             if neighbor not in visited:
                 visited.add(neighbor)
                 stack.append(neighbor)
@@ -62,7 +90,7 @@ def dfs_recursive(graph: Graph, start: int,
     visited.add(start)
     result.append(start)
     
-    for neighbor in sorted(graph.get_neighbors(start)):
+    for neighbor in sorted(graph.iter_neighbors(start)):
         if neighbor not in visited:
             dfs_recursive(graph, neighbor, visited, result)
     
@@ -87,7 +115,7 @@ def bfs_with_callback(graph: Graph, start: int,
         result.append(current)
         callback(current, 'visited')
         
-        for neighbor in sorted(graph.get_neighbors(current)):
+        for neighbor in sorted(graph.iter_neighbors(current)):
             if neighbor not in visited:
                 visited.add(neighbor)
                 queue.append(neighbor)
@@ -114,7 +142,7 @@ def dfs_with_callback(graph: Graph, start: int,
         result.append(current)
         callback(current, 'visited')
         
-        for neighbor in reversed(sorted(graph.get_neighbors(current))):
+        for neighbor in reversed(sorted(graph.iter_neighbors(current))):
             if neighbor not in visited:
                 visited.add(neighbor)
                 stack.append(neighbor)
@@ -125,6 +153,8 @@ def dfs_with_callback(graph: Graph, start: int,
 
 def bfs_levels(graph: Graph, start: int) -> Dict[int, int]:
     """BFS trả về mức (level) của mỗi đỉnh: {vertex: level}"""
+    if isinstance(graph, CSRGraph):
+        return _bfs_levels_csr(graph, start)
     if start not in graph.get_vertices():
         return {}
     
@@ -135,7 +165,7 @@ def bfs_levels(graph: Graph, start: int) -> Dict[int, int]:
         current = queue.popleft()
         current_level = levels[current]
         
-        for neighbor in graph.get_neighbors(current):
+        for neighbor in graph.iter_neighbors(current):
             if neighbor not in levels:
                 levels[neighbor] = current_level + 1
                 queue.append(neighbor)
@@ -143,12 +173,48 @@ def bfs_levels(graph: Graph, start: int) -> Dict[int, int]:
     return levels
 
 
-def bfs_shortest_path(graph: Graph, start: int, end: int) -> Optional[List[int]]:
-    """BFS tìm đường ngắn nhất (unweighted) - trả về path hoặc None"""
-    if start not in graph.get_vertices() or end not in graph.get_vertices():
+def _bfs_levels_csr(graph: CSRGraph, start: int) -> Dict[int, int]:
+    """bfs_levels trên ảnh chụp CSR"""
+    if start not in graph.index_of:
+        return {}
+    
+    offsets, indices = graph.offsets, graph.indices
+    level = [-1] * len(graph.labels)
+    s = graph.vertex_id(start)
+    level[s] = 0
+    queue = deque([s])
+    order = [s]
+    
+    while queue:
+        current = queue.popleft()
+        next_level = level[current] + 1
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = indices[k]
+            if level[neighbor] < 0:
+                level[neighbor] = next_level
+                queue.append(neighbor)
+                order.append(neighbor)
+    
+    labels = graph.labels
+    return {labels[i]: level[i] for i in order}
+
+
+def bfs_shortest_path(graph: Graph, start: int, end: int,
+                      method: str = 'bfs') -> Optional[List[int]]:
+    """
+    BFS tìm đường ngắn nhất (unweighted) - trả về path hoặc None
+    method: 'bfs' (một chiều, mặc định) hoặc 'bidirectional' (BFS hai chiều, thăm ít đỉnh
+    hơn trên đồ thị lớn; có thể chọn đường khác khi nhiều đường cùng độ dài)
+    """
+    ids = graph.vertex_ids()
+    if start not in ids or end not in ids:
         return None
     if start == end:
         return [start]
+    if method == 'bidirectional':
+        return _bidirectional_bfs(graph, start, end)
+    if method != 'bfs':
+        raise ValueError(f"Phương pháp không hỗ trợ: {method}")
     
     parent = {start: None}
     queue = deque([start])
@@ -163,9 +229,54 @@ def bfs_shortest_path(graph: Graph, start: int, end: int) -> Optional[List[int]]
                 current = parent[current]
             return list(reversed(path))
         
-        for neighbor in graph.get_neighbors(current):
+        for neighbor in graph.iter_neighbors(current):
             if neighbor not in parent:
                 parent[neighbor] = current
                 queue.append(neighbor)
     
     return None
+
+
+def _bidirectional_bfs(graph: Graph, start: int, end: int) -> Optional[List[int]]:
+    """
+    BFS hai chiều: mở rộng lần lượt trọn một tầng của phía có biên nhỏ hơn
+    (phía từ end đi theo cạnh ngược nếu đồ thị có hướng); khi hai phía gặp nhau,
+    chọn điểm gặp cho đường ngắn nhất trong tầng đó rồi dừng
+    """
+    backward = graph.get_predecessors if graph.is_directed() else graph.iter_neighbors
+    neighbors = (graph.iter_neighbors, backward)
+    # parent[phía][đỉnh] = (đỉnh cha, độ sâu)
+    parent = ({start: (None, 0)}, {end: (None, 0)})
+    frontiers = ([start], [end])
+    
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, other = parent[side], parent[1 - side]
+        best = None
+        next_frontier = []
+        for current in frontiers[side]:
+            depth = seen[current][1] + 1
+            for neighbor in neighbors[side](current):
+                if neighbor not in seen:
+                    seen[neighbor] = (current, depth)
+                    next_frontier.append(neighbor)
+                    if neighbor in other:
+                        length = depth + other[neighbor][1]
+                        if best is None or length < best[0]:
+                            best = (length, neighbor)
+        if best is not None:
+            meet = best[1]
+            path = []
+            current = meet
+            while current is not None:
+                path.append(current)
+                current = parent[0][current][0]
+            path.reverse()
+            current = parent[1][meet][0]
+            while current is not None:
+                path.append(current)
+                current = parent[1][current][0]
+            return path
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+    
+    return None
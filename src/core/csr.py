@@ -0,0 +1,372 @@
+"""
+Ảnh chụp chỉ-đọc của đồ thị dạng CSR (Compressed Sparse Row)
+
+Toàn bộ danh sách kề được nén thành 3 mảng liên tục:
+- offsets[i] .. offsets[i + 1]: đoạn chứa các cạnh đi ra từ đỉnh có mã i
+- indices[k]: mã đỉnh kề của cạnh thứ k
+- weights[k]: trọng số của cạnh thứ k (int64 nếu mọi trọng số là số nguyên, ngược lại float64)
+Cùng với bảng ánh xạ nhãn đỉnh <-> mã số nguyên liên tục 0..n-1
+"""
+from array import array
+from typing import List, Dict, Tuple, Optional, Iterator, Sequence
+from src.core.graph import GraphType
+
+
+class CSRGraph:
+    """
+    Đồ thị đóng băng (không sửa được) lưu theo CSR
+    Có cùng giao diện đọc với Graph (get_vertices, get_neighbors, get_weight, ...)
+    nên mọi thuật toán trong src/algorithms đều nhận được trực tiếp
+    """
+
+    # Ảnh chụp không bao giờ thay đổi nên phiên bản luôn cố định
+    version = 0
+
+    def __init__(self, graph_type: GraphType, labels: List,
+                 offsets: Sequence[int], indices: Sequence[int], weights: Sequence[float]):
+        """
+        Khởi tạo từ các mảng đã xây sẵn (thường gọi qua Graph.freeze())
+        Args:
+            graph_type: Loại đồ thị
+            labels: Dãy nhãn đỉnh, labels[i] là nhãn của đỉnh có mã i
+            offsets: Mảng vị trí bắt đầu (độ dài n + 1)
+            indices: Mảng mã đỉnh kề (độ dài = số phần tử kề)
+            weights: Mảng trọng số song song với indices
+        """
+        self.graph_type = graph_type
+        self.labels = labels
+        # Bảng {nhãn: mã} chỉ dựng khi cần (mở file nhị phân không tốn O(V) ngay)
+        self._index_of: Optional[Dict] = None
+        self.offsets = offsets
+        self.indices = indices
+        self.weights = weights
+        # Mảng CSR của đồ thị đảo chiều, chỉ dựng khi cần (đồ thị có hướng)
+        self._reverse: Optional[Tuple[array, array, array]] = None
+        # Kết quả convert_representation theo loại
+        self._representations: Dict[str, object] = {}
+
+    @classmethod
+    def from_adjacency(cls, graph_type: GraphType,
+                       adjacency: Dict[int, Dict[int, float]],
+                       labels: Optional[List] = None) -> 'CSRGraph':
+        """
+        Xây dựng CSR từ danh sách kề dạng {đỉnh: {đỉnh_kề: trọng_số}}
+        Args:
+            labels: Thứ tự đỉnh theo mã (None = theo thứ tự trong dictionary)
+        Thứ tự kề được giữ nguyên như trong dictionary; trọng số giữ kiểu số nguyên
+        (mảng int64) cho tới khi gặp trọng số đầu tiên không phải số nguyên
+        """
+        labels = list(adjacency.keys()) if labels is None else list(labels)
+        index_of = {v: i for i, v in enumerate(labels)}
+
+        offsets = array('q', [0])
+        indices = array('q')
+        weights = array('q')
+        for v in labels:
+            neighbors = adjacency[v]
+            indices.extend(index_of[w] for w in neighbors)
+            if weights.typecode == 'q':
+                start = len(weights)
+                try:
+                    weights.extend(neighbors.values())
+                except (TypeError, OverflowError):
+                    # extend dừng giữa chừng: bỏ phần đã thêm rồi chuyển sang float64
+                    del weights[start:]
+                    weights = array('d', weights)
+                    weights.extend(neighbors.values())
+            else:
+                weights.extend(neighbors.values())
+            offsets.append(len(indices))
+
+        return cls(graph_type, labels, offsets, indices, weights)
+
+    @classmethod
+    def from_edge_arrays(cls, graph_type: GraphType, labels: List,
+                         sources: Sequence[int], targets: Sequence[int],
+                         weights: Sequence[float]) -> 'CSRGraph':
+        """
+        Xây dựng CSR trực tiếp từ các mảng cạnh theo mã đỉnh (vector hóa bằng NumPy)
+        Kết quả giống hệt khi thêm lần lượt các cạnh vào Graph rồi gọi freeze():
+        cạnh lặp lại giữ vị trí lần đầu và trọng số lần cuối, thứ tự kề theo thứ tự thêm
+        Args:
+            graph_type: Loại đồ thị
+            labels: Nhãn đỉnh theo mã
+            sources: Mã đỉnh xuất phát của từng cạnh
+            targets: Mã đỉnh đích của từng cạnh
+            weights: Trọng số của từng cạnh
+        """
+        import numpy as np
+        n = len(labels)
+        rows = np.asarray(sources, dtype=np.int64)
+        cols = np.asarray(targets, dtype=np.int64)
+        # Trọng số nguyên giữ int64 như from_adjacency, còn lại float64
+        values = np.asarray(weights)
+        values = values.astype(np.int64 if values.dtype.kind in 'iub' else np.float64)
+        time = np.arange(len(rows), dtype=np.int64)
+        
+        # Vô hướng: mỗi cạnh ghi vào cả 2 hàng tại cùng thời điểm (khuyên chỉ 1 lần)
+        if graph_type == GraphType.UNDIRECTED:
+            mirror = rows != cols
+            rows, cols, values, time = (np.concatenate((rows, cols[mirror])),
+                                        np.concatenate((cols, rows[mirror])),
+                                        np.concatenate((values, values[mirror])),
+                                        np.concatenate((time, time[mirror])))
+        
+        # Gom các lần ghi cùng ô (hàng, cột): lấy vị trí lần đầu, trọng số lần cuối
+        key = rows * max(n, 1) + cols
+        order = np.lexsort((time, key))
+        sorted_key = key[order]
+        boundary = sorted_key[1:] != sorted_key[:-1]
+        first = order[np.concatenate(([True], boundary))] if len(order) else order
+        last = order[np.concatenate((boundary, [True]))] if len(order) else order
+        
+        # Sắp theo hàng, trong mỗi hàng theo thời điểm thêm lần đầu
+        order = np.lexsort((time[first], rows[first]))
+        row_of = rows[first][order]
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_of, minlength=n), out=offsets[1:])
+        
+        return cls(graph_type, list(labels), _to_array('q', offsets),
+                   _to_array('q', cols[first][order]),
+                   _to_array('q' if values.dtype == np.int64 else 'd', values[last][order]))
+
+    # ===== Ánh xạ nhãn <-> mã số =====
+
+    @property
+    def index_of(self) -> Dict:
+        """Bảng {nhãn: mã} của các đỉnh"""
+        if self._index_of is None:
+            self._index_of = {v: i for i, v in enumerate(self.labels)}
+        return self._index_of
+
+    def vertex_id(self, vertex) -> int:
+        """Mã số nguyên của đỉnh (KeyError nếu đỉnh không tồn tại)"""
+        return self.index_of[vertex]
+
+    def vertex_label(self, index: int):
+        """Nhãn của đỉnh có mã index"""
+        return self.labels[index]
+
+    def vertex_ids(self) -> Dict:
+        """Giống Graph.vertex_ids - bảng {nhãn: mã}"""
+        return self.index_of
+
+    def vertex_labels(self) -> List:
+        """Giống Graph.vertex_labels - danh sách nhãn theo mã"""
+        return self.labels
+
+    def neighbor_range(self, index: int) -> range:
+        """Khoảng vị trí trong indices/weights ứng với các cạnh ra của đỉnh mã index"""
+        return range(self.offsets[index], self.offsets[index + 1])
+
+    # ===== Giao diện đọc giống Graph =====
+
+    def get_vertices(self) -> List[int]:
+        """Danh sách tất cả các đỉnh"""
+        return list(self.labels)
+
+    def get_neighbors(self, vertex: int) -> List[int]:
+        """Danh sách đỉnh kề của vertex"""
+        i = self.index_of.get(vertex)
+        if i is None:
+            return []
+        labels = self.labels
+        indices = self.indices
+        return [labels[indices[k]] for k in range(self.offsets[i], self.offsets[i + 1])]
+
+    def get_weight(self, u: int, v: int) -> Optional[float]:
+        """Trọng số cạnh (u, v), None nếu không có cạnh"""
+        i = self.index_of.get(u)
+        j = self.index_of.get(v)
+        if i is None or j is None:
+            return None
+        indices = self.indices
+        for k in range(self.offsets[i], self.offsets[i + 1]):
+            if indices[k] == j:
+                return self.weights[k]
+        return None
+
+    def has_edge(self, u: int, v: int) -> bool:
+        """Kiểm tra cạnh (u, v) có tồn tại không"""
+        return self.get_weight(u, v) is not None
+
+    def get_edges(self) -> List[Tuple[int, int, float]]:
+        """
+        Danh sách cạnh (u, v, trọng_số)
+        Đồ thị vô hướng: mỗi cạnh chỉ xuất hiện một lần (mã u <= mã v)
+        """
+        return list(self.iter_edges())
+
+    def iter_edges(self) -> Iterator[Tuple[int, int, float]]:
+        """Duyệt lần lượt các cạnh (u, v, trọng_số) không dựng danh sách"""
+        labels = self.labels
+        offsets = self.offsets
+        indices = self.indices
+        weights = self.weights
+        undirected = self.graph_type == GraphType.UNDIRECTED
+        for i in range(len(labels)):
+            u = labels[i]
+            for k in range(offsets[i], offsets[i + 1]):
+                j = indices[k]
+                if undirected and j < i:
+                    continue
+                yield u, labels[j], weights[k]
+
+    def iter_neighbors(self, vertex: int) -> Iterator[int]:
+        """Duyệt các đỉnh kề của vertex"""
+        i = self.index_of.get(vertex)
+        if i is None:
+            return
+        labels = self.labels
+        indices = self.indices
+        for k in range(self.offsets[i], self.offsets[i + 1]):
+            yield labels[indices[k]]
+
+    def neighbor_items(self, vertex: int) -> Iterator[Tuple[int, float]]:
+        """Duyệt các cặp (đỉnh_kề, trọng_số) của vertex"""
+        i = self.index_of.get(vertex)
+        if i is None:
+            return
+        labels = self.labels
+        indices = self.indices
+        weights = self.weights
+        for k in range(self.offsets[i], self.offsets[i + 1]):
+            yield labels[indices[k]], weights[k]
+
+    def get_adjacency_list(self) -> Dict[int, Dict[int, float]]:
+        """Dựng lại danh sách kề dạng dictionary"""
+        labels = self.labels
+        indices = self.indices
+        weights = self.weights
+        return {
+            labels[i]: {labels[indices[k]]: weights[k]
+                        for k in range(self.offsets[i], self.offsets[i + 1])}
+            for i in range(len(labels))
+        }
+
+    def vertex_count(self) -> int:
+        """Số lượng đỉnh"""
+        return len(self.labels)
+
+    def edge_count(self) -> int:
+        """Số lượng cạnh"""
+        if self.graph_type == GraphType.DIRECTED:
+            return len(self.indices)
+        # Vô hướng: mỗi cạnh lưu 2 chiều, khuyên (u, u) chỉ lưu 1 lần
+        loops = sum(1 for i in range(len(self.labels)) for k in self.neighbor_range(i)
+                    if self.indices[k] == i)
+        return (len(self.indices) - loops) // 2 + loops
+
+    def total_weight(self) -> float:
+        """Tổng trọng số các cạnh"""
+        return sum(weight for _, _, weight in self.iter_edges())
+
+    def is_directed(self) -> bool:
+        """Kiểm tra đồ thị có hướng"""
+        return self.graph_type == GraphType.DIRECTED
+
+    def get_degree(self, vertex: int) -> int:
+        """Bậc (ra) của đỉnh"""
+        i = self.index_of.get(vertex)
+        if i is None:
+            return 0
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def out_degree(self, vertex: int) -> int:
+        """Bậc ra của đỉnh"""
+        return self.get_degree(vertex)
+
+    def in_degree(self, vertex: int) -> int:
+        """Bậc vào của đỉnh"""
+        i = self.index_of.get(vertex)
+        if i is None:
+            return 0
+        offsets = self.reverse_arrays()[0]
+        return offsets[i + 1] - offsets[i]
+
+    def get_predecessors(self, vertex: int) -> List[int]:
+        """Danh sách các đỉnh có cạnh đi vào vertex"""
+        i = self.index_of.get(vertex)
+        if i is None:
+            return []
+        offsets, indices, _ = self.reverse_arrays()
+        labels = self.labels
+        return [labels[indices[k]] for k in range(offsets[i], offsets[i + 1])]
+
+    def reverse_arrays(self) -> Tuple[Sequence[int], Sequence[int], Sequence[float]]:
+        """
+        Bộ mảng (offsets, indices, weights) của đồ thị đảo chiều
+        Vô hướng: chính là bộ mảng gốc; có hướng: dựng một lần bằng đếm phân phối O(V + E)
+        """
+        if self.graph_type == GraphType.UNDIRECTED:
+            return self.offsets, self.indices, self.weights
+        if self._reverse is None:
+            n = len(self.labels)
+            indices = self.indices
+            weights = self.weights
+            # Đếm bậc vào rồi cộng dồn thành offsets
+            counts = array('q', bytes(8 * (n + 1)))
+            for k in range(len(indices)):
+                counts[indices[k] + 1] += 1
+            for i in range(n):
+                counts[i + 1] += counts[i]
+            rev_offsets = array('q', counts)
+            rev_indices = array('q', bytes(8 * len(indices)))
+            rev_weights = array(weight_typecode(weights), bytes(8 * len(indices)))
+            cursor = counts
+            for u in range(n):
+                for k in range(self.offsets[u], self.offsets[u + 1]):
+                    v = indices[k]
+                    pos = cursor[v]
+                    rev_indices[pos] = u
+                    rev_weights[pos] = weights[k]
+                    cursor[v] = pos + 1
+            self._reverse = (rev_offsets, rev_indices, rev_weights)
+        return self._reverse
+
+    def iter_neighbor_ids(self, index: int) -> Iterator[Tuple[int, float]]:
+        """Duyệt (mã_đỉnh_kề, trọng_số) của đỉnh mã index"""
+        indices = self.indices
+        weights = self.weights
+        for k in range(self.offsets[index], self.offsets[index + 1]):
+            yield indices[k], weights[k]
+
+    def to_graph(self):
+        """
+        Chuyển ngược lại thành Graph có thể chỉnh sửa
+        Dựng thẳng các dict kề theo từng hàng nên giữ nguyên mã đỉnh và thứ tự kề
+        """
+        from src.core.graph import Graph
+        graph = Graph(self.graph_type)
+        labels = list(self.labels)
+        offsets = self.offsets
+        indices = self.indices
+        weights = self.weights
+        adjacency = graph._adjacency_list
+        for i, v in enumerate(labels):
+            adjacency[v] = {labels[indices[k]]: weights[k] for k in range(offsets[i], offsets[i + 1])}
+        if graph._predecessors is not None:
+            predecessors = graph._predecessors
+            for v in labels:
+                predecessors[v] = {}
+            for u, neighbors in adjacency.items():
+                for v, weight in neighbors.items():
+                    predecessors[v][u] = weight
+        graph._vertex_ids = {v: i for i, v in enumerate(labels)}
+        graph._id_to_vertex = labels
+        graph._edge_count = self.edge_count()
+        graph._total_weight = self.total_weight()
+        return graph
+
+
+def weight_typecode(weights: Sequence) -> str:
+    """Kiểu phần tử của mảng trọng số CSR: 'q' (int64) hoặc 'd' (float64)"""
+    typecode = getattr(weights, 'typecode', None)
+    return typecode if typecode is not None else weights.format
+
+
+def _to_array(typecode: str, values) -> array:
+    """Chuyển mảng NumPy sang array của thư viện chuẩn (cùng kiểu với freeze())"""
+    result = array(typecode)
+    result.frombytes(values.astype('q' if typecode == 'q' else 'd').tobytes())
+    return result
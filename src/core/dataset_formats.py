@@ -0,0 +1,346 @@
+"""
+Module đọc/ghi các định dạng bộ dữ liệu đồ thị chuẩn dùng để benchmark
+- DIMACS đường đi ngắn nhất (.gr): "p sp n m", mỗi cung "a u v w"
+- DIMACS luồng cực đại (.max): "p max n m", "n id s|t", mỗi cung "a u v cap"
+- Matrix Market (.mtx): ma trận thưa dạng coordinate (general = có hướng,
+  symmetric = vô hướng), chỉ số bắt đầu từ 1
+- SNAP: danh sách cạnh cách nhau bởi khoảng trắng, comment bắt đầu bằng '#'
+Các file được đọc dần theo khối (có thể nén gzip/bz2/xz) và thêm cạnh
+qua Graph.add_edges_from
+DIMACS và Matrix Market chỉ có đỉnh 1..n: khi xuất, nhãn đỉnh khác được đánh số lại
+theo thứ tự get_vertices() và nhãn gốc không được lưu. SNAP giữ nhãn nhưng bỏ mất
+đỉnh cô lập
+"""
+from itertools import chain
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
+from src.core.graph import Graph, GraphType
+from src.core.file_io import open_graph_file, _iter_txt_lines, _parse_label
+from src.utils.config import FILE_READ_CHUNK_SIZE
+
+
+# ===== DIMACS =====
+def import_from_dimacs(filepath: str) -> Graph:
+    """
+    Nhập đồ thị có hướng từ file DIMACS đường đi ngắn nhất (.gr)
+    Args:
+        filepath: Đường dẫn file
+    Returns:
+        Đồ thị có hướng với các đỉnh 1..n
+    """
+    with open_graph_file(filepath, 'r') as f:
+        graph, _, _ = read_dimacs(f)
+    return graph
+
+
+def import_from_dimacs_max(filepath: str) -> Tuple[Graph, Optional[int], Optional[int]]:
+    """
+    Nhập mạng luồng từ file DIMACS luồng cực đại (.max)
+    Args:
+        filepath: Đường dẫn file
+    Returns:
+        Tuple (đồ thị có hướng với trọng số là khả năng thông qua, đỉnh phát, đỉnh thu)
+    """
+    with open_graph_file(filepath, 'r') as f:
+        return read_dimacs(f)
+
+
+def read_dimacs(stream: TextIO, chunk_size: int = FILE_READ_CHUNK_SIZE
+                ) -> Tuple[Graph, Optional[int], Optional[int]]:
+    """
+    Phân tích file DIMACS (bài toán sp hoặc max) từ một luồng văn bản
+    Cung song song được gộp: bài toán max cộng dồn khả năng thông qua,
+    bài toán sp giữ cung có trọng số nhỏ nhất
+    Args:
+        stream: Luồng văn bản cần đọc
+        chunk_size: Số ký tự đọc mỗi lần
+    Returns:
+        Tuple (đồ thị có hướng, đỉnh phát, đỉnh thu) - đỉnh phát/thu là None
+        nếu file không khai báo (bài toán sp)
+    """
+    lines = _iter_txt_lines(stream, chunk_size)
+    graph = Graph(GraphType.DIRECTED)
+    problem = None
+    terminals: Dict[str, int] = {}
+    
+    # Phần đầu: comment 'c', dòng bài toán 'p', các dòng đỉnh 'n' (bài toán max)
+    line = None
+    for line in lines:
+        kind = line[0]
+        if kind == 'a':
+            break
+        parts = line.split()
+        if kind == 'p':
+            if len(parts) < 4:
+                raise ValueError(f"Dòng bài toán DIMACS không hợp lệ: {line}")
+            problem = parts[1].lower()
+            for vertex in range(1, int(parts[2]) + 1):
+                graph.add_vertex(vertex)
+        elif kind == 'n' and len(parts) >= 3:
+            terminals[parts[2].lower()] = int(parts[1])
+        elif kind != 'c':
+            raise ValueError(f"Dòng DIMACS không hợp lệ: {line}")
+    else:
+        line = None
+    if problem is None:
+        raise ValueError("Thiếu dòng bài toán 'p' của DIMACS")
+    
+    def arcs() -> Iterator[Tuple[int, int, float]]:
+        get_weight = graph.get_weight
+        for text in chain([line] if line is not None else [], lines):
+            parts = text.split()
+            if parts[0] != 'a':
+                if parts[0] == 'c':
+                    continue
+                raise ValueError(f"Dòng DIMACS không hợp lệ: {text}")
+            u = int(parts[1])
+            v = int(parts[2])
+            weight = float(parts[3]) if len(parts) > 3 else 1.0
+            # add_edges_from tiêu thụ dần nên các cung trước đã có trong đồ thị
+            previous = get_weight(u, v)
+            if previous is not None:
+                weight = previous + weight if problem == 'max' else min(previous, weight)
+            yield u, v, weight
+    
+    graph.add_edges_from(arcs())
+    return graph, terminals.get('s'), terminals.get('t')
+
+
+def export_to_dimacs(graph: Graph, filepath: str):
+    """
+    Xuất đồ thị ra file DIMACS đường đi ngắn nhất (.gr)
+    Đỉnh được đánh số lại 1..n theo thứ tự get_vertices() (giữ nguyên nếu đồ thị đã có
+    đúng các đỉnh 1..n), nhãn gốc bị mất; mỗi cạnh vô hướng được ghi thành hai cung
+    nên khi nhập lại sẽ là đồ thị có hướng
+    Args:
+        graph: Đồ thị cần xuất
+        filepath: Đường dẫn file
+    """
+    with open_graph_file(filepath, 'w') as f:
+        _write_dimacs(graph, f, 'sp')
+
+
+def export_to_dimacs_max(graph: Graph, filepath: str, source: int, sink: int):
+    """
+    Xuất mạng luồng ra file DIMACS luồng cực đại (.max)
+    Đỉnh được đánh số lại 1..n như export_to_dimacs
+    Args:
+        graph: Đồ thị cần xuất (trọng số là khả năng thông qua)
+        filepath: Đường dẫn file
+        source: Đỉnh phát
+        sink: Đỉnh thu
+    """
+    with open_graph_file(filepath, 'w') as f:
+        _write_dimacs(graph, f, 'max', source, sink)
+
+
+def _write_dimacs(graph: Graph, stream: TextIO, problem: str,
+                  source: Optional[int] = None, sink: Optional[int] = None):
+    """Ghi đồ thị dạng DIMACS (bài toán sp hoặc max) vào luồng văn bản"""
+    ids = _one_based_ids(graph)
+    undirected = not graph.is_directed()
+    arc_count = graph.edge_count()
+    if undirected:
+        loops = sum(1 for v in ids if graph.has_edge(v, v))
+        arc_count = 2 * arc_count - loops
+    
+    stream.write(f"c {graph.graph_type.value} graph\n")
+    stream.write(f"p {problem} {len(ids)} {arc_count}\n")
+    if problem == 'max':
+        stream.write(f"n {ids[source]} s\nn {ids[sink]} t\n")
+    
+    batch = []
+    for u, v, weight in graph.iter_edges():
+        weight = _format_number(weight)
+        batch.append(f"a {ids[u]} {ids[v]} {weight}\n")
+        if undirected and u != v:
+            batch.append(f"a {ids[v]} {ids[u]} {weight}\n")
+        if len(batch) >= 4096:
+            stream.write(''.join(batch))
+            batch = []
+    stream.write(''.join(batch))
+
+
+# ===== Matrix Market =====
+def import_from_matrix_market(filepath: str) -> Graph:
+    """
+    Nhập đồ thị từ file Matrix Market (.mtx)
+    Args:
+        filepath: Đường dẫn file
+    Returns:
+        Đối tượng Graph với các đỉnh 1..n
+    """
+    with open_graph_file(filepath, 'r') as f:
+        return read_matrix_market(f)
+
+
+def read_matrix_market(stream: TextIO, chunk_size: int = FILE_READ_CHUNK_SIZE) -> Graph:
+    """
+    Phân tích ma trận kề dạng Matrix Market coordinate từ một luồng văn bản
+    - symmetric: đồ thị vô hướng (mỗi cạnh xuất hiện một lần ở tam giác dưới)
+    - general: đồ thị có hướng, phần tử (i, j) là cung i -> j
+    - pattern: không có giá trị, trọng số mặc định 1
+    Ma trận chữ nhật được coi là vuông cạnh max(số hàng, số cột)
+    Args:
+        stream: Luồng văn bản cần đọc
+        chunk_size: Số ký tự đọc mỗi lần
+    Returns:
+        Đối tượng Graph
+    """
+    lines = _iter_txt_lines(stream, chunk_size)
+    banner = next(lines, '').split()
+    if len(banner) < 5 or banner[0].lower() != '%%matrixmarket':
+        raise ValueError("Thiếu dòng tiêu đề %%MatrixMarket")
+    layout, field, symmetry = (token.lower() for token in banner[2:5])
+    if banner[1].lower() != 'matrix' or layout != 'coordinate':
+        raise ValueError("Chỉ hỗ trợ ma trận Matrix Market dạng coordinate")
+    if field not in ('real', 'integer', 'pattern', 'double'):
+        raise ValueError(f"Kiểu giá trị Matrix Market không hỗ trợ: {field}")
+    if symmetry not in ('general', 'symmetric'):
+        raise ValueError(f"Kiểu đối xứng Matrix Market không hỗ trợ: {symmetry}")
+    
+    size = None
+    for line in lines:
+        if line[0] != '%':
+            size = line.split()
+            break
+    if size is None or len(size) < 3:
+        raise ValueError("Thiếu dòng kích thước của Matrix Market")
+    
+    graph = Graph(GraphType.UNDIRECTED if symmetry == 'symmetric' else GraphType.DIRECTED)
+    for vertex in range(1, max(int(size[0]), int(size[1])) + 1):
+        graph.add_vertex(vertex)
+    
+    pattern = field == 'pattern'
+    edges = (
+        (int(parts[0]), int(parts[1]), 1.0 if pattern else float(parts[2]))
+        for parts in (line.split() for line in lines if line[0] != '%')
+    )
+    graph.add_edges_from(edges)
+    return graph
+
+
+def export_to_matrix_market(graph: Graph, filepath: str):
+    """
+    Xuất ma trận kề của đồ thị ra file Matrix Market (.mtx)
+    Đồ thị vô hướng được ghi dạng symmetric (tam giác dưới), có hướng dạng general
+    Đỉnh được đánh số lại 1..n theo thứ tự get_vertices() (giữ nguyên nếu đồ thị đã có
+    đúng các đỉnh 1..n), nhãn gốc bị mất
+    Args:
+        graph: Đồ thị cần xuất
+        filepath: Đường dẫn file
+    """
+    ids = _one_based_ids(graph)
+    undirected = not graph.is_directed()
+    with open_graph_file(filepath, 'w') as f:
+        f.write(f"%%MatrixMarket matrix coordinate real {'symmetric' if undirected else 'general'}\n")
+        f.write(f"{len(ids)} {len(ids)} {graph.edge_count()}\n")
+        batch = []
+        for u, v, weight in graph.iter_edges():
+            i, j = ids[u], ids[v]
+            if undirected and i < j:
+                i, j = j, i
+            batch.append(f"{i} {j} {_format_number(weight)}\n")
+            if len(batch) >= 4096:
+                f.write(''.join(batch))
+                batch = []
+        f.write(''.join(batch))
+
+
+# ===== SNAP =====
+def import_from_snap(filepath: str, directed: Optional[bool] = None) -> Graph:
+    """
+    Nhập đồ thị từ danh sách cạnh kiểu SNAP
+    Args:
+        filepath: Đường dẫn file
+        directed: Loại đồ thị, None để đọc từ comment đầu file
+            ("# Undirected graph ..." là vô hướng, còn lại có hướng)
+    Returns:
+        Đối tượng Graph
+    """
+    with open_graph_file(filepath, 'r') as f:
+        return read_snap(f, directed=directed)
+
+
+def read_snap(stream: TextIO, directed: Optional[bool] = None,
+              chunk_size: int = FILE_READ_CHUNK_SIZE) -> Graph:
+    """
+    Phân tích danh sách cạnh kiểu SNAP từ một luồng văn bản
+    Mỗi dòng "u v" hoặc "u v trọng_số" (cách nhau bởi tab/khoảng trắng);
+    nhãn đỉnh là số nguyên nếu được, ngược lại giữ chuỗi
+    Args:
+        stream: Luồng văn bản cần đọc
+        directed: Loại đồ thị, None để đọc từ comment đầu file
+        chunk_size: Số ký tự đọc mỗi lần
+    Returns:
+        Đối tượng Graph
+    """
+    # Các dòng comment đầu file cho biết loại đồ thị
+    undirected = False
+    line = stream.readline()
+    while line.startswith('#'):
+        undirected = undirected or 'undirected' in line.lower()
+        line = stream.readline()
+    if directed is None:
+        directed = not undirected
+    
+    graph = Graph(GraphType.DIRECTED if directed else GraphType.UNDIRECTED)
+    first = [line.strip()] if line.strip() else []
+    labels: Dict[str, Any] = {}
+    
+    def edges() -> Iterator[Tuple[Any, Any, float]]:
+        for text in chain(first, _iter_txt_lines(stream, chunk_size)):
+            parts = text.split()
+            if len(parts) < 2:
+                continue
+            u = labels.get(parts[0])
+            if u is None:
+                u = _parse_label(parts[0], labels)
+            v = labels.get(parts[1])
+            if v is None:
+                v = _parse_label(parts[1], labels)
+            yield u, v, float(parts[2]) if len(parts) > 2 else 1.0
+    
+    graph.add_edges_from(edges())
+    return graph
+
+
+def export_to_snap(graph: Graph, filepath: str, weights: Optional[bool] = None):
+    """
+    Xuất đồ thị ra danh sách cạnh kiểu SNAP (đỉnh cô lập không được ghi)
+    Args:
+        graph: Đồ thị cần xuất (nhãn đỉnh không chứa khoảng trắng)
+        filepath: Đường dẫn file
+        weights: True để ghi thêm cột trọng số, False để bỏ, None (mặc định) để
+            chỉ ghi khi có cạnh trọng số khác 1
+    """
+    if weights is None:
+        weights = any(weight != 1 for _, _, weight in graph.iter_edges())
+    with open_graph_file(filepath, 'w') as f:
+        kind = 'Directed' if graph.is_directed() else 'Undirected'
+        f.write(f"# {kind} graph\n")
+        f.write(f"# Nodes: {graph.vertex_count()} Edges: {graph.edge_count()}\n")
+        f.write("# FromNodeId\tToNodeId" + ("\tWeight\n" if weights else "\n"))
+        batch = []
+        for u, v, weight in graph.iter_edges():
+            batch.append(f"{u}\t{v}\t{_format_number(weight)}\n" if weights else f"{u}\t{v}\n")
+            if len(batch) >= 4096:
+                f.write(''.join(batch))
+                batch = []
+        f.write(''.join(batch))
+
+
+# ===== Hàm hỗ trợ =====
+def _one_based_ids(graph: Graph) -> Dict[int, int]:
+    """Ánh xạ đỉnh -> số thứ tự 1..n (giữ nguyên nếu các đỉnh đã là 1..n)"""
+    vertices = graph.get_vertices()
+    n = len(vertices)
+    if all(type(v) is int and 1 <= v <= n for v in vertices):
+        return {v: v for v in vertices}
+    return {v: i for i, v in enumerate(vertices, 1)}
+
+
+def _format_number(value: float) -> str:
+    """Số dạng ngắn: số nguyên không có phần thập phân"""
+    if type(value) is float and value.is_integer():
+        return str(int(value))
+    return repr(value)
@@ -1,115 +1,524 @@
 """
 Module xử lý đọc/ghi file cho đồ thị
-Hỗ trợ định dạng JSON và TXT
+Hỗ trợ định dạng JSON, TXT và nhị phân (CSR, mở bằng mmap),
+mỗi định dạng có thể được nén gzip/bz2/xz (giải nén dạng luồng khi đọc)
+Các định dạng bộ dữ liệu chuẩn (DIMACS, Matrix Market, SNAP) nằm ở dataset_formats
 """
+import bz2
+import gzip
+import hashlib
 import json
-from typing import Dict, Any
-from src.core.graph import Graph, GraphType
+import lzma
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from itertools import chain
+from typing import Dict, Any, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+from src.core.graph import Graph, GraphType, vertex_sort_key
+from src.core.csr import CSRGraph, weight_typecode
+from src.utils.config import (
+    FILE_READ_CHUNK_SIZE, EDGE_BATCH_SIZE,
+    PARALLEL_PARSE_MIN_BYTES, PARALLEL_CHUNKS_PER_WORKER, GRAPH_CACHE_SUFFIX, JOURNAL_SUFFIX
+)
 
 
-def save_graph(graph: Graph, filepath: str, format: str = 'json'):
+def save_graph(graph: Graph, filepath: str, format: str = None):
     """
     Lưu đồ thị vào file
     Args:
         graph: Đồ thị cần lưu
         filepath: Đường dẫn file
-        format: Định dạng file ('json' hoặc 'txt')
+        format: Định dạng file ('json', 'txt', 'bin', 'dimacs', 'mtx' hoặc 'snap'),
+            None để chọn theo phần mở rộng (mặc định JSON)
+    Tên file kết thúc bằng .gz/.bz2/.xz thì được nén tương ứng (vd: graph.json.gz)
     """
+    if format is None:
+        format = _format_from_name(filepath) or 'json'
+    
     if format.lower() == 'json':
         export_to_json(graph, filepath)
     elif format.lower() == 'txt':
         export_to_txt(graph, filepath)
+    elif format.lower() in ('bin', 'binary'):
+        export_to_binary(graph, filepath)
+    elif format.lower() in _DATASET_FORMATS:
+        from src.core import dataset_formats
+        exporter = _DATASET_FORMATS[format.lower()][1]
+        if exporter is None:
+            raise ValueError(f"Định dạng {format} cần đỉnh phát/thu, dùng export_to_dimacs_max")
+        getattr(dataset_formats, exporter)(graph, filepath)
     else:
         raise ValueError(f"Định dạng không hỗ trợ: {format}")
 
 
-def load_graph(filepath: str, format: str = None) -> Graph:
+def load_graph(filepath: str, format: str = None, readonly: bool = False,
+               workers: Optional[int] = None, cache: bool = False,
+               journal: bool = True) -> Union[Graph, CSRGraph]:
     """
     Tải đồ thị từ file
     Args:
         filepath: Đường dẫn file
-        format: Định dạng file ('json' hoặc 'txt'), None để tự động phát hiện
+        format: Định dạng file ('json', 'txt', 'bin', 'dimacs', 'dimacs_max', 'mtx'
+            hoặc 'snap'), None để tự động phát hiện
+        readonly: True để nhận ảnh chụp chỉ-đọc CSRGraph (file nhị phân được
+            mmap trực tiếp, không sao chép)
+        workers: Số tiến trình phân tích file TXT lớn khi readonly=True (None = số CPU,
+            1 = tuần tự). Khi cần Graph, file TXT luôn được đọc tuần tự: dựng lại Graph
+            từ kết quả song song tốn hơn phần phân tích tiết kiệm được
+        cache: True để dùng file cache nhị phân đặt cạnh file nguồn (xem load_graph_cached)
+        journal: True để phát lại nhật ký thay đổi <file>.journal nếu có (xem GraphJournal)
+    File nén (nhận biết qua phần mở rộng hoặc magic bytes) được giải nén dạng luồng
     Returns:
-        Đối tượng Graph
+        Đối tượng Graph (hoặc CSRGraph nếu readonly=True)
     """
-    # Tự động phát hiện định dạng từ phần mở rộng file
+    if journal and os.path.exists(filepath + JOURNAL_SUFFIX):
+        from src.core.journal import read_journal, apply_journal
+        records = read_journal(filepath)
+        if records is not None and records[0]:
+            graph = load_graph(filepath, format=format, workers=workers, cache=cache, journal=False)
+            apply_journal(graph, records[0])
+            return graph.freeze() if readonly else graph
+    
+    if cache:
+        return load_graph_cached(filepath, format=format, readonly=readonly, workers=workers)
+    
+    # Tự động phát hiện định dạng từ phần mở rộng file (bỏ qua đuôi nén)
     if format is None:
-        if filepath.lower().endswith('.json'):
-            format = 'json'
-        elif filepath.lower().endswith('.txt'):
-            format = 'txt'
-        else:
+        format = _format_from_name(filepath)
+        if format is None and is_binary_graph_file(filepath):
+            format = 'bin'
+        if format is None:
             # Thử đọc JSON trước, nếu lỗi thì thử TXT
             try:
-                return import_from_json(filepath)
+                graph = import_from_json(filepath)
             except:
-                return import_from_txt(filepath)
+                graph = import_from_txt(filepath)
+            return graph.freeze() if readonly else graph
     
+    if format.lower() in ('bin', 'binary'):
+        return import_from_binary(filepath, readonly=readonly)
     if format.lower() == 'json':
-        return import_from_json(filepath)
+        graph = import_from_json(filepath)
     elif format.lower() == 'txt':
-        return import_from_txt(filepath)
+        if (readonly and (workers or os.cpu_count() or 1) > 1
+                and detect_compression(filepath) is None
+                and os.path.getsize(filepath) >= PARALLEL_PARSE_MIN_BYTES):
+            return import_from_txt_parallel(filepath, workers=workers, readonly=readonly)
+        graph = import_from_txt(filepath)
+    elif format.lower() in _DATASET_FORMATS:
+        from src.core import dataset_formats
+        graph = getattr(dataset_formats, _DATASET_FORMATS[format.lower()][0])(filepath)
+        if isinstance(graph, tuple):
+            graph = graph[0]  # DIMACS max: bỏ đỉnh phát/thu
     else:
         raise ValueError(f"Định dạng không hỗ trợ: {format}")
+    return graph.freeze() if readonly else graph
+
+
+def load_graph_cached(filepath: str, format: str = None, readonly: bool = False,
+                      workers: Optional[int] = None) -> Union[Graph, CSRGraph]:
+    """
+    Tải đồ thị qua file cache nhị phân đặt cạnh file nguồn (<file>.cache.bin)
+    Cache được dùng khi khớp đường dẫn, kích thước và mtime của nguồn; nếu chỉ mtime
+    thay đổi thì so thêm mã băm nội dung (BLAKE2b). Nguồn thay đổi thì phân tích lại
+    và ghi đè cache. Không ghi được cache (thư mục chỉ-đọc...) thì vẫn trả về đồ thị
+    Args:
+        filepath: Đường dẫn file nguồn
+        format: Định dạng file nguồn, None để tự động phát hiện
+        readonly: True để nhận CSRGraph (mmap trực tiếp file cache)
+        workers: Số tiến trình khi phải phân tích lại file TXT lớn
+    Returns:
+        Đối tượng Graph (hoặc CSRGraph nếu readonly=True)
+    """
+    if (format or _format_from_name(filepath)) in ('bin', 'binary'):
+        return load_graph(filepath, format=format, readonly=readonly, journal=False)
+    
+    cache_path = filepath + GRAPH_CACHE_SUFFIX
+    meta_path = cache_path + '.json'
+    stat = os.stat(filepath)
+    key = {
+        'source': os.path.abspath(filepath),
+        'format': format,
+        'binary_version': BINARY_VERSION,
+        'size': stat.st_size,
+    }
+    
+    meta = _read_cache_meta(meta_path)
+    digest = None
+    if meta is not None and all(meta.get(name) == value for name, value in key.items()) \
+            and os.path.exists(cache_path):
+        if meta.get('mtime_ns') == stat.st_mtime_ns:
+            return import_from_binary(cache_path, readonly=readonly)
+        # Chỉ mtime thay đổi (copy, touch...): so nội dung
+        digest = _file_digest(filepath)
+        if digest == meta.get('hash'):
+            meta['mtime_ns'] = stat.st_mtime_ns
+            _write_cache_meta(meta_path, meta)
+            return import_from_binary(cache_path, readonly=readonly)
+    
+    # Băm trước khi phân tích: nếu nguồn bị sửa trong lúc đọc, lần sau sẽ phát hiện
+    if digest is None:
+        digest = _file_digest(filepath)
+    graph = load_graph(filepath, format=format, readonly=readonly, workers=workers, journal=False)
+    try:
+        temp_path = cache_path + '.tmp'
+        export_to_binary(graph, temp_path)
+        os.replace(temp_path, cache_path)
+        _write_cache_meta(meta_path, dict(key, mtime_ns=stat.st_mtime_ns, hash=digest))
+    except OSError:
+        pass
+    return graph
+
+
+# Mã băm đã tính theo đường dẫn: {đường_dẫn: ((kích_thước, mtime_ns, inode), mã_băm)}
+_digest_cache: Dict[str, Tuple[tuple, str]] = {}
+
+
+def _file_digest(filepath: str) -> str:
+    """
+    Mã băm BLAKE2b của nội dung file (đọc theo khối)
+    Được ghi nhớ theo (kích thước, mtime, inode): các bước của cùng một lần tải
+    (phát lại nhật ký, ghi tiếp nhật ký) chỉ đọc file để băm một lần
+    """
+    stat = os.stat(filepath)
+    key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    cached = _digest_cache.get(filepath)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(FILE_READ_CHUNK_SIZE), b''):
+            digest.update(block)
+    result = digest.hexdigest()
+    _digest_cache[filepath] = (key, result)
+    return result
+
+
+def _read_cache_meta(meta_path: str) -> Optional[Dict[str, Any]]:
+    """Đọc thông tin của file cache, None nếu chưa có hoặc bị hỏng"""
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache_meta(meta_path: str, meta: Dict[str, Any]):
+    """Ghi thông tin của file cache (bỏ qua nếu không ghi được)"""
+    try:
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+    except OSError:
+        pass
+
+
+# ===== File nén =====
+_COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.gzip': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.lzma': 'xz'}
+_COMPRESSION_MAGIC = ((b'\x1f\x8b', 'gzip'), (b'\xfd7zXZ\x00', 'xz'), (b'BZh', 'bz2'))
+_COMPRESSION_MODULES = {'gzip': gzip, 'bz2': bz2, 'xz': lzma}
+
+
+def detect_compression(filepath: str, check_content: bool = True) -> Optional[str]:
+    """
+    Nhận biết kiểu nén của file
+    Args:
+        filepath: Đường dẫn file
+        check_content: True để đọc magic bytes khi phần mở rộng không cho biết
+    Returns:
+        'gzip', 'bz2', 'xz' hoặc None nếu không nén
+    """
+    name = filepath.lower()
+    for extension, compression in _COMPRESSION_EXTENSIONS.items():
+        if name.endswith(extension):
+            return compression
+    if check_content and os.path.isfile(filepath):
+        with open(filepath, 'rb') as f:
+            head = f.read(6)
+        for magic, compression in _COMPRESSION_MAGIC:
+            # bz2: 'BZh' + mức nén '1'..'9' để không nhầm với file văn bản
+            if head.startswith(magic) and (compression != 'bz2' or head[3:4].isdigit()):
+                return compression
+    return None
 
 
-def export_to_json(graph: Graph, filepath: str):
+def open_graph_file(filepath: str, mode: str = 'r'):
     """
-    Xuất đồ thị ra file JSON
+    Mở file đồ thị, tự động nén/giải nén dạng luồng theo detect_compression
+    Args:
+        filepath: Đường dẫn file
+        mode: 'r', 'w' (văn bản UTF-8) hoặc 'rb', 'wb' (nhị phân)
+    Returns:
+        Đối tượng file
+    """
+    compression = detect_compression(filepath, check_content='r' in mode)
+    binary = 'b' in mode
+    if compression is None:
+        return open(filepath, mode) if binary else open(filepath, mode, encoding='utf-8')
+    module = _COMPRESSION_MODULES[compression]
+    if binary:
+        return module.open(filepath, mode)
+    return module.open(filepath, mode + 't', encoding='utf-8')
+
+
+# Định dạng bộ dữ liệu chuẩn: tên -> (hàm nhập, hàm xuất) trong dataset_formats
+_DATASET_FORMATS = {
+    'dimacs': ('import_from_dimacs', 'export_to_dimacs'),
+    'dimacs_max': ('import_from_dimacs_max', None),
+    'mtx': ('import_from_matrix_market', 'export_to_matrix_market'),
+    'snap': ('import_from_snap', 'export_to_snap'),
+}
+
+
+def _format_from_name(filepath: str) -> Optional[str]:
+    """Định dạng ('json', 'txt', 'bin', 'dimacs', 'dimacs_max', 'mtx') theo phần mở rộng, bỏ qua đuôi nén"""
+    name = filepath.lower()
+    for extension in _COMPRESSION_EXTENSIONS:
+        if name.endswith(extension):
+            name = name[:-len(extension)]
+            break
+    for extension, format in (('.json', 'json'), ('.txt', 'txt'), ('.bin', 'bin'),
+                              ('.gr', 'dimacs'), ('.max', 'dimacs_max'), ('.mtx', 'mtx')):
+        if name.endswith(extension):
+            return format
+    return None
+
+
+def export_to_json(graph: Graph, filepath: str, indent: Optional[int] = None):
+    """
+    Xuất đồ thị ra file JSON (ghi dần từng cạnh, xem write_json)
     Args:
         graph: Đồ thị cần xuất
         filepath: Đường dẫn file JSON
+        indent: Số khoảng trắng thụt lề, None để ghi gọn (mặc định)
     """
-    # Chuẩn bị dữ liệu để lưu
-    data = {
-        'graph_type': graph.graph_type.value,
-        'vertices': graph.get_vertices(),
-        'edges': [
-            {
-                'source': u,
-                'target': v,
-                'weight': weight
-            }
-            for u, v, weight in graph.get_edges()
-        ]
-    }
+    with open_graph_file(filepath, 'w') as f:
+        write_json(graph, f, indent=indent)
+
+
+def write_json(graph: Graph, stream: TextIO, indent: Optional[int] = None):
+    """
+    Ghi đồ thị dạng JSON {graph_type, vertices, edges} vào luồng văn bản
+    Các cạnh được mã hóa và ghi theo từng lô ngay khi duyệt, không dựng
+    dictionary trung gian cho toàn bộ tài liệu
+    Args:
+        graph: Đồ thị cần ghi
+        stream: Luồng văn bản đích
+        indent: Số khoảng trắng thụt lề (cho kết quả giống json.dump(..., indent=indent)),
+            None để ghi gọn
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    
+    if indent is None:
+        open_array, separator, close_array = '[', ',', ']'
+        fields = ('{"source":', ',"target":', ',"weight":', '}')
+        stream.write('{"graph_type":' + encode(graph.graph_type.value) + ',"vertices":')
+    else:
+        pad = ' ' * indent
+        open_array = '[\n' + pad * 2
+        separator = ',\n' + pad * 2
+        close_array = '\n' + pad + ']'
+        fields = ('{\n' + pad * 3 + '"source": ', ',\n' + pad * 3 + '"target": ',
+                  ',\n' + pad * 3 + '"weight": ', '\n' + pad * 2 + '}')
+        stream.write('{\n' + pad + '"graph_type": ' + encode(graph.graph_type.value)
+                     + ',\n' + pad + '"vertices": ')
+    
+    # Mã hóa mỗi nhãn đỉnh một lần
+    labels = {v: encode(v) for v in graph.get_vertices()}
+    _write_json_array(stream, labels.values(), open_array, separator, close_array)
     
-    # Ghi vào file JSON
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    stream.write(',' + ('\n' + pad + '"edges": ' if indent is not None else '"edges":'))
+    source_field, target_field, weight_field, end_field = fields
+    edges = (
+        source_field + labels[u] + target_field + labels[v] + weight_field
+        + (repr(weight) if type(weight) is float and math.isfinite(weight) else encode(weight))
+        + end_field
+        for u, v, weight in graph.iter_edges()
+    )
+    _write_json_array(stream, edges, open_array, separator, close_array)
+    stream.write('\n}' if indent is not None else '}')
+
+
+def _write_json_array(stream: TextIO, items: Iterable[str], open_array: str,
+                      separator: str, close_array: str):
+    """Ghi một mảng JSON từ các phần tử đã mã hóa, theo từng lô EDGE_BATCH_SIZE phần tử"""
+    batch = []
+    first = True
+    for item in items:
+        batch.append(item)
+        if len(batch) >= EDGE_BATCH_SIZE:
+            stream.write((open_array if first else separator) + separator.join(batch))
+            batch = []
+            first = False
+    if batch:
+        stream.write((open_array if first else separator) + separator.join(batch))
+        first = False
+    stream.write('[]' if first else close_array)
 
 
 def import_from_json(filepath: str) -> Graph:
     """
-    Nhập đồ thị từ file JSON
+    Nhập đồ thị từ file JSON (đọc dần, xem read_json)
     Args:
         filepath: Đường dẫn file JSON
     Returns:
         Đối tượng Graph
     """
-    # Đọc file JSON
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Tạo đồ thị mới
-    graph_type = GraphType(data['graph_type'])
-    graph = Graph(graph_type)
+    with open_graph_file(filepath, 'r') as f:
+        return read_json(f)
+
+
+def read_json(stream: TextIO, chunk_size: int = FILE_READ_CHUNK_SIZE) -> Graph:
+    """
+    Phân tích đồ thị JSON {graph_type, vertices, edges} từ luồng văn bản
+    Tài liệu được đọc theo từng khối và mỗi đỉnh/cạnh được giải mã riêng lẻ,
+    không dựng cây tài liệu đầy đủ; các cạnh được thêm vào đồ thị theo từng lô
+    Args:
+        stream: Luồng văn bản cần đọc
+        chunk_size: Số ký tự đọc mỗi lần
+    Returns:
+        Đối tượng Graph
+    """
+    graph = None
+    graph_type = None
+    vertices = []
+    sources = []
+    targets = []
+    weights = []
     
-    # Thêm các đỉnh
-    for vertex in data['vertices']:
-        graph.add_vertex(vertex)
+    def flush():
+        nonlocal graph, sources, targets, weights
+        if graph is None:
+            graph = Graph(GraphType(graph_type))
+        for vertex in vertices:
+            graph.add_vertex(vertex)
+        vertices.clear()
+        graph.add_edges_from(sources=sources, targets=targets, weights=weights)
+        sources, targets, weights = [], [], []
     
-    # Thêm các cạnh
-    for edge in data['edges']:
-        graph.add_edge(
-            edge['source'],
-            edge['target'],
-            edge.get('weight', 1.0)
-        )
+    for key, value in iter_json_items(stream, chunk_size):
+        if key == 'edges':
+            sources.append(value['source'])
+            targets.append(value['target'])
+            weights.append(value.get('weight', 1.0))
+            if len(sources) >= EDGE_BATCH_SIZE and graph_type is not None:
+                flush()
+        elif key == 'vertices':
+            vertices.append(value)
+        elif key == 'graph_type':
+            graph_type = value
     
+    if graph_type is None and graph is None:
+        raise KeyError('graph_type')
+    flush()
     return graph
 
 
+def iter_json_items(stream: TextIO, chunk_size: int = FILE_READ_CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """
+    Duyệt dần một tài liệu JSON dạng object ở mức ngoài cùng
+    Với khóa có giá trị là mảng, trả về từng phần tử (khóa, phần_tử);
+    các khóa khác trả về (khóa, giá_trị)
+    Args:
+        stream: Luồng văn bản cần đọc
+        chunk_size: Số ký tự đọc mỗi lần
+    Returns:
+        Iterator các cặp (khóa, giá_trị)
+    """
+    decoder = json.JSONDecoder()
+    decode = decoder.raw_decode
+    scan_once = decoder.scan_once
+    skip_whitespace = _JSON_WHITESPACE.match
+    buf = ''
+    pos = 0
+    eof = False
+    
+    def fill() -> bool:
+        # Đọc thêm một khối, bỏ phần đã xử lý khỏi bộ đệm
+        nonlocal buf, pos, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+    
+    def peek() -> str:
+        # Ký tự khác khoảng trắng tiếp theo ('' nếu hết file)
+        nonlocal pos
+        while True:
+            pos = _JSON_WHITESPACE.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ''
+    
+    def expect(chars: str) -> str:
+        nonlocal pos
+        char = peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f"Cần một trong các ký tự {chars!r}", buf, pos)
+        pos += 1
+        return char
+    
+    def value():
+        # Giải mã một giá trị; cần thêm dữ liệu nếu giá trị chạm cuối bộ đệm hoặc
+        # ký tự kế tiếp còn có thể thuộc về một số bị cắt giữa hai khối ("1." | "5")
+        nonlocal pos
+        while True:
+            peek()
+            try:
+                obj, end = decode(buf, pos)
+                if eof or (end < len(buf) and buf[end] not in _JSON_NUMBER_CHARS):
+                    pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+    
+    expect('{')
+    if peek() == '}':
+        return
+    while True:
+        key = value()
+        expect(':')
+        if peek() == '[':
+            pos += 1
+            if peek() == ']':
+                pos += 1
+            else:
+                while True:
+                    # Đường nhanh: phần tử nằm trọn trong bộ đệm và theo sau là ',' hoặc ']'
+                    pos = skip_whitespace(buf, pos).end()
+                    try:
+                        item, end = scan_once(buf, pos)
+                        after = skip_whitespace(buf, end).end()
+                        delimiter = buf[after] if after < len(buf) else ''
+                    except (StopIteration, json.JSONDecodeError):
+                        delimiter = ''
+                    if delimiter == ',' or delimiter == ']':
+                        pos = after + 1
+                        yield key, item
+                    else:
+                        yield key, value()
+                        delimiter = expect(',]')
+                    if delimiter == ']':
+                        break
+        else:
+            yield key, value()
+        if expect(',}') == '}':
+            return
+
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_JSON_NUMBER_CHARS = frozenset('0123456789.eE+-')
+
+
 def export_to_txt(graph: Graph, filepath: str):
     """
     Xuất đồ thị ra file TXT
@@ -123,7 +532,7 @@ def export_to_txt(graph: Graph, filepath: str):
         graph: Đồ thị cần xuất
         filepath: Đường dẫn file TXT
     """
-    with open(filepath, 'w', encoding='utf-8') as f:
+    with open_graph_file(filepath, 'w') as f:
         # Ghi loại đồ thị
         f.write(f"{graph.graph_type.value.upper()}\n")
         
@@ -132,7 +541,7 @@ def export_to_txt(graph: Graph, filepath: str):
         f.write(f"{len(vertices)}\n")
         
         # Ghi danh sách đỉnh
-        f.write(" ".join(map(str, sorted(vertices))) + "\n")
+        f.write(" ".join(map(str, sorted(vertices, key=vertex_sort_key))) + "\n")
         
         # Ghi các cạnh
         edges = graph.get_edges()
@@ -143,59 +552,432 @@ def export_to_txt(graph: Graph, filepath: str):
 
 def import_from_txt(filepath: str) -> Graph:
     """
-    Nhập đồ thị từ file TXT
+    Nhập đồ thị từ file TXT (đọc dần theo khối, xem read_txt)
     Args:
         filepath: Đường dẫn file TXT
     Returns:
         Đối tượng Graph
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        lines = [line.strip() for line in f.readlines() if line.strip() and not line.strip().startswith('#')]
+    with open_graph_file(filepath, 'r') as f:
+        return read_txt(f)
+
+
+def read_txt(stream: TextIO, chunk_size: int = FILE_READ_CHUNK_SIZE) -> Graph:
+    """
+    Phân tích đồ thị dạng TXT từ một luồng văn bản (file hoặc StringIO)
+    Đọc từng khối chunk_size ký tự nên bộ nhớ chỉ tỉ lệ với kích thước đồ thị
+    Chấp nhận:
+    - Dòng trống và dòng comment bắt đầu bằng '#' ở bất kỳ đâu
+    - Dòng đầu: DIRECTED / UNDIRECTED (thiếu thì mặc định vô hướng)
+    - Phần đỉnh theo dạng của export_to_txt (số đỉnh, danh sách đỉnh trên một dòng,
+      số cạnh) hoặc mỗi đỉnh một dòng
+    - Mỗi cạnh một dòng: u v [trọng_số] (trọng số viết dạng số nguyên được giữ kiểu int)
+    Args:
+        stream: Luồng văn bản cần đọc
+        chunk_size: Số ký tự đọc mỗi lần
+    Returns:
+        Đối tượng Graph
+    """
+    lines = _iter_txt_lines(stream, chunk_size)
+    graph, labels, pending = _read_txt_header(lines)
+    
+    # Đọc các cạnh (format: u v weight hoặc u v), thêm theo từng lô
+    sources = []
+    targets = []
+    weights = []
+    for line in chain(pending, lines):
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        u = labels.get(parts[0])
+        if u is None:
+            u = _parse_label(parts[0], labels)
+        v = labels.get(parts[1])
+        if v is None:
+            v = _parse_label(parts[1], labels)
+        sources.append(u)
+        targets.append(v)
+        weights.append(_parse_weight(parts[2]) if len(parts) > 2 else 1.0)
+        if len(sources) >= EDGE_BATCH_SIZE:
+            graph.add_edges_from(sources=sources, targets=targets, weights=weights)
+            sources, targets, weights = [], [], []
+    if sources:
+        graph.add_edges_from(sources=sources, targets=targets, weights=weights)
     
-    if not lines:
+    return graph
+
+
+def _read_txt_header(lines: Iterator[str]) -> Tuple[Graph, Dict[str, Any], List[str]]:
+    """
+    Đọc phần đầu file TXT (loại đồ thị và phần đỉnh) từ các dòng có nội dung
+    Returns:
+        Tuple (đồ thị chỉ có đỉnh, bộ nhớ nhãn {chuỗi: nhãn},
+        các dòng đã đọc trước thuộc phần cạnh - luôn là các dòng đọc sau cùng)
+    """
+    first = next(lines, None)
+    if first is None:
         raise ValueError("File rỗng hoặc chỉ chứa comment")
     
     # Đọc loại đồ thị
-    graph_type_str = lines[0].lower()
-    graph_type = GraphType.DIRECTED if graph_type_str == 'directed' else GraphType.UNDIRECTED
-    
-    # Tạo đồ thị mới
+    pending = []  # Các dòng đã đọc trước nhưng chưa xử lý
+    keyword = first.lower()
+    if keyword == 'directed':
+        graph_type = GraphType.DIRECTED
+    elif keyword == 'undirected':
+        graph_type = GraphType.UNDIRECTED
+    else:
+        graph_type = GraphType.UNDIRECTED
+        pending.append(first)
     graph = Graph(graph_type)
     
-    idx = 1
-    # Đọc đỉnh (có thể là số hoặc chữ)
-    vertices = []
-    while idx < len(lines) and not any(c in lines[idx] for c in [' ', '\t']):
-        vertex_str = lines[idx]
-        try:
-            vertex = int(vertex_str)
-        except ValueError:
-            vertex = vertex_str
-        vertices.append(vertex)
-        graph.add_vertex(vertex)
-        idx += 1
+    def take():
+        return pending.pop(0) if pending else next(lines, None)
     
-    # Đọc các cạnh (format: u v weight hoặc u v)
-    while idx < len(lines):
-        parts = lines[idx].split()
-        if len(parts) >= 2:
-            try:
-                u = int(parts[0])
-            except ValueError:
-                u = parts[0]
-            
-            try:
-                v = int(parts[1])
-            except ValueError:
-                v = parts[1]
-            
-            weight = float(parts[2]) if len(parts) > 2 else 1.0
-            graph.add_edge(u, v, weight)
-        idx += 1
+    labels: Dict[str, Any] = {}  # Bộ nhớ tạm: chuỗi -> nhãn đỉnh đã phân tích
+    
+    # Dạng của export_to_txt: "n", "v1 v2 ... vn", "m", rồi m dòng cạnh
+    # Chỉ nhận khi không thể nhầm với dạng cũ (mỗi đỉnh một dòng, vd: "1" "2" "3"):
+    # dòng đỉnh có đúng n phần tử, tiếp theo là một dòng số đếm m, rồi dòng cạnh
+    # (m > 0) hoặc hết file (m = 0)
+    line = take()
+    vertex_count = _parse_count(line)
+    if vertex_count is not None:
+        vertex_line = take()
+        edge_count_line = take()
+        edge_count = _parse_count(edge_count_line)
+        after = take()
+        if vertex_count == 0 and _parse_count(vertex_line) == 0 and edge_count_line is None:
+            # Đồ thị rỗng: dòng danh sách đỉnh trống đã bị bỏ qua, chỉ còn "0" "0"
+            line = None
+        elif (vertex_line is not None and len(vertex_line.split()) == vertex_count
+              and edge_count is not None
+              and (after is None if edge_count == 0
+                   else after is not None and len(after.split()) >= 2)):
+            for token in vertex_line.split():
+                graph.add_vertex(_parse_label(token, labels))
+            line = None
+        else:
+            pending.extend(l for l in (vertex_line, edge_count_line) if l is not None)
+        if after is not None:
+            pending.append(after)
+    if line is None:
+        line = take()
+    
+    # Dạng cũ: mỗi đỉnh một dòng, kết thúc ở dòng cạnh đầu tiên
+    while line is not None and len(line.split()) == 1:
+        graph.add_vertex(_parse_label(line, labels))
+        line = take()
+    if line is not None:
+        pending.insert(0, line)
+    return graph, labels, pending
+
+
+def import_from_txt_parallel(filepath: str, workers: Optional[int] = None,
+                             readonly: bool = False) -> Union[Graph, CSRGraph]:
+    """
+    Nhập file TXT lớn bằng nhiều tiến trình
+    Phần đầu file được đọc tuần tự; phần cạnh được chia thành các khối theo ranh giới
+    dòng và phân tích song song trong ProcessPoolExecutor. Mỗi tiến trình trả về bảng
+    chuỗi nhãn cục bộ cùng các mảng mã đỉnh/trọng số gọn, sau đó được ghép theo đúng
+    thứ tự file nên kết quả giống hệt import_from_txt
+    Args:
+        filepath: Đường dẫn file TXT
+        workers: Số tiến trình (None = số CPU)
+        readonly: True để dựng thẳng CSRGraph bằng NumPy (không qua Graph)
+    Returns:
+        Graph hoặc CSRGraph
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import numpy as np
+    workers = workers or os.cpu_count() or 1
     
+    with open(filepath, 'rb') as f:
+        # Đọc phần đầu, ghi lại vị trí byte của từng dòng có nội dung
+        line_starts = []
+        
+        def header_lines():
+            while True:
+                start = f.tell()
+                raw = f.readline()
+                if not raw:
+                    return
+                line = raw.decode('utf-8').strip()
+                if line and line[0] != '#':
+                    line_starts.append(start)
+                    yield line
+        
+        graph, labels, pending = _read_txt_header(header_lines())
+        edge_start = line_starts[-len(pending)] if pending else f.tell()
+        size = f.seek(0, os.SEEK_END)
+        
+        # Chia phần cạnh thành các khối, mỗi ranh giới dời tới đầu dòng kế tiếp
+        chunk_count = max(1, workers * PARALLEL_CHUNKS_PER_WORKER)
+        step = max(1, (size - edge_start) // chunk_count)
+        bounds = [edge_start]
+        for i in range(1, chunk_count):
+            f.seek(edge_start + i * step)
+            f.readline()
+            position = f.tell()
+            if bounds[-1] < position < size:
+                bounds.append(position)
+        bounds.append(size)
+    
+    # Nhãn đỉnh theo mã toàn cục: các đỉnh ở phần đầu trước, sau đó theo lần xuất hiện đầu
+    vertex_labels = graph.get_vertices()
+    vertex_index = {v: i for i, v in enumerate(vertex_labels)}
+    sources = []
+    targets = []
+    weights = []
+    integral = True
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(_parse_edge_chunk, [filepath] * (len(bounds) - 1),
+                              bounds[:-1], bounds[1:])
+        for tokens, chunk_sources, chunk_targets, chunk_weights, chunk_integral in chunks:
+            # Đổi mã cục bộ của khối sang mã toàn cục
+            local_to_global = array('q')
+            for token in tokens:
+                label = labels.get(token)
+                if label is None:
+                    label = _parse_label(token, labels)
+                index = vertex_index.get(label)
+                if index is None:
+                    index = vertex_index[label] = len(vertex_labels)
+                    vertex_labels.append(label)
+                local_to_global.append(index)
+            mapping = np.asarray(local_to_global, dtype=np.int64)
+            sources.append(mapping[np.asarray(chunk_sources, dtype=np.int64)])
+            targets.append(mapping[np.asarray(chunk_targets, dtype=np.int64)])
+            weights.append(np.asarray(chunk_weights, dtype=np.float64))
+            integral = integral and chunk_integral
+    
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+    weights = np.concatenate(weights)
+    if integral:
+        weights = weights.astype(np.int64)  # Giống đọc tuần tự: trọng số nguyên giữ kiểu int
+    if readonly:
+        return CSRGraph.from_edge_arrays(graph.graph_type, vertex_labels, sources, targets, weights)
+    for label in vertex_labels:
+        graph.add_vertex(label)
+    graph.add_edges_from(sources=map(vertex_labels.__getitem__, sources.tolist()),
+                         targets=map(vertex_labels.__getitem__, targets.tolist()), weights=weights)
     return graph
 
 
+def _parse_edge_chunk(filepath: str, start: int, end: int) -> Tuple[List[str], array, array, array]:
+    """
+    Phân tích một khối dòng cạnh [start, end) (chạy trong tiến trình con)
+    Returns:
+        Tuple (các chuỗi nhãn theo thứ tự xuất hiện đầu, mã nguồn, mã đích, trọng số,
+        mọi trọng số đều ghi dạng số nguyên) với mã là chỉ số trong danh sách chuỗi nhãn
+        của khối
+    """
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+    
+    index: Dict[str, int] = {}
+    tokens: List[str] = []
+    sources = array('q')
+    targets = array('q')
+    weights = array('d')
+    integral = True
+    for line in text.split('\n'):
+        parts = line.split()
+        if len(parts) < 2 or parts[0][0] == '#':
+            continue
+        u = index.get(parts[0])
+        if u is None:
+            u = index[parts[0]] = len(tokens)
+            tokens.append(parts[0])
+        v = index.get(parts[1])
+        if v is None:
+            v = index[parts[1]] = len(tokens)
+            tokens.append(parts[1])
+        sources.append(u)
+        targets.append(v)
+        if len(parts) > 2:
+            weight = _parse_weight(parts[2])
+            integral = integral and type(weight) is int
+            weights.append(weight)
+        else:
+            integral = False
+            weights.append(1.0)
+    return tokens, sources, targets, weights, integral
+
+
+def _iter_txt_lines(stream: TextIO, chunk_size: int) -> Iterator[str]:
+    """Đọc luồng theo từng khối, trả về lần lượt các dòng có nội dung (đã strip, bỏ comment)"""
+    tail = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (tail + chunk).split('\n')
+        tail = lines.pop()
+        for line in lines:
+            line = line.strip()
+            if line and line[0] != '#':
+                yield line
+    tail = tail.strip()
+    if tail and tail[0] != '#':
+        yield tail
+
+
+def _parse_label(token: str, labels: Dict[str, Any]):
+    """Nhãn đỉnh từ chuỗi (số nguyên nếu được, ngược lại giữ chuỗi), có ghi nhớ"""
+    try:
+        label = int(token)
+    except ValueError:
+        label = token
+    labels[token] = label
+    return label
+
+
+def _parse_weight(token: str) -> Union[int, float]:
+    """Trọng số từ chuỗi: số nguyên nếu viết dạng số nguyên (giống JSON), ngược lại float"""
+    digits = token[1:] if token[0] in '+-' else token
+    if digits.isascii() and digits.isdigit():
+        return int(token)
+    return float(token)
+
+
+def _parse_count(line: Optional[str]) -> Optional[int]:
+    """Giá trị của dòng chỉ chứa một số nguyên không âm, None nếu không phải"""
+    if line is None or not (line.isascii() and line.isdigit()):
+        return None
+    return int(line)
+
+
+# ===== Định dạng nhị phân =====
+# Bố cục file (little-endian, các mảng căn lề 8 byte):
+# - Header (BINARY_HEADER): magic, phiên bản, cờ, số đỉnh n, số phần tử kề nnz, số byte bảng nhãn
+# - Bảng nhãn: mảng int64 (nếu mọi nhãn là số nguyên) hoặc danh sách JSON UTF-8
+# - offsets: int64 x (n + 1)
+# - indices: int64 x nnz
+# - weights: int64 x nnz (nếu mọi trọng số là số nguyên) hoặc float64 x nnz
+BINARY_MAGIC = b'CTRRGRPH'
+BINARY_VERSION = 2
+BINARY_HEADER = struct.Struct('<8sIIqqq')
+_FLAG_DIRECTED = 1
+_FLAG_INT_LABELS = 2
+_FLAG_INT_WEIGHTS = 4  # Từ phiên bản 2; file phiên bản 1 luôn là float64
+
+
+def export_to_binary(graph: Union[Graph, CSRGraph], filepath: str):
+    """
+    Xuất đồ thị ra file nhị phân dạng CSR
+    Trọng số nguyên được ghi dạng int64 nên đọc lại vẫn là int (như JSON/TXT)
+    Args:
+        graph: Đồ thị cần xuất (Graph hoặc CSRGraph)
+        filepath: Đường dẫn file
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze()
+    labels = csr.labels
+    
+    flags = _FLAG_DIRECTED if csr.is_directed() else 0
+    if all(type(v) is int and -2**63 <= v < 2**63 for v in labels):
+        flags |= _FLAG_INT_LABELS
+        label_bytes = _little_endian(array('q', labels)).tobytes()
+    else:
+        label_bytes = json.dumps(list(labels), ensure_ascii=False).encode('utf-8')
+    weight_type = weight_typecode(csr.weights)
+    if weight_type == 'q':
+        flags |= _FLAG_INT_WEIGHTS
+    
+    with open_graph_file(filepath, 'wb') as f:
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags,
+                                   len(labels), len(csr.indices), len(label_bytes)))
+        f.write(label_bytes)
+        f.write(bytes(_padding(len(label_bytes))))
+        f.write(_little_endian(array('q', csr.offsets)))
+        f.write(_little_endian(array('q', csr.indices)))
+        f.write(_little_endian(array(weight_type, csr.weights)))
+
+
+def import_from_binary(filepath: str, readonly: bool = True) -> Union[CSRGraph, Graph]:
+    """
+    Nhập đồ thị từ file nhị phân
+    Với readonly=True, file được mmap và các mảng CSR là view trực tiếp lên vùng nhớ
+    ánh xạ (không đọc/sao chép dữ liệu cạnh), nên mở file lớn gần như tức thì;
+    file nén được giải nén một lần vào bộ nhớ
+    Args:
+        filepath: Đường dẫn file
+        readonly: True để nhận CSRGraph chỉ-đọc, False để dựng Graph có thể sửa
+    Returns:
+        CSRGraph hoặc Graph
+    """
+    if detect_compression(filepath) is not None:
+        with open_graph_file(filepath, 'rb') as f:
+            buffer = f.read()
+    else:
+        with open(filepath, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buffer)
+    
+    if len(view) < BINARY_HEADER.size:
+        raise ValueError("File nhị phân không hợp lệ: thiếu header")
+    magic, version, flags, n, nnz, label_size = BINARY_HEADER.unpack_from(view)
+    if magic != BINARY_MAGIC:
+        raise ValueError("File nhị phân không hợp lệ: sai magic")
+    if version not in (1, BINARY_VERSION):
+        raise ValueError(f"Phiên bản file nhị phân không hỗ trợ: {version}")
+    
+    pos = BINARY_HEADER.size
+    label_view = view[pos:pos + label_size]
+    pos += label_size + _padding(label_size)
+    offsets = view[pos:pos + 8 * (n + 1)]
+    pos += 8 * (n + 1)
+    indices = view[pos:pos + 8 * nnz]
+    pos += 8 * nnz
+    weights = view[pos:pos + 8 * nnz]
+    if len(weights) != 8 * nnz:
+        raise ValueError("File nhị phân không hợp lệ: dữ liệu bị cắt cụt")
+    
+    if flags & _FLAG_INT_LABELS:
+        labels = _typed_view(label_view, 'q')
+    else:
+        labels = json.loads(bytes(label_view).decode('utf-8'))
+    graph_type = GraphType.DIRECTED if flags & _FLAG_DIRECTED else GraphType.UNDIRECTED
+    
+    csr = CSRGraph(graph_type, labels, _typed_view(offsets, 'q'),
+                   _typed_view(indices, 'q'),
+                   _typed_view(weights, 'q' if flags & _FLAG_INT_WEIGHTS else 'd'))
+    return csr if readonly else csr.to_graph()
+
+
+def is_binary_graph_file(filepath: str) -> bool:
+    """Kiểm tra file có bắt đầu bằng magic của định dạng nhị phân không"""
+    try:
+        with open_graph_file(filepath, 'rb') as f:
+            return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    except (OSError, EOFError, lzma.LZMAError):
+        return False
+
+
+def _padding(size: int) -> int:
+    """Số byte cần đệm để size chia hết cho 8"""
+    return -size % 8
+
+
+def _little_endian(values: array) -> array:
+    """Mảng ở thứ tự byte little-endian (đảo byte trên máy big-endian)"""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _typed_view(raw: memoryview, typecode: str):
+    """View kiểu int64/float64 lên vùng byte (sao chép và đảo byte nếu máy big-endian)"""
+    if sys.byteorder == 'little':
+        return raw.cast(typecode)
+    values = array(typecode, bytes(raw))
+    values.byteswap()
+    return values
+
+
 def graph_to_dict(graph: Graph) -> Dict[str, Any]:
     """
     Chuyển đổi đồ thị thành dictionary
@@ -230,11 +1012,9 @@ def dict_to_graph(data: Dict[str, Any]) -> Graph:
     for vertex in data['vertices']:
         graph.add_vertex(vertex)
     
-    for edge in data['edges']:
-        graph.add_edge(
-            edge['source'],
-            edge['target'],
-            edge.get('weight', 1.0)
-        )
+    graph.add_edges_from(
+        (edge['source'], edge['target'], edge.get('weight', 1.0))
+        for edge in data['edges']
+    )
     
     return graph
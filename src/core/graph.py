@@ -1,7 +1,16 @@
 """Cấu trúc đồ thị cơ bản - sử dụng danh sách kề"""
-from typing import List, Dict, Tuple, Optional, Set
+import weakref
+from typing import List, Dict, Tuple, Optional, Set, Iterable, Iterator, Callable, TYPE_CHECKING
 from enum import Enum
 
+if TYPE_CHECKING:
+    from src.core.csr import CSRGraph
+
+def vertex_sort_key(vertex) -> Tuple[bool, object]:
+    """Khóa sắp xếp đỉnh có nhãn hỗn hợp: số trước, chữ sau"""
+    return (isinstance(vertex, str), vertex)
+
+
 class GraphType(Enum):
     """Loại đồ thị"""
     DIRECTED = "directed"
@@ -10,10 +19,82 @@ class GraphType(Enum):
 class Graph:
     """Lớp đồ thị - danh sách kề (adjacency list)"""
     
-    def __init__(self, graph_type: GraphType = GraphType.UNDIRECTED):
-        """Khởi tạo (graph_type: có hướng/vô hướng)"""
+    def __init__(self, graph_type: GraphType = GraphType.UNDIRECTED, track_predecessors: bool = True):
+        """
+        Khởi tạo (graph_type: có hướng/vô hướng)
+        track_predecessors: với đồ thị có hướng, duy trì thêm danh sách kề ngược
+        (đỉnh vào) để xóa đỉnh, tính bậc vào và duyệt ngược nhanh
+        """
         self.graph_type = graph_type
         self._adjacency_list: Dict[int, Dict[int, float]] = {}  # {đỉnh: {đỉnh_kề: trọng_số}}
+        # Danh sách kề ngược {đỉnh: {đỉnh_vào: trọng_số}} - chỉ dùng cho đồ thị có hướng
+        self._predecessors: Optional[Dict[int, Dict[int, float]]] = (
+            {} if track_predecessors and graph_type == GraphType.DIRECTED else None
+        )
+        # Bảng mã đỉnh: nhãn <-> số nguyên liên tục 0..n-1 (cập nhật dần khi thêm/xóa đỉnh)
+        self._vertex_ids: Dict[int, int] = {}   # {nhãn: mã}
+        self._id_to_vertex: List[int] = []      # [mã] -> nhãn
+        # Bộ đếm cập nhật dần sau mỗi thay đổi
+        self._version = 0          # Tăng mỗi khi đồ thị bị sửa đổi
+        self._edge_count = 0       # Số cạnh
+        self._total_weight = 0.0   # Tổng trọng số các cạnh
+        # Copy-on-write: None = mọi dict kề thuộc riêng đồ thị này;
+        # ngược lại là tập đỉnh đã có dict riêng, các đỉnh khác còn dùng chung với bản sao
+        self._owned: Optional[Set[int]] = None
+        # Các hàm lắng nghe thay đổi (xem subscribe): danh sách (tham_chiếu, batch)
+        self._listeners: List[Tuple[Callable, bool]] = []
+        # Kết quả convert_representation theo loại (giữ trên đồ thị để được thu hồi cùng nó)
+        self._representations: Dict[str, object] = {}
+    
+    @property
+    def version(self) -> int:
+        """Phiên bản của đồ thị - tăng dần sau mỗi thay đổi, dùng làm khóa cho bộ nhớ đệm"""
+        return self._version
+    
+    def subscribe(self, callback: Callable, batch: bool = False):
+        """
+        Đăng ký nhận thông báo mỗi khi đồ thị thay đổi
+        callback(sự_kiện, *tham_số) được gọi sau khi thay đổi đã hoàn tất:
+        - ('add_vertex', v)
+        - ('remove_vertex', v)
+        - ('add_edge', u, v, trọng_số, trọng_số_cũ)  trọng_số_cũ = None nếu là cạnh mới
+        - ('remove_edge', u, v, trọng_số)
+        - ('add_edges', số_cạnh, [(u, v, trọng_số), ...])  chỉ gửi cho hàm đăng ký với
+          batch=True; danh sách cạnh theo thứ tự thêm (đỉnh mới được thêm như add_edge)
+        - ('clear',)
+        Phương thức của đối tượng chỉ được giữ tham chiếu yếu: đối tượng bị thu hồi
+        thì tự động hủy đăng ký
+        Args:
+            callback: Hàm nhận thông báo
+            batch: True nếu hàm chấp nhận một sự kiện 'add_edges' duy nhất (thay cho từng
+                sự kiện cạnh, đỉnh mới) sau add_edges_from, để đồ thị giữ được đường thêm hàng loạt
+        """
+        if hasattr(callback, '__self__'):
+            self._listeners.append((weakref.WeakMethod(callback), batch))
+        else:
+            self._listeners.append((lambda: callback, batch))
+    
+    def unsubscribe(self, callback: Callable):
+        """
+        Hủy đăng ký hàm nhận thông báo
+        Args:
+            callback: Hàm đã đăng ký bằng subscribe
+        """
+        self._listeners = [(ref, batch) for ref, batch in self._listeners
+                           if ref() not in (None, callback)]
+    
+    def _notify(self, event: str, *args):
+        """Gửi sự kiện tới các hàm lắng nghe, bỏ các tham chiếu đã bị thu hồi"""
+        dead = False
+        for ref, _ in tuple(self._listeners):
+            callback = ref()
+            if callback is None:
+                dead = True
+            else:
+                callback(event, *args)
+        if dead:
+            self._listeners = [(ref, batch) for ref, batch in self._listeners
+                               if ref() is not None]
         
     def add_vertex(self, vertex: int):
         """
@@ -23,6 +104,15 @@ class Graph:
         """
         if vertex not in self._adjacency_list:
             self._adjacency_list[vertex] = {}
+            if self._predecessors is not None:
+                self._predecessors[vertex] = {}
+            if self._owned is not None:
+                self._owned.add(vertex)
+            self._vertex_ids[vertex] = len(self._id_to_vertex)
+            self._id_to_vertex.append(vertex)
+            self._version += 1
+            if self._listeners:
+                self._notify('add_vertex', vertex)
         
     def add_edge(self, u: int, v: int, weight: float = 1.0):
         """
@@ -36,12 +126,140 @@ class Graph:
         self.add_vertex(u)
         self.add_vertex(v)
         
+        # Cập nhật bộ đếm: cạnh mới hoặc chỉ đổi trọng số
+        old_weight = self._adjacency_list[u].get(v)
+        if old_weight is None:
+            self._edge_count += 1
+            self._total_weight += weight
+        else:
+            self._total_weight += weight - old_weight
+        self._version += 1
+        
+        if self._owned is not None:
+            self._own(u)
+            self._own(v)
+        
         # Thêm cạnh từ u đến v
         self._adjacency_list[u][v] = weight
         
         # Nếu là đồ thị vô hướng, thêm cạnh ngược lại từ v đến u
         if self.graph_type == GraphType.UNDIRECTED:
             self._adjacency_list[v][u] = weight
+        elif self._predecessors is not None:
+            self._predecessors[v][u] = weight
+        
+        if self._listeners:
+            self._notify('add_edge', u, v, weight, old_weight)
+        
+    def add_edges_from(self, edges: Optional[Iterable] = None, *,
+                       sources: Optional[Iterable] = None, targets: Optional[Iterable] = None,
+                       weights: Optional[Iterable] = None, default_weight: float = 1.0) -> int:
+        """
+        Thêm nhiều cạnh trong một lượt (nhanh hơn gọi add_edge lặp lại)
+        Có thể truyền một trong hai dạng:
+        - edges: iterable các tuple (u, v) hoặc (u, v, trọng_số)
+        - sources, targets, weights: các mảng song song (list hoặc mảng NumPy)
+        Args:
+            edges: Danh sách cạnh
+            sources: Mảng đỉnh xuất phát
+            targets: Mảng đỉnh đích
+            weights: Mảng trọng số (None = dùng default_weight)
+            default_weight: Trọng số cho cạnh không ghi trọng số
+        Returns:
+            Số cạnh đã xử lý
+        """
+        if edges is None:
+            if sources is None or targets is None:
+                raise ValueError("Cần truyền edges hoặc cả sources và targets")
+            # Mảng NumPy -> list số Python (nhanh, tránh lưu kiểu numpy trong đồ thị)
+            sources = sources.tolist() if hasattr(sources, 'tolist') else sources
+            targets = targets.tolist() if hasattr(targets, 'tolist') else targets
+            if weights is None:
+                edges = zip(sources, targets)
+            else:
+                weights = weights.tolist() if hasattr(weights, 'tolist') else weights
+                edges = zip(sources, targets, weights)
+        
+        if any(not batch for _, batch in self._listeners):
+            # Có đối tượng cần từng thay đổi: đi qua add_edge để phát sự kiện cho từng cạnh
+            processed = 0
+            for edge in edges:
+                if len(edge) == 3:
+                    self.add_edge(*edge)
+                else:
+                    self.add_edge(edge[0], edge[1], default_weight)
+                processed += 1
+            return processed
+        
+        adjacency = self._adjacency_list
+        predecessors = self._predecessors
+        ids = self._vertex_ids
+        labels = self._id_to_vertex
+        owned = self._owned
+        undirected = self.graph_type == GraphType.UNDIRECTED
+        added = 0
+        total_weight = 0.0
+        processed = 0
+        # Các cạnh đã thêm, gửi kèm sự kiện 'add_edges' (chỉ ghi lại khi có hàm đăng ký)
+        recorded = [] if self._listeners else None
+        
+        for edge in edges:
+            if len(edge) == 3:
+                u, v, weight = edge
+            else:
+                u, v = edge
+                weight = default_weight
+            
+            # Thêm đỉnh trực tiếp (không qua add_vertex)
+            u_neighbors = adjacency.get(u)
+            if u_neighbors is None:
+                u_neighbors = adjacency[u] = {}
+                if predecessors is not None:
+                    predecessors[u] = {}
+                if owned is not None:
+                    owned.add(u)
+                ids[u] = len(labels)
+                labels.append(u)
+            v_neighbors = adjacency.get(v)
+            if v_neighbors is None:
+                v_neighbors = adjacency[v] = {}
+                if predecessors is not None:
+                    predecessors[v] = {}
+                if owned is not None:
+                    owned.add(v)
+                ids[v] = len(labels)
+                labels.append(v)
+            
+            # Dict còn dùng chung với bản sao thì tách riêng trước khi ghi
+            if owned is not None and (u not in owned or v not in owned):
+                self._own(u)
+                self._own(v)
+                u_neighbors = adjacency[u]
+                v_neighbors = adjacency[v]
+            
+            old_weight = u_neighbors.get(v)
+            if old_weight is None:
+                added += 1
+                total_weight += weight
+            else:
+                total_weight += weight - old_weight
+            
+            u_neighbors[v] = weight
+            if undirected:
+                v_neighbors[u] = weight
+            elif predecessors is not None:
+                predecessors[v][u] = weight
+            if recorded is not None:
+                recorded.append((u, v, weight))
+            processed += 1
+        
+        self._edge_count += added
+        self._total_weight += total_weight
+        if processed:
+            self._version += 1
+            if self._listeners:
+                self._notify('add_edges', processed, recorded)
+        return processed
         
     def remove_vertex(self, vertex: int):
         """
@@ -52,13 +270,49 @@ class Graph:
         if vertex not in self._adjacency_list:
             return
         
-        # Xóa đỉnh khỏi danh sách kề
-        del self._adjacency_list[vertex]
+        # Xóa tất cả các cạnh đến đỉnh này - chỉ duyệt các đỉnh kề, O(bậc)
+        out_neighbors = self._adjacency_list.pop(vertex)
+        removed_count = len(out_neighbors)
+        removed_weight = sum(out_neighbors.values())
+        if self._owned is not None:
+            self._owned.discard(vertex)
+        if self.graph_type == GraphType.UNDIRECTED:
+            for neighbor in out_neighbors:
+                if neighbor != vertex:
+                    self._own(neighbor)
+                    del self._adjacency_list[neighbor][vertex]
+        elif self._predecessors is not None:
+            for source, weight in self._predecessors.pop(vertex).items():
+                if source != vertex:
+                    self._own(source)
+                    del self._adjacency_list[source][vertex]
+                    removed_count += 1
+                    removed_weight += weight
+            for target in out_neighbors:
+                if target != vertex:
+                    self._own(target)
+                    del self._predecessors[target][vertex]
+        else:
+            # Không có chỉ mục ngược: phải quét toàn bộ đồ thị
+            for source, neighbors in self._adjacency_list.items():
+                if vertex in neighbors:
+                    self._own(source)
+                    removed_count += 1
+                    removed_weight += self._adjacency_list[source].pop(vertex)
+        
+        self._edge_count -= removed_count
+        self._total_weight -= removed_weight
+        self._version += 1
+        
+        # Giữ mã liên tục: chuyển đỉnh có mã lớn nhất vào chỗ trống
+        index = self._vertex_ids.pop(vertex)
+        last = self._id_to_vertex.pop()
+        if index < len(self._id_to_vertex):
+            self._id_to_vertex[index] = last
+            self._vertex_ids[last] = index
         
-        # Xóa tất cả các cạnh đến đỉnh này
-        for neighbors in self._adjacency_list.values():
-            if vertex in neighbors:
-                del neighbors[vertex]
+        if self._listeners:
+            self._notify('remove_vertex', vertex)
         
     def remove_edge(self, u: int, v: int):
         """
@@ -68,13 +322,26 @@ class Graph:
             v: Đỉnh đích
         """
         if u in self._adjacency_list and v in self._adjacency_list[u]:
-            del self._adjacency_list[u][v]
+            if self._owned is not None:
+                self._own(u)
+                self._own(v)
+            self._edge_count -= 1
+            weight = self._adjacency_list[u].pop(v)
+            self._total_weight -= weight
+            self._version += 1
+            if self._predecessors is not None:
+                del self._predecessors[v][u]
+        else:
+            weight = None
         
         # Nếu là đồ thị vô hướng, xóa cạnh ngược lại
         if self.graph_type == GraphType.UNDIRECTED:
             if v in self._adjacency_list and u in self._adjacency_list[v]:
                 del self._adjacency_list[v][u]
         
+        if weight is not None and self._listeners:
+            self._notify('remove_edge', u, v, weight)
+        
     def get_vertices(self) -> List[int]:
         """
         Lấy danh sách tất cả các đỉnh
@@ -89,21 +356,27 @@ class Graph:
         Returns:
             Danh sách các cạnh dạng (đỉnh_u, đỉnh_v, trọng_số)
         """
-        edges = []
-        visited = set()  # Tránh trùng lặp cạnh trong đồ thị vô hướng
-        
-        for u, neighbors in self._adjacency_list.items():
-            for v, weight in neighbors.items():
-                # Đối với đồ thị vô hướng, chỉ lưu một chiều của cạnh
-                if self.graph_type == GraphType.UNDIRECTED:
-                    edge = tuple(sorted([u, v]))
-                    if edge not in visited:
-                        edges.append((u, v, weight))
-                        visited.add(edge)
-                else:
-                    edges.append((u, v, weight))
-        
-        return edges
+        return list(self.iter_edges())
+    
+    def iter_edges(self) -> Iterator[Tuple[int, int, float]]:
+        """
+        Duyệt lần lượt các cạnh mà không dựng danh sách trung gian
+        Đồ thị vô hướng: mỗi cạnh chỉ xuất hiện một lần (chiều có mã đỉnh u <= mã đỉnh v)
+        Không được sửa đồ thị trong lúc đang duyệt
+        Returns:
+            Iterator các cạnh dạng (đỉnh_u, đỉnh_v, trọng_số)
+        """
+        if self.graph_type == GraphType.UNDIRECTED:
+            ids = self._vertex_ids
+            for u, neighbors in self._adjacency_list.items():
+                u_id = ids[u]
+                for v, weight in neighbors.items():
+                    if ids[v] >= u_id:
+                        yield u, v, weight
+        else:
+            for u, neighbors in self._adjacency_list.items():
+                for v, weight in neighbors.items():
+                    yield u, v, weight
         
     def has_edge(self, u: int, v: int) -> bool:
         """
@@ -128,6 +401,45 @@ class Graph:
             return []
         return list(self._adjacency_list[vertex].keys())
     
+    def iter_neighbors(self, vertex: int) -> Iterable[int]:
+        """
+        Duyệt các đỉnh kề mà không sao chép (không được sửa đồ thị trong lúc duyệt)
+        Args:
+            vertex: Đỉnh cần lấy danh sách kề
+        Returns:
+            Iterable các đỉnh kề
+        """
+        neighbors = self._adjacency_list.get(vertex)
+        return neighbors.keys() if neighbors is not None else ()
+    
+    def neighbor_items(self, vertex: int) -> Iterable[Tuple[int, float]]:
+        """
+        Duyệt các cặp (đỉnh_kề, trọng_số) - thay cho get_neighbors + get_weight
+        Không được sửa đồ thị trong lúc duyệt
+        Args:
+            vertex: Đỉnh cần lấy danh sách kề
+        Returns:
+            Iterable các cặp (đỉnh_kề, trọng_số)
+        """
+        neighbors = self._adjacency_list.get(vertex)
+        return neighbors.items() if neighbors is not None else ()
+    
+    def get_predecessors(self, vertex: int) -> List[int]:
+        """
+        Lấy danh sách các đỉnh có cạnh đi vào vertex
+        Args:
+            vertex: Đỉnh cần lấy danh sách đỉnh vào
+        Returns:
+            Danh sách các đỉnh vào (vô hướng: trùng với danh sách kề)
+        """
+        if vertex not in self._adjacency_list:
+            return []
+        if self.graph_type == GraphType.UNDIRECTED:
+            return list(self._adjacency_list[vertex].keys())
+        if self._predecessors is not None:
+            return list(self._predecessors[vertex].keys())
+        return [u for u, neighbors in self._adjacency_list.items() if vertex in neighbors]
+    
     def get_weight(self, u: int, v: int) -> Optional[float]:
         """
         Lấy trọng số của cạnh
@@ -163,11 +475,15 @@ class Graph:
         Returns:
             Số lượng cạnh
         """
-        count = sum(len(neighbors) for neighbors in self._adjacency_list.values())
-        # Đồ thị vô hướng đếm mỗi cạnh 2 lần, nên chia 2
-        if self.graph_type == GraphType.UNDIRECTED:
-            count //= 2
-        return count
+        return self._edge_count
+    
+    def total_weight(self) -> float:
+        """
+        Tổng trọng số các cạnh (cập nhật dần, O(1))
+        Returns:
+            Tổng trọng số
+        """
+        return self._total_weight
     
     def is_directed(self) -> bool:
         """
@@ -189,7 +505,244 @@ class Graph:
             return 0
         return len(self._adjacency_list[vertex])
     
+    def out_degree(self, vertex: int) -> int:
+        """
+        Lấy bậc ra của đỉnh (số cạnh đi ra)
+        Args:
+            vertex: Đỉnh cần tính bậc
+        Returns:
+            Bậc ra của đỉnh
+        """
+        return self.get_degree(vertex)
+    
+    def in_degree(self, vertex: int) -> int:
+        """
+        Lấy bậc vào của đỉnh (số cạnh đi vào), O(1) khi có chỉ mục ngược
+        Args:
+            vertex: Đỉnh cần tính bậc
+        Returns:
+            Bậc vào của đỉnh
+        """
+        if vertex not in self._adjacency_list:
+            return 0
+        if self.graph_type == GraphType.UNDIRECTED:
+            return len(self._adjacency_list[vertex])
+        if self._predecessors is not None:
+            return len(self._predecessors[vertex])
+        return sum(1 for neighbors in self._adjacency_list.values() if vertex in neighbors)
+    
     def clear(self):
         """Xóa toàn bộ đồ thị"""
         self._adjacency_list.clear()
+        if self._predecessors is not None:
+            self._predecessors.clear()
+        self._vertex_ids.clear()
+        self._id_to_vertex.clear()
+        self._edge_count = 0
+        self._total_weight = 0.0
+        self._owned = None
+        self._version += 1
+        if self._listeners:
+            self._notify('clear')
+    
+    def vertex_id(self, vertex: int) -> int:
+        """
+        Lấy mã số nguyên (0..n-1) của đỉnh
+        Args:
+            vertex: Nhãn đỉnh
+        Returns:
+            Mã của đỉnh (KeyError nếu đỉnh không tồn tại)
+        """
+        return self._vertex_ids[vertex]
+    
+    def vertex_label(self, index: int) -> int:
+        """
+        Lấy nhãn đỉnh từ mã số
+        Args:
+            index: Mã đỉnh (0..n-1)
+        Returns:
+            Nhãn của đỉnh
+        """
+        return self._id_to_vertex[index]
+    
+    def vertex_ids(self) -> Dict[int, int]:
+        """
+        Bảng ánh xạ {nhãn: mã} - dùng trực tiếp trong vòng lặp thuật toán, không sửa đổi
+        Mã chỉ ổn định khi đồ thị không bị xóa đỉnh
+        """
+        return self._vertex_ids
+    
+    def vertex_labels(self) -> List[int]:
+        """Danh sách nhãn theo mã: vertex_labels()[i] là nhãn của đỉnh mã i (không sửa đổi)"""
+        return self._id_to_vertex
+    
+    def copy(self) -> 'Graph':
+        """
+        Tạo bản sao copy-on-write của đồ thị
+        Hai đồ thị dùng chung các dict kề; một dict chỉ được sao chép khi đỉnh
+        tương ứng bị sửa lần đầu, nên chi phí tỉ lệ với số đỉnh bị chạm tới
+        (cộng một lần sao chép nông bảng đỉnh), không phải O(V + E)
+        Returns:
+            Đồ thị mới độc lập với đồ thị gốc
+        """
+        clone = Graph(self.graph_type, track_predecessors=self._predecessors is not None)
+        clone._adjacency_list = dict(self._adjacency_list)
+        if self._predecessors is not None:
+            clone._predecessors = dict(self._predecessors)
+        clone._vertex_ids = dict(self._vertex_ids)
+        clone._id_to_vertex = list(self._id_to_vertex)
+        clone._edge_count = self._edge_count
+        clone._total_weight = self._total_weight
+        # Từ giờ cả hai phía đều phải tách dict trước khi ghi
+        clone._owned = set()
+        self._owned = set()
+        return clone
+    
+    def _own(self, vertex: int):
+        """Tách riêng dict kề (và dict kề ngược) của vertex nếu còn dùng chung với bản sao"""
+        owned = self._owned
+        if owned is None or vertex in owned:
+            return
+        self._adjacency_list[vertex] = dict(self._adjacency_list[vertex])
+        if self._predecessors is not None:
+            self._predecessors[vertex] = dict(self._predecessors[vertex])
+        owned.add(vertex)
+    
+    def reverse_view(self) -> 'ReversedGraphView':
+        """
+        Lấy góc nhìn đảo chiều (chỉ đọc) của đồ thị mà không sao chép cạnh
+        Đồ thị vô hướng cũng nhận góc nhìn chỉ-đọc (cạnh giữ nguyên) để không lộ đồ thị gốc
+        Returns:
+            Đối tượng có giao diện đọc giống Graph với mọi cạnh bị đảo hướng
+        """
+        return ReversedGraphView(self)
+    
+    def freeze(self) -> 'CSRGraph':
+        """
+        Tạo ảnh chụp chỉ-đọc dạng CSR (mảng liên tục) của đồ thị
+        Dùng khi chạy thuật toán trên đồ thị lớn không cần sửa đổi
+        Đỉnh được đánh số theo thứ tự get_vertices() (không theo mã nội bộ, vốn bị
+        hoán vị khi xóa đỉnh) để thuật toán duyệt ảnh chụp giống hệt đồ thị gốc
+        Returns:
+            Đối tượng CSRGraph
+        """
+        from src.core.csr import CSRGraph
+        return CSRGraph.from_adjacency(self.graph_type, self._adjacency_list)
+
+
 
+class ReversedGraphView:
+    """
+    Góc nhìn chỉ-đọc của đồ thị với các cạnh bị đảo chiều (vô hướng: giống đồ thị gốc)
+    Dùng danh sách kề ngược của đồ thị gốc nên không tốn bộ nhớ sao chép
+    """
+    
+    def __init__(self, graph: Graph):
+        """
+        Khởi tạo góc nhìn đảo chiều
+        Args:
+            graph: Đồ thị gốc
+        """
+        self.graph = graph
+        self.graph_type = graph.graph_type
+    
+    @property
+    def version(self) -> int:
+        """Phiên bản của đồ thị gốc"""
+        return self.graph.version
+    
+    def get_vertices(self) -> List[int]:
+        """Danh sách đỉnh (giống đồ thị gốc)"""
+        return self.graph.get_vertices()
+    
+    def get_edges(self) -> List[Tuple[int, int, float]]:
+        """Danh sách cạnh đã đảo chiều (v, u, trọng_số)"""
+        return list(self.iter_edges())
+    
+    def iter_edges(self) -> Iterator[Tuple[int, int, float]]:
+        """Duyệt các cạnh đã đảo chiều"""
+        for u, v, weight in self.graph.iter_edges():
+            yield v, u, weight
+    
+    def has_edge(self, u: int, v: int) -> bool:
+        """Cạnh (u, v) tồn tại khi đồ thị gốc có cạnh (v, u)"""
+        return self.graph.has_edge(v, u)
+    
+    def get_neighbors(self, vertex: int) -> List[int]:
+        """Đỉnh kề = đỉnh vào trong đồ thị gốc"""
+        return self.graph.get_predecessors(vertex)
+    
+    def get_predecessors(self, vertex: int) -> List[int]:
+        """Đỉnh vào = đỉnh kề trong đồ thị gốc"""
+        return self.graph.get_neighbors(vertex)
+    
+    def iter_neighbors(self, vertex: int) -> Iterable[int]:
+        """Duyệt đỉnh kề (đỉnh vào của đồ thị gốc)"""
+        return self.get_neighbors(vertex)
+    
+    def neighbor_items(self, vertex: int) -> Iterable[Tuple[int, float]]:
+        """Duyệt các cặp (đỉnh_kề, trọng_số) trong góc nhìn đảo chiều"""
+        graph = self.graph
+        if not graph.is_directed():
+            return graph.neighbor_items(vertex)
+        if graph._predecessors is not None:
+            predecessors = graph._predecessors.get(vertex)
+            return predecessors.items() if predecessors is not None else ()
+        return [(u, graph.get_weight(u, vertex)) for u in graph.get_predecessors(vertex)]
+    
+    def get_weight(self, u: int, v: int) -> Optional[float]:
+        """Trọng số cạnh (u, v) = trọng số cạnh (v, u) của đồ thị gốc"""
+        return self.graph.get_weight(v, u)
+    
+    def get_adjacency_list(self) -> Dict[int, Dict[int, float]]:
+        """Danh sách kề của đồ thị đảo chiều"""
+        if not self.graph.is_directed():
+            return {v: dict(neighbors) for v, neighbors in self.graph._adjacency_list.items()}
+        adjacency = {v: {} for v in self.graph.get_vertices()}
+        for u, v, weight in self.graph.get_edges():
+            adjacency[v][u] = weight
+        return adjacency
+    
+    def vertex_count(self) -> int:
+        """Số lượng đỉnh"""
+        return self.graph.vertex_count()
+    
+    def edge_count(self) -> int:
+        """Số lượng cạnh"""
+        return self.graph.edge_count()
+    
+    def total_weight(self) -> float:
+        """Tổng trọng số các cạnh"""
+        return self.graph.total_weight()
+    
+    def is_directed(self) -> bool:
+        """Giống đồ thị gốc"""
+        return self.graph.is_directed()
+    
+    def get_degree(self, vertex: int) -> int:
+        """Bậc ra trong góc nhìn đảo = bậc vào của đồ thị gốc"""
+        return self.graph.in_degree(vertex)
+    
+    def out_degree(self, vertex: int) -> int:
+        """Bậc ra của đỉnh"""
+        return self.graph.in_degree(vertex)
+    
+    def in_degree(self, vertex: int) -> int:
+        """Bậc vào của đỉnh"""
+        return self.graph.out_degree(vertex)
+    
+    def vertex_id(self, vertex: int) -> int:
+        """Mã đỉnh (giống đồ thị gốc)"""
+        return self.graph.vertex_id(vertex)
+    
+    def vertex_label(self, index: int) -> int:
+        """Nhãn đỉnh theo mã (giống đồ thị gốc)"""
+        return self.graph.vertex_label(index)
+    
+    def vertex_ids(self) -> Dict[int, int]:
+        """Bảng {nhãn: mã} của đồ thị gốc"""
+        return self.graph.vertex_ids()
+    
+    def vertex_labels(self) -> List[int]:
+        """Danh sách nhãn theo mã của đồ thị gốc"""
+        return self.graph.vertex_labels()
@@ -0,0 +1,268 @@
+"""
+Nhật ký thay đổi (journal) cho việc lưu đồ thị tăng dần
+File đồ thị là ảnh chụp (snapshot) đầy đủ; mỗi thay đổi sau đó được ghi nối vào
+file <đồ thị>.journal dưới dạng bản ghi nhị phân gọn, nên tự động lưu sau mỗi
+thao tác chỉ tốn I/O tỉ lệ với thay đổi. Khi nhật ký đủ lớn, nó được gộp vào
+một ảnh chụp mới. load_graph tự phát lại nhật ký sau khi đọc ảnh chụp
+"""
+import json
+import os
+import struct
+import zlib
+from typing import Any, List, Optional, Tuple
+from src.core.graph import Graph
+from src.core.file_io import save_graph, _file_digest, _format_from_name
+from src.utils.config import JOURNAL_SUFFIX, JOURNAL_COMPACT_MIN_BYTES, JOURNAL_COMPACT_RATIO
+
+# Bố cục file nhật ký (little-endian):
+# - Header (JOURNAL_HEADER): magic, phiên bản, kích thước và mã băm BLAKE2b của ảnh chụp
+#   mà nhật ký nối tiếp (ảnh chụp bị ghi đè ở nơi khác thì nhật ký hết hiệu lực)
+# - Các bản ghi: độ dài nội dung (uint32), CRC32 nội dung, nội dung = mã thao tác + tham số
+#   Nhãn đỉnh: 0 + int64, hoặc 1 + độ dài (uint32) + JSON UTF-8; trọng số: float64
+#   Bản ghi cuối bị ghi dở (mất điện, tiến trình bị dừng) được bỏ qua khi đọc
+JOURNAL_MAGIC = b'CTRRJRNL'
+JOURNAL_VERSION = 1
+JOURNAL_HEADER = struct.Struct('<8sIq20s')
+_RECORD_HEADER = struct.Struct('<II')
+_INT_LABEL = struct.Struct('<Bq')
+_TEXT_LABEL = struct.Struct('<BI')
+_WEIGHT = struct.Struct('<d')
+
+# Mã thao tác
+_ADD_VERTEX = 1
+_REMOVE_VERTEX = 2
+_ADD_EDGE = 3
+_REMOVE_EDGE = 4
+_CLEAR = 5
+
+
+class GraphJournal:
+    """
+    Ghi nhật ký các thay đổi của một đồ thị vào file <filepath>.journal
+    Đối tượng đăng ký nhận sự kiện của đồ thị (Graph.subscribe); cần giữ tham chiếu
+    tới nó trong suốt thời gian ghi nhật ký. Ví dụ:
+        journal = GraphJournal(graph, 'data/graphs/g.json')
+        graph.add_edge(1, 2, 3.0)   # chỉ nối thêm một bản ghi
+        journal.close()
+        load_graph('data/graphs/g.json')  # ảnh chụp + nhật ký
+    """
+    
+    def __init__(self, graph: Graph, filepath: str, format: str = None,
+                 resume: bool = False, autoflush: bool = True):
+        """
+        Bắt đầu ghi nhật ký cho đồ thị
+        Args:
+            graph: Đồ thị cần theo dõi
+            filepath: Đường dẫn file ảnh chụp
+            format: Định dạng ảnh chụp ('json', 'txt' hoặc 'bin'), None để chọn theo phần mở rộng
+                (mặc định JSON)
+            resume: True nếu graph vừa được tải từ filepath (ảnh chụp + nhật ký): ghi tiếp
+                vào nhật ký hiện có thay vì ghi lại ảnh chụp. Báo ValueError (không đụng tới
+                file) nếu nhật ký không tồn tại hoặc không khớp ảnh chụp hiện tại
+            autoflush: True để đẩy từng bản ghi xuống file ngay, False để gom đến khi gọi flush
+        """
+        self.graph = graph
+        self.filepath = filepath
+        self.journal_path = filepath + JOURNAL_SUFFIX
+        self.format = format or _format_from_name(filepath) or 'json'
+        if self.format not in ('json', 'txt', 'bin', 'binary'):
+            raise ValueError(f"Định dạng không hỗ trợ ghi nhật ký: {self.format}")
+        self.autoflush = autoflush
+        self._file = None
+        self._snapshot_size = 0
+        
+        if resume:
+            if not self._reopen():
+                raise ValueError(f"Không thể ghi tiếp nhật ký {self.journal_path}: "
+                                 "không tồn tại hoặc không khớp với ảnh chụp")
+        else:
+            self.compact()
+        graph.subscribe(self._on_graph_change, batch=True)
+    
+    def _reopen(self) -> bool:
+        """Mở lại nhật ký hiện có để ghi tiếp, False nếu không có hoặc đã hết hiệu lực"""
+        records = read_journal(self.filepath)
+        if records is None:
+            return False
+        _, end = records
+        self._file = open(self.journal_path, 'r+b')
+        # Cắt bỏ bản ghi ghi dở ở cuối trước khi nối thêm
+        self._file.truncate(end)
+        self._file.seek(end)
+        self._snapshot_size = os.path.getsize(self.filepath)
+        return True
+    
+    @property
+    def size(self) -> int:
+        """Kích thước hiện tại của file nhật ký (byte)"""
+        return self._file.tell() if self._file is not None else 0
+    
+    def _on_graph_change(self, event: str, *args):
+        """
+        Ghi một bản ghi cho mỗi sự kiện thay đổi của đồ thị; sự kiện 'add_edges'
+        (add_edges_from) được ghi thành một loạt bản ghi add_edge trong một lần ghi
+        """
+        if event == 'add_edges':
+            bodies = [_edge_record(u, v, weight) for u, v, weight in args[1]]
+        elif event == 'add_edge':
+            bodies = [_edge_record(args[0], args[1], args[2])]
+        elif event == 'remove_edge':
+            bodies = [bytes((_REMOVE_EDGE,)) + _encode_label(args[0]) + _encode_label(args[1])]
+        elif event == 'add_vertex':
+            bodies = [bytes((_ADD_VERTEX,)) + _encode_label(args[0])]
+        elif event == 'remove_vertex':
+            bodies = [bytes((_REMOVE_VERTEX,)) + _encode_label(args[0])]
+        elif event == 'clear':
+            bodies = [bytes((_CLEAR,))]
+        else:
+            return
+        self._file.write(b''.join(_RECORD_HEADER.pack(len(body), zlib.crc32(body)) + body
+                                  for body in bodies))
+        if self.autoflush:
+            self.flush()
+    
+    def flush(self, sync: bool = False):
+        """
+        Đẩy các bản ghi xuống file; gộp vào ảnh chụp mới nếu nhật ký đã quá lớn
+        Args:
+            sync: True để gọi thêm os.fsync (bền vững khi mất điện)
+        """
+        if self._file is None:
+            return
+        if self.size > max(JOURNAL_COMPACT_MIN_BYTES, JOURNAL_COMPACT_RATIO * self._snapshot_size):
+            self.compact()
+            return
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+    
+    def compact(self):
+        """
+        Ghi ảnh chụp mới của toàn bộ đồ thị và bắt đầu lại nhật ký rỗng
+        Ảnh chụp được ghi ra file tạm rồi đổi tên (os.replace) nên luôn nguyên vẹn;
+        nếu bị ngắt giữa chừng, nhật ký cũ không khớp ảnh chụp mới và bị bỏ qua
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        directory, name = os.path.split(self.filepath)
+        # Giữ nguyên đuôi file để save_graph chọn đúng kiểu nén
+        temp_path = os.path.join(directory, '.tmp-' + name)
+        save_graph(self.graph, temp_path, format=self.format)
+        os.replace(temp_path, self.filepath)
+        
+        self._snapshot_size = os.path.getsize(self.filepath)
+        digest = bytes.fromhex(_file_digest(self.filepath))
+        self._file = open(self.journal_path, 'w+b')
+        self._file.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION,
+                                             self._snapshot_size, digest))
+        self._file.flush()
+    
+    def close(self):
+        """Đẩy các bản ghi còn lại xuống file và ngừng theo dõi đồ thị"""
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+        self.graph.unsubscribe(self._on_graph_change)
+    
+    def __enter__(self) -> 'GraphJournal':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_journal(filepath: str) -> Optional[Tuple[List[tuple], int]]:
+    """
+    Đọc nhật ký của một file ảnh chụp
+    Args:
+        filepath: Đường dẫn file ảnh chụp
+    Returns:
+        Tuple (danh sách thao tác, vị trí kết thúc bản ghi hợp lệ cuối cùng),
+        None nếu không có nhật ký hoặc nhật ký không khớp ảnh chụp hiện tại
+    """
+    journal_path = filepath + JOURNAL_SUFFIX
+    try:
+        with open(journal_path, 'rb') as f:
+            data = f.read()
+        snapshot_size = os.path.getsize(filepath)
+    except OSError:
+        return None
+    if len(data) < JOURNAL_HEADER.size:
+        return None
+    magic, version, size, digest = JOURNAL_HEADER.unpack_from(data)
+    if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION or size != snapshot_size:
+        return None
+    if bytes.fromhex(_file_digest(filepath)) != digest:
+        return None
+    
+    operations = []
+    pos = JOURNAL_HEADER.size
+    while pos + _RECORD_HEADER.size <= len(data):
+        length, checksum = _RECORD_HEADER.unpack_from(data, pos)
+        start = pos + _RECORD_HEADER.size
+        body = data[start:start + length]
+        if len(body) != length or zlib.crc32(body) != checksum:
+            break
+        operations.append(_decode_record(body))
+        pos = start + length
+    return operations, pos
+
+
+def apply_journal(graph: Graph, operations: List[tuple]):
+    """
+    Phát lại các thao tác đã ghi nhật ký lên đồ thị
+    Args:
+        graph: Đồ thị (đã tải từ ảnh chụp)
+        operations: Danh sách thao tác từ read_journal
+    """
+    for operation in operations:
+        code = operation[0]
+        if code == _ADD_EDGE:
+            graph.add_edge(operation[1], operation[2], operation[3])
+        elif code == _REMOVE_EDGE:
+            graph.remove_edge(operation[1], operation[2])
+        elif code == _ADD_VERTEX:
+            graph.add_vertex(operation[1])
+        elif code == _REMOVE_VERTEX:
+            graph.remove_vertex(operation[1])
+        elif code == _CLEAR:
+            graph.clear()
+
+
+def _edge_record(u: Any, v: Any, weight: float) -> bytes:
+    """Nội dung bản ghi thêm cạnh"""
+    return bytes((_ADD_EDGE,)) + _encode_label(u) + _encode_label(v) + _WEIGHT.pack(weight)
+
+
+def _encode_label(label: Any) -> bytes:
+    """Mã hóa nhãn đỉnh: số nguyên 64 bit hoặc JSON"""
+    if type(label) is int and -2**63 <= label < 2**63:
+        return _INT_LABEL.pack(0, label)
+    text = json.dumps(label, ensure_ascii=False).encode('utf-8')
+    return _TEXT_LABEL.pack(1, len(text)) + text
+
+
+def _decode_label(body: bytes, pos: int) -> Tuple[Any, int]:
+    """Giải mã nhãn đỉnh tại vị trí pos, trả về (nhãn, vị trí tiếp theo)"""
+    if body[pos] == 0:
+        return _INT_LABEL.unpack_from(body, pos)[1], pos + _INT_LABEL.size
+    _, length = _TEXT_LABEL.unpack_from(body, pos)
+    start = pos + _TEXT_LABEL.size
+    return json.loads(body[start:start + length].decode('utf-8')), start + length
+
+
+def _decode_record(body: bytes) -> tuple:
+    """Giải mã nội dung một bản ghi thành tuple (mã thao tác, tham số...)"""
+    code = body[0]
+    if code == _CLEAR:
+        return (code,)
+    u, pos = _decode_label(body, 1)
+    if code in (_ADD_VERTEX, _REMOVE_VERTEX):
+        return (code, u)
+    v, pos = _decode_label(body, pos)
+    if code == _REMOVE_EDGE:
+        return (code, u, v)
+    return (code, u, v, _WEIGHT.unpack_from(body, pos)[0])
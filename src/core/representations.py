@@ -1,55 +1,126 @@
 """
-Các lớp biểu diễn đồ thị: Ma trận kề, Danh sách kề, Danh sách cạnh
+Các lớp biểu diễn đồ thị: Ma trận kề, Ma trận thưa, Ma trận bit, Danh sách kề, Danh sách cạnh
 """
-from typing import List, Dict, Tuple
-from src.core.graph import Graph, GraphType
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Tuple, Union
+from src.core.graph import Graph, GraphType, vertex_sort_key
 import numpy as np
 
 
 class AdjacencyMatrix:
     """
     Biểu diễn đồ thị bằng ma trận kề
-    Ma trận kề là một ma trận 2 chiều, trong đó:
+    Ma trận kề là một mảng NumPy 2 chiều n x n, trong đó:
     - matrix[i][j] = trọng số của cạnh từ đỉnh i đến đỉnh j
     - matrix[i][j] = 0 nếu không có cạnh
+    Sau follow_changes(), ma trận tự cập nhật tại chỗ khi đồ thị thay đổi: đỉnh mới được
+    nối vào cuối (bộ đệm tăng gấp đôi khi đầy), đỉnh bị xóa được thay bằng đỉnh cuối cùng
     """
     
-    def __init__(self, graph: Graph):
+    def __init__(self, graph: Graph, dtype=np.float64):
         """
         Khởi tạo ma trận kề từ đồ thị
         Args:
             graph: Đồ thị cần chuyển đổi
+            dtype: Kiểu phần tử (np.float64 hoặc np.float32 để tiết kiệm một nửa bộ nhớ)
         """
         self.graph = graph
+        self.dtype = np.dtype(dtype)
         # Sắp xếp đỉnh: số trước, chữ sau
         try:
-            self.vertices = sorted(graph.get_vertices(), key=lambda x: (isinstance(x, str), x))
-        except:
+            self.vertices = sorted(graph.get_vertices(), key=vertex_sort_key)
+        except TypeError:
             self.vertices = list(graph.get_vertices())
         self.vertex_to_index = {v: i for i, v in enumerate(self.vertices)}
         self.matrix = self._build_matrix()
+        # Bộ đệm có thể lớn hơn n x n; self.matrix là view góc trên bên trái
+        self._buffer = self.matrix
+        self.version = graph.version
+    
+    def follow_changes(self):
+        """
+        Tự cập nhật ma trận tại chỗ theo từng thay đổi của đồ thị
+        (convert_representation gọi cho đối tượng được lưu đệm). Sau một lần thêm
+        hàng loạt (add_edges_from), ma trận ngừng theo dõi và giữ phiên bản cũ để được
+        dựng lại khi cần thay vì áp dụng từng cạnh
+        """
+        if hasattr(self.graph, 'subscribe'):
+            self.graph.subscribe(self._on_graph_change, batch=True)
     
-    def _build_matrix(self) -> List[List[float]]:
+    def _build_matrix(self) -> np.ndarray:
         """
         Xây dựng ma trận kề từ đồ thị
         Returns:
-            Ma trận kề dạng danh sách 2 chiều
+            Ma trận kề dạng mảng NumPy n x n
         """
         n = len(self.vertices)
         # Khởi tạo ma trận với giá trị 0
-        matrix = [[0.0 for _ in range(n)] for _ in range(n)]
+        matrix = np.zeros((n, n), dtype=self.dtype)
+        
+        # Điền trọng số vào ma trận bằng một lần gán theo mảng chỉ số
+        rows, cols, weights = edge_index_arrays(self.graph, self.vertex_to_index)
+        matrix[rows, cols] = weights
+        
+        # Đồ thị vô hướng thì ma trận đối xứng
+        if not self.graph.is_directed():
+            matrix[cols, rows] = weights
         
-        # Điền trọng số vào ma trận
-        for u, v, weight in self.graph.get_edges():
+        return matrix
+    
+    def _on_graph_change(self, event: str, *args):
+        """Áp dụng một thay đổi của đồ thị vào ma trận (xem Graph.subscribe)"""
+        if event == 'add_edge' or event == 'remove_edge':
+            u, v, weight = args[0], args[1], args[2]
+            if event == 'remove_edge':
+                weight = 0
             i = self.vertex_to_index[u]
             j = self.vertex_to_index[v]
-            matrix[i][j] = weight
-            
-            # Đồ thị vô hướng thì ma trận đối xứng
+            self.matrix[i, j] = weight
             if not self.graph.is_directed():
-                matrix[j][i] = weight
-        
-        return matrix
+                self.matrix[j, i] = weight
+        elif event == 'add_vertex':
+            self._append_vertex(args[0])
+        elif event == 'remove_vertex':
+            self._remove_vertex(args[0])
+        elif event == 'clear':
+            self.vertices = []
+            self.vertex_to_index = {}
+            self.matrix = self._buffer = np.zeros((0, 0), dtype=self.dtype)
+        elif event == 'add_edges':
+            # Đánh dấu cũ: convert_representation sẽ dựng lại
+            self.graph.unsubscribe(self._on_graph_change)
+            return
+        self.version = self.graph.version
+    
+    def _append_vertex(self, vertex):
+        """Thêm hàng và cột cho đỉnh mới - O(n) khấu hao"""
+        n = len(self.vertices)
+        if n == self._buffer.shape[0]:
+            capacity = max(4, 2 * n)
+            buffer = np.zeros((capacity, capacity), dtype=self.dtype)
+            buffer[:n, :n] = self.matrix
+            self._buffer = buffer
+        else:
+            # Vùng đệm có thể còn dữ liệu của đỉnh đã xóa
+            self._buffer[n, :n + 1] = 0
+            self._buffer[:n + 1, n] = 0
+        self.vertex_to_index[vertex] = n
+        self.vertices.append(vertex)
+        self.matrix = self._buffer[:n + 1, :n + 1]
+    
+    def _remove_vertex(self, vertex):
+        """Xóa hàng và cột của đỉnh bằng cách chuyển đỉnh cuối vào chỗ trống - O(n)"""
+        i = self.vertex_to_index.pop(vertex)
+        last = len(self.vertices) - 1
+        buffer = self._buffer
+        if i != last:
+            moved = self.vertices[last]
+            buffer[i, :last + 1] = buffer[last, :last + 1]
+            buffer[:last + 1, i] = buffer[:last + 1, last]
+            self.vertices[i] = moved
+            self.vertex_to_index[moved] = i
+        self.vertices.pop()
+        self.matrix = buffer[:last, :last]
     
     def to_adjacency_list(self) -> 'AdjacencyList':
         """
@@ -57,7 +128,7 @@ class AdjacencyMatrix:
         Returns:
             Đối tượng AdjacencyList
         """
-        return AdjacencyList(self.graph)
+        return convert_representation(self.graph, 'list')
     
     def to_edge_list(self) -> 'EdgeList':
         """
@@ -65,29 +136,27 @@ class AdjacencyMatrix:
         Returns:
             Đối tượng EdgeList
         """
-        return EdgeList(self.graph)
+        return convert_representation(self.graph, 'edges')
     
-    def get_matrix(self) -> List[List[float]]:
+    def get_matrix(self, as_list: bool = False) -> Union[np.ndarray, List[List[float]]]:
         """
         Lấy ma trận kề
+        Args:
+            as_list: True để nhận bản sao dạng danh sách 2 chiều
         Returns:
-            Ma trận kề
+            Ma trận kề (mảng NumPy, hoặc list nếu as_list=True)
         """
+        if as_list:
+            return self.matrix.tolist()
         return self.matrix
     
     def print_matrix(self):
         """In ma trận kề ra màn hình"""
         print("Ma trận kề:")
-        print("   ", end="")
-        for v in self.vertices:
-            print(f"{v:4}", end="")
-        print()
+        print("   " + "".join(f"{v:4}" for v in self.vertices))
         
-        for i, v in enumerate(self.vertices):
-            print(f"{v:3}", end="")
-            for j in range(len(self.vertices)):
-                print(f"{self.matrix[i][j]:4.0f}", end="")
-            print()
+        for v, row in zip(self.vertices, self.matrix.tolist()):
+            print(f"{v:3}" + "".join(f"{x:4.0f}" for x in row))
 
 
 class AdjacencyList:
@@ -106,6 +175,7 @@ class AdjacencyList:
         """
         self.graph = graph
         self.adj_list = graph.get_adjacency_list()
+        self.version = graph.version
     
     def to_adjacency_matrix(self) -> AdjacencyMatrix:
         """
@@ -113,7 +183,7 @@ class AdjacencyList:
         Returns:
             Đối tượng AdjacencyMatrix
         """
-        return AdjacencyMatrix(self.graph)
+        return convert_representation(self.graph, 'matrix')
     
     def to_edge_list(self) -> 'EdgeList':
         """
@@ -121,7 +191,7 @@ class AdjacencyList:
         Returns:
             Đối tượng EdgeList
         """
-        return EdgeList(self.graph)
+        return convert_representation(self.graph, 'edges')
     
     def get_list(self) -> Dict[int, Dict[int, float]]:
         """
@@ -147,6 +217,8 @@ class EdgeList:
     Biểu diễn đồ thị bằng danh sách cạnh
     Danh sách cạnh là một list các tuple:
     - Mỗi tuple: (đỉnh_u, đỉnh_v, trọng_số)
+    Sau follow_changes(), danh sách tự cập nhật tại chỗ khi đồ thị thay đổi;
+    sau sort_by_weight, cạnh mới được chèn đúng vị trí để giữ thứ tự
     """
     
     def __init__(self, graph: Graph):
@@ -157,6 +229,18 @@ class EdgeList:
         """
         self.graph = graph
         self.edges = graph.get_edges()
+        # Khóa sắp xếp song song với edges (None = giữ thứ tự của đồ thị, cạnh mới nối vào cuối)
+        self._keys = None
+        self._sign = 1
+        self.version = graph.version
+    
+    def follow_changes(self):
+        """
+        Tự cập nhật danh sách tại chỗ theo từng thay đổi của đồ thị
+        (xem AdjacencyMatrix.follow_changes)
+        """
+        if hasattr(self.graph, 'subscribe'):
+            self.graph.subscribe(self._on_graph_change, batch=True)
     
     def to_adjacency_matrix(self) -> AdjacencyMatrix:
         """
@@ -164,7 +248,7 @@ class EdgeList:
         Returns:
             Đối tượng AdjacencyMatrix
         """
-        return AdjacencyMatrix(self.graph)
+        return convert_representation(self.graph, 'matrix')
     
     def to_adjacency_list(self) -> AdjacencyList:
         """
@@ -172,7 +256,7 @@ class EdgeList:
         Returns:
             Đối tượng AdjacencyList
         """
-        return AdjacencyList(self.graph)
+        return convert_representation(self.graph, 'list')
     
     def get_edges(self) -> List[Tuple[int, int, float]]:
         """
@@ -195,22 +279,445 @@ class EdgeList:
             ascending: True để sắp xếp tăng dần, False để giảm dần
         """
         self.edges.sort(key=lambda x: x[2], reverse=not ascending)
+        self._sign = 1 if ascending else -1
+        self._keys = [self._sign * weight for _, _, weight in self.edges]
+    
+    def _on_graph_change(self, event: str, *args):
+        """Áp dụng một thay đổi của đồ thị vào danh sách cạnh (xem Graph.subscribe)"""
+        if event == 'add_edge':
+            u, v, weight, old_weight = args
+            if old_weight is not None:
+                self._remove_edge(u, v, old_weight)
+            self._insert_edge((u, v, weight))
+        elif event == 'remove_edge':
+            self._remove_edge(*args)
+        elif event == 'remove_vertex':
+            vertex = args[0]
+            self.edges[:] = [edge for edge in self.edges if edge[0] != vertex and edge[1] != vertex]
+            if self._keys is not None:
+                self._keys = [self._sign * weight for _, _, weight in self.edges]
+        elif event == 'clear':
+            self.edges.clear()
+            if self._keys is not None:
+                self._keys = []
+        elif event == 'add_edges':
+            self.graph.unsubscribe(self._on_graph_change)
+            return
+        self.version = self.graph.version
+    
+    def _insert_edge(self, edge: Tuple[int, int, float]):
+        """Thêm cạnh, giữ thứ tự sắp xếp bằng tìm kiếm nhị phân"""
+        if self._keys is None:
+            self.edges.append(edge)
+            return
+        key = self._sign * edge[2]
+        pos = bisect_right(self._keys, key)
+        self._keys.insert(pos, key)
+        self.edges.insert(pos, edge)
+    
+    def _remove_edge(self, u: int, v: int, weight: float):
+        """Xóa cạnh (u, v) có trọng số weight khỏi danh sách"""
+        lo, hi = 0, len(self.edges)
+        if self._keys is not None:
+            key = self._sign * weight
+            lo = bisect_left(self._keys, key)
+            hi = bisect_right(self._keys, key)
+        candidates = [(u, v, weight)]
+        if not self.graph.is_directed():
+            candidates.append((v, u, weight))
+        for edge in candidates:
+            try:
+                pos = self.edges.index(edge, lo, hi)
+            except ValueError:
+                continue
+            del self.edges[pos]
+            if self._keys is not None:
+                del self._keys[pos]
+            return
+
+
+class SparseMatrix:
+    """
+    Biểu diễn đồ thị bằng ma trận kề thưa dạng CSR (Compressed Sparse Row)
+    Chỉ lưu các phần tử khác 0 trong 3 mảng NumPy, bộ nhớ O(V + E):
+    - indptr[i] .. indptr[i + 1]: đoạn chứa các phần tử của hàng i
+    - indices[k]: cột của phần tử thứ k (tăng dần trong mỗi hàng)
+    - data[k]: trọng số của phần tử thứ k
+    Thứ tự hàng/cột giống AdjacencyMatrix nên to_dense() cho đúng ma trận kề
+    """
+    
+    def __init__(self, graph: Graph, dtype=np.float64):
+        """
+        Khởi tạo ma trận thưa từ đồ thị
+        Args:
+            graph: Đồ thị cần chuyển đổi
+            dtype: Kiểu phần tử của data
+        """
+        self.graph = graph
+        self.dtype = np.dtype(dtype)
+        # Sắp xếp đỉnh: số trước, chữ sau
+        try:
+            self.vertices = sorted(graph.get_vertices(), key=vertex_sort_key)
+        except TypeError:
+            self.vertices = list(graph.get_vertices())
+        self.vertex_to_index = {v: i for i, v in enumerate(self.vertices)}
+        n = len(self.vertices)
+        self.shape = (n, n)
+        self._build_arrays()
+        self.version = graph.version
+    
+    def _build_arrays(self):
+        """Dựng các mảng COO rồi nén thành CSR (sắp xếp theo hàng, rồi theo cột)"""
+        n = self.shape[0]
+        rows, cols, weights = edge_index_arrays(self.graph, self.vertex_to_index, both_directions=True)
+        
+        order = np.lexsort((cols, rows))
+        self.row = rows[order]
+        self.indices = cols[order]
+        self.data = weights[order].astype(self.dtype, copy=False)
+        self.indptr = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(np.bincount(self.row, minlength=n), out=self.indptr[1:])
+    
+    @property
+    def nnz(self) -> int:
+        """Số phần tử khác 0"""
+        return len(self.data)
+    
+    def to_coo(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Lấy dạng COO
+        Returns:
+            Tuple (row, col, data)
+        """
+        return self.row, self.indices, self.data
+    
+    def get_row(self, vertex) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Lấy hàng của một đỉnh (view, không sao chép)
+        Args:
+            vertex: Đỉnh cần lấy
+        Returns:
+            Tuple (chỉ số cột, trọng số)
+        """
+        i = self.vertex_to_index[vertex]
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+    
+    def row_slice(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Cắt các hàng start..stop-1 dưới dạng CSR con
+        Args:
+            start: Hàng bắt đầu
+            stop: Hàng kết thúc (không bao gồm)
+        Returns:
+            Tuple (indptr, indices, data) của ma trận con (stop - start) x n
+        """
+        lo, hi = self.indptr[start], self.indptr[stop]
+        return self.indptr[start:stop + 1] - lo, self.indices[lo:hi], self.data[lo:hi]
+    
+    def matvec(self, x) -> np.ndarray:
+        """
+        Tích ma trận - vector A @ x
+        Args:
+            x: Vector độ dài n (theo thứ tự self.vertices)
+        Returns:
+            Vector kết quả độ dài n
+        """
+        x = np.asarray(x, dtype=np.float64)
+        return np.bincount(self.row, weights=self.data * x[self.indices], minlength=self.shape[0])
+    
+    def rmatvec(self, x) -> np.ndarray:
+        """
+        Tích vector - ma trận x @ A (dùng cho các phép lặp kiểu PageRank)
+        Args:
+            x: Vector độ dài n
+        Returns:
+            Vector kết quả độ dài n
+        """
+        x = np.asarray(x, dtype=np.float64)
+        return np.bincount(self.indices, weights=self.data * x[self.row], minlength=self.shape[1])
+    
+    def __matmul__(self, x) -> np.ndarray:
+        return self.matvec(x)
+    
+    def to_dense(self) -> np.ndarray:
+        """
+        Chuyển sang ma trận đặc (chỉ nên dùng với đồ thị nhỏ)
+        Returns:
+            Mảng NumPy n x n
+        """
+        matrix = np.zeros(self.shape, dtype=self.dtype)
+        matrix[self.row, self.indices] = self.data
+        return matrix
+    
+    def to_adjacency_matrix(self) -> AdjacencyMatrix:
+        """
+        Chuyển đổi sang biểu diễn ma trận kề
+        Returns:
+            Đối tượng AdjacencyMatrix
+        """
+        return convert_representation(self.graph, 'matrix')
+    
+    def to_adjacency_list(self) -> AdjacencyList:
+        """
+        Chuyển đổi sang biểu diễn danh sách kề
+        Returns:
+            Đối tượng AdjacencyList
+        """
+        return convert_representation(self.graph, 'list')
+    
+    def print_matrix(self):
+        """In các phần tử khác 0 của ma trận thưa ra màn hình"""
+        print(f"Ma trận thưa {self.shape[0]}x{self.shape[1]}, {self.nnz} phần tử khác 0:")
+        vertices = self.vertices
+        for i, v in enumerate(vertices):
+            start, end = self.indptr[i], self.indptr[i + 1]
+            if start == end:
+                continue
+            cells = zip(self.indices[start:end].tolist(), self.data[start:end].tolist())
+            print(f"{v}: " + " ".join(f"({vertices[j]}, {w})" for j, w in cells))
 
 
-def convert_representation(graph: Graph, target_type: str):
+class BitMatrix:
+    """
+    Biểu diễn đồ thị bằng ma trận kề dạng bit (chỉ lưu có/không có cạnh)
+    Mỗi hàng là một dãy từ 64 bit: bit j của hàng i bằng 1 nếu có cạnh i -> j
+    Bộ nhớ bằng 1/64 ma trận kề float64; phép AND/OR/đếm bit chạy song song theo từ
+    Thứ tự đỉnh giống AdjacencyMatrix
+    """
+    
+    def __init__(self, graph: Graph):
+        """
+        Khởi tạo ma trận bit từ đồ thị
+        Args:
+            graph: Đồ thị cần chuyển đổi
+        """
+        self.graph = graph
+        # Sắp xếp đỉnh: số trước, chữ sau
+        try:
+            self.vertices = sorted(graph.get_vertices(), key=vertex_sort_key)
+        except TypeError:
+            self.vertices = list(graph.get_vertices())
+        self.vertex_to_index = {v: i for i, v in enumerate(self.vertices)}
+        n = len(self.vertices)
+        self.words = (n + 63) // 64
+        self.bits = np.zeros((n, self.words), dtype=np.uint64)
+        
+        rows, cols, _ = edge_index_arrays(graph, self.vertex_to_index, both_directions=True)
+        np.bitwise_or.at(self.bits, (rows, cols >> 6),
+                         np.left_shift(np.uint64(1), (cols & 63).astype(np.uint64)))
+        self.version = graph.version
+    
+    def has_edge(self, u, v) -> bool:
+        """
+        Kiểm tra cạnh (u, v) - O(1)
+        Args:
+            u: Đỉnh xuất phát
+            v: Đỉnh đích
+        Returns:
+            True nếu cạnh tồn tại
+        """
+        i = self.vertex_to_index.get(u)
+        j = self.vertex_to_index.get(v)
+        if i is None or j is None:
+            return False
+        return bool((int(self.bits[i, j >> 6]) >> (j & 63)) & 1)
+    
+    def row(self, vertex) -> np.ndarray:
+        """
+        Hàng bit của một đỉnh (view, không sao chép)
+        Args:
+            vertex: Đỉnh cần lấy
+        Returns:
+            Mảng uint64 độ dài words
+        """
+        return self.bits[self.vertex_to_index[vertex]]
+    
+    def mask(self, vertices) -> np.ndarray:
+        """
+        Dựng dãy bit chứa một tập đỉnh
+        Args:
+            vertices: Các đỉnh cần bật bit
+        Returns:
+            Mảng uint64 độ dài words
+        """
+        result = np.zeros(self.words, dtype=np.uint64)
+        index = np.fromiter((self.vertex_to_index[v] for v in vertices), dtype=np.intp)
+        np.bitwise_or.at(result, index >> 6, np.left_shift(np.uint64(1), (index & 63).astype(np.uint64)))
+        return result
+    
+    def row_and(self, u, v) -> np.ndarray:
+        """Phép AND hai hàng (tập đỉnh kề chung)"""
+        return self.row(u) & self.row(v)
+    
+    def row_or(self, u, v) -> np.ndarray:
+        """Phép OR hai hàng (hợp hai tập đỉnh kề)"""
+        return self.row(u) | self.row(v)
+    
+    def degree(self, vertex) -> int:
+        """Bậc (ra) của đỉnh - đếm bit của hàng"""
+        return popcount(self.row(vertex))
+    
+    def common_neighbor_count(self, u, v) -> int:
+        """
+        Đếm số đỉnh kề chung của u và v
+        Args:
+            u: Đỉnh thứ nhất
+            v: Đỉnh thứ hai
+        Returns:
+            Số đỉnh kề chung
+        """
+        return popcount(self.row_and(u, v))
+    
+    def common_neighbors(self, u, v) -> List[int]:
+        """
+        Danh sách đỉnh kề chung của u và v
+        Args:
+            u: Đỉnh thứ nhất
+            v: Đỉnh thứ hai
+        Returns:
+            Danh sách đỉnh (theo thứ tự self.vertices)
+        """
+        return [self.vertices[j] for j in self._indices_of(self.row_and(u, v))]
+    
+    def contains_all(self, vertex, mask: np.ndarray) -> bool:
+        """
+        Kiểm tra hàng của vertex có chứa toàn bộ các bit trong mask
+        Args:
+            vertex: Đỉnh cần kiểm tra
+            mask: Dãy bit (xem mask())
+        Returns:
+            True nếu vertex kề với mọi đỉnh trong mask
+        """
+        return bool(np.array_equal(self.row(vertex) & mask, mask))
+    
+    def transitive_closure(self) -> 'BitMatrix':
+        """
+        Bao đóng bắc cầu (thuật toán Warshall theo hàng bit): bit (i, j) = 1
+        nếu có đường đi độ dài >= 1 từ i đến j
+        Returns:
+            BitMatrix mới (cùng thứ tự đỉnh)
+        """
+        reach = self.bits.copy()
+        for k in range(len(self.vertices)):
+            has_k = ((reach[:, k >> 6] >> np.uint64(k & 63)) & np.uint64(1)).astype(bool)
+            reach[has_k] |= reach[k]
+        closure = object.__new__(BitMatrix)
+        closure.graph = self.graph
+        closure.vertices = self.vertices
+        closure.vertex_to_index = self.vertex_to_index
+        closure.words = self.words
+        closure.bits = reach
+        closure.version = self.version
+        return closure
+    
+    def to_dense(self) -> np.ndarray:
+        """
+        Chuyển sang ma trận bool n x n
+        Returns:
+            Mảng NumPy kiểu bool
+        """
+        n = len(self.vertices)
+        as_bytes = self.bits.astype('<u8').view(np.uint8)
+        return np.unpackbits(as_bytes, axis=1, bitorder='little')[:, :n].astype(bool)
+    
+    def _indices_of(self, words: np.ndarray) -> List[int]:
+        """Chỉ số các bit đang bật trong một dãy từ"""
+        flags = np.unpackbits(words.astype('<u8').view(np.uint8), bitorder='little')
+        return np.flatnonzero(flags[:len(self.vertices)]).tolist()
+
+
+def popcount(words: np.ndarray) -> int:
+    """
+    Đếm tổng số bit 1 trong mảng uint64
+    Args:
+        words: Mảng NumPy uint64
+    Returns:
+        Số bit 1
+    """
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(words).sum())
+    # NumPy < 2.0: tách thành byte rồi đếm
+    return int(np.unpackbits(np.ascontiguousarray(words).view(np.uint8)).sum())
+
+
+def edge_index_arrays(graph: Graph, vertex_to_index: Dict[int, int],
+                      both_directions: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Chuyển các cạnh thành 3 mảng song song (hàng, cột, trọng số) theo chỉ số đỉnh
+    Args:
+        graph: Đồ thị nguồn (Graph hoặc CSRGraph)
+        vertex_to_index: Ánh xạ {đỉnh: chỉ số}
+        both_directions: True để đồ thị vô hướng có đủ cả 2 chiều của mỗi cạnh
+            (khuyên chỉ xuất hiện 1 lần); đồ thị có hướng không bị ảnh hưởng
+    Returns:
+        Tuple (rows, cols, weights) dạng mảng NumPy
+    """
+    from src.core.csr import CSRGraph
+    if isinstance(graph, CSRGraph):
+        # Ảnh chụp CSR đã có sẵn mảng liên tục: chỉ cần đổi mã đỉnh sang chỉ số
+        # (vô hướng lưu cả 2 chiều nên đã đủ đối xứng)
+        perm = np.fromiter((vertex_to_index[v] for v in graph.labels),
+                           dtype=np.intp, count=len(graph.labels))
+        offsets = np.asarray(graph.offsets, dtype=np.intp)
+        rows = perm[np.repeat(np.arange(len(perm)), np.diff(offsets))]
+        cols = perm[np.asarray(graph.indices, dtype=np.intp)]
+        return rows, cols, np.asarray(graph.weights, dtype=np.float64)
+    
+    rows = []
+    cols = []
+    weights = []
+    for u, v, weight in graph.iter_edges():
+        rows.append(vertex_to_index[u])
+        cols.append(vertex_to_index[v])
+        weights.append(weight)
+    rows = np.array(rows, dtype=np.intp)
+    cols = np.array(cols, dtype=np.intp)
+    weights = np.array(weights, dtype=np.float64)
+    
+    if both_directions and not graph.is_directed():
+        mask = rows != cols
+        rows, cols, weights = (np.concatenate((rows, cols[mask])),
+                               np.concatenate((cols, rows[mask])),
+                               np.concatenate((weights, weights[mask])))
+    return rows, cols, weights
+
+
+# Lớp biểu diễn ứng với từng loại đích của convert_representation
+_REPRESENTATIONS = {
+    'matrix': AdjacencyMatrix,
+    'sparse': SparseMatrix,
+    'bits': BitMatrix,
+    'list': AdjacencyList,
+    'edges': EdgeList,
+}
+
+
+def convert_representation(graph: Graph, target_type: str, use_cache: bool = True):
     """
     Chuyển đổi đồ thị sang dạng biểu diễn khác
+    Kết quả được lưu ngay trên đồ thị (thu hồi cùng đồ thị) và dùng tiếp khi còn khớp
+    phiên bản của đồ thị (ma trận kề và danh sách cạnh được lưu đệm tự cập nhật theo từng
+    thay đổi nhỏ, còn thêm hàng loạt thì được dựng lại); đối tượng dùng chung, không nên
+    sửa trực tiếp
     Args:
         graph: Đồ thị cần chuyển đổi
-        target_type: Loại biểu diễn mục tiêu ('matrix', 'list', 'edges')
+        target_type: Loại biểu diễn mục tiêu ('matrix', 'sparse', 'bits', 'list', 'edges')
+        use_cache: False để luôn dựng đối tượng mới
     Returns:
         Đối tượng biểu diễn tương ứng
     """
-    if target_type.lower() == 'matrix':
-        return AdjacencyMatrix(graph)
-    elif target_type.lower() == 'list':
-        return AdjacencyList(graph)
-    elif target_type.lower() == 'edges':
-        return EdgeList(graph)
-    else:
+    key = target_type.lower()
+    representation = _REPRESENTATIONS.get(key)
+    if representation is None:
         raise ValueError(f"Loại biểu diễn không hợp lệ: {target_type}")
+    products = getattr(graph, '_representations', None)
+    if not use_cache or products is None:
+        return representation(graph)
+    
+    result = products.get(key)
+    if result is None or result.version != graph.version:
+        result = products[key] = representation(graph)
+        if hasattr(result, 'follow_changes'):
+            result.follow_changes()
+    return result
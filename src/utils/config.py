@@ -82,6 +82,16 @@ IMAGE_DIR = 'data/images'          # Thư mục chứa hình ảnh
 GRAPH_FILE_EXTENSION = '.json'     # Phần mở rộng file đồ thị
 IMAGE_FILE_EXTENSION = '.png'      # Phần mở rộng file hình ảnh
 
+# Đọc file lớn
+FILE_READ_CHUNK_SIZE = 1 << 20     # Số ký tự đọc mỗi lần khi phân tích file TXT (1 MiB)
+EDGE_BATCH_SIZE = 1 << 16          # Số cạnh gom lại trước mỗi lần thêm vào đồ thị
+PARALLEL_PARSE_MIN_BYTES = 32 << 20  # File TXT từ kích thước này được phân tích song song khi tải readonly (32 MiB)
+PARALLEL_CHUNKS_PER_WORKER = 4     # Số khối chia cho mỗi tiến trình con
+GRAPH_CACHE_SUFFIX = '.cache.bin'  # Đuôi file cache nhị phân đặt cạnh file nguồn
+JOURNAL_SUFFIX = '.journal'        # Đuôi file nhật ký thay đổi đặt cạnh file đồ thị
+JOURNAL_COMPACT_MIN_BYTES = 1 << 20  # Nhật ký nhỏ hơn mức này không bao giờ bị gộp (1 MiB)
+JOURNAL_COMPACT_RATIO = 0.5        # Gộp nhật ký vào ảnh chụp khi lớn hơn tỉ lệ này của ảnh chụp
+
 # ===== CẤU HÌNH THUẬT TOÁN =====
 # Giá trị vô cực cho các thuật toán
 INFINITY = float('inf')
@@ -159,6 +169,13 @@ def get_all_settings() -> dict:
             'image_dir': IMAGE_DIR,
             'graph_extension': GRAPH_FILE_EXTENSION,
             'image_extension': IMAGE_FILE_EXTENSION,
+            'read_chunk_size': FILE_READ_CHUNK_SIZE,
+            'edge_batch_size': EDGE_BATCH_SIZE,
+            'parallel_parse_min_bytes': PARALLEL_PARSE_MIN_BYTES,
+            'graph_cache_suffix': GRAPH_CACHE_SUFFIX,
+            'journal_suffix': JOURNAL_SUFFIX,
+            'journal_compact_min_bytes': JOURNAL_COMPACT_MIN_BYTES,
+            'journal_compact_ratio': JOURNAL_COMPACT_RATIO,
         }
     }
 
@@ -1,6 +1,8 @@
 """Hàm tiện ích: validate, thống kê, random graph"""
 import random
-from typing import Dict, List, Tuple, Optional
+import weakref
+from collections import deque
+from typing import Dict, List, Tuple, Optional, Callable, Any
 from src.core.graph import Graph, GraphType
 from src.utils.config import (
     RANDOM_GRAPH_MIN_VERTICES, RANDOM_GRAPH_MAX_VERTICES,
@@ -9,8 +11,38 @@ from src.utils.config import (
 )
 
 
+# Bộ nhớ đệm kết quả thống kê: {đồ_thị: (phiên_bản, {tên: kết_quả})}
+# Tự động hết hạn khi đồ thị thay đổi phiên bản hoặc bị thu hồi
+_stats_cache: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def cached_by_version(graph: Graph, key: str, compute: Callable[[Graph], Any]) -> Any:
+    """
+    Tính compute(graph) một lần cho mỗi phiên bản của đồ thị
+    Args:
+        graph: Đồ thị (cần có thuộc tính version)
+        key: Tên kết quả cần lưu
+        compute: Hàm tính kết quả từ đồ thị
+    Returns:
+        Kết quả đã lưu hoặc vừa tính
+    """
+    entry = _stats_cache.get(graph)
+    if entry is None or entry[0] != graph.version:
+        entry = (graph.version, {})
+        _stats_cache[graph] = entry
+    results = entry[1]
+    if key not in results:
+        results[key] = compute(graph)
+    return results[key]
+
+
 def validate_graph(graph: Graph) -> Tuple[bool, str]:
     """Kiểm tra hợp lệ - trả về (valid, error_msg)"""
+    return cached_by_version(graph, 'validate', _validate_graph)
+
+
+def _validate_graph(graph: Graph) -> Tuple[bool, str]:
+    """Phần tính toán của validate_graph (không dùng bộ nhớ đệm)"""
     if graph.vertex_count() == 0:
         return False, "Đồ thị không có đỉnh nào"
     if graph.vertex_count() > MAX_VERTICES:
@@ -18,7 +50,7 @@ def validate_graph(graph: Graph) -> Tuple[bool, str]:
     if graph.edge_count() > MAX_EDGES:
         return False, f"Số lượng cạnh vượt quá giới hạn ({MAX_EDGES})"
     
-    for u, v, weight in graph.get_edges():
+    for u, v, weight in graph.iter_edges():
         if weight < 0:
             return False, f"Cạnh ({u}, {v}) có trọng số âm: {weight}"
     
@@ -26,20 +58,23 @@ def validate_graph(graph: Graph) -> Tuple[bool, str]:
 
 
 def get_graph_info(graph: Graph) -> Dict[str, any]:
-    """Thống kê đồ thị - trả về dict chứa các thông tin"""
+    """Thống kê đồ thị - trả về dict chứa các thông tin (tính lại chỉ khi đồ thị thay đổi)"""
+    return dict(cached_by_version(graph, 'info', _get_graph_info))
+
+
+def _get_graph_info(graph: Graph) -> Dict[str, any]:
+    """Phần tính toán của get_graph_info (không dùng bộ nhớ đệm)"""
     vertices = graph.get_vertices()
-    edges = graph.get_edges()
     degrees = {v: graph.get_degree(v) for v in vertices}
     
     min_degree = min(degrees.values()) if degrees else 0
     max_degree = max(degrees.values()) if degrees else 0
     avg_degree = sum(degrees.values()) / len(degrees) if degrees else 0
-    total_weight = sum(weight for _, _, weight in edges)
+    total_weight = graph.total_weight()
     
     # Tìm trọng số nhỏ nhất và lớn nhất
-    weights = [weight for _, _, weight in edges]
-    min_weight = min(weights) if weights else 0
-    max_weight = max(weights) if weights else 0
+    min_weight = min((weight for _, _, weight in graph.iter_edges()), default=0)
+    max_weight = max((weight for _, _, weight in graph.iter_edges()), default=0)
     
     return {
         'vertex_count': graph.vertex_count(),
@@ -87,14 +122,15 @@ def generate_random_graph(
     for i in range(num_vertices):
         graph.add_vertex(i)
     
-    # Thêm các cạnh ngẫu nhiên
+    # Thêm các cạnh ngẫu nhiên (một lượt)
     vertices = graph.get_vertices()
-    for i, u in enumerate(vertices):
-        for v in vertices[i+1:]:
-            # Tạo cạnh với xác suất edge_probability
-            if random.random() < edge_probability:
-                weight = random.uniform(min_weight, max_weight)
-                graph.add_edge(u, v, round(weight, 2))
+    graph.add_edges_from(
+        (u, v, round(random.uniform(min_weight, max_weight), 2))
+        for i, u in enumerate(vertices)
+        for v in vertices[i+1:]
+        # Tạo cạnh với xác suất edge_probability
+        if random.random() < edge_probability
+    )
     
     return graph
 
@@ -107,6 +143,10 @@ def copy_graph(graph: Graph) -> Graph:
     Returns:
         Đồ thị mới (bản sao)
     """
+    # Graph hỗ trợ bản sao copy-on-write, không cần dựng lại từng cạnh
+    if isinstance(graph, Graph):
+        return graph.copy()
+    
     # Tạo đồ thị mới cùng loại
     new_graph = Graph(graph.graph_type)
     
@@ -115,8 +155,7 @@ def copy_graph(graph: Graph) -> Graph:
         new_graph.add_vertex(vertex)
     
     # Sao chép các cạnh
-    for u, v, weight in graph.get_edges():
-        new_graph.add_edge(u, v, weight)
+    new_graph.add_edges_from(graph.iter_edges())
     
     return new_graph
 
@@ -135,12 +174,12 @@ def is_connected(graph: Graph) -> bool:
     
     # BFS từ đỉnh đầu tiên
     visited = set()
-    queue = [vertices[0]]
+    queue = deque([vertices[0]])
     visited.add(vertices[0])
     
     while queue:
-        current = queue.pop(0)
-        for neighbor in graph.get_neighbors(current):
+        current = queue.popleft()
+        for neighbor in graph.iter_neighbors(current):
             if neighbor not in visited:
                 visited.add(neighbor)
                 queue.append(neighbor)
@@ -180,14 +219,14 @@ def get_connected_components(graph: Graph) -> List[List[int]]:
         if vertex not in visited:
             # BFS từ đỉnh chưa thăm
             component = []
-            queue = [vertex]
+            queue = deque([vertex])
             visited.add(vertex)
             
             while queue:
-                current = queue.pop(0)
+                current = queue.popleft()
                 component.append(current)
                 
-                for neighbor in graph.get_neighbors(current):
+                for neighbor in graph.iter_neighbors(current):
                     if neighbor not in visited:
                         visited.add(neighbor)
                         queue.append(neighbor)
@@ -197,14 +236,19 @@ def get_connected_components(graph: Graph) -> List[List[int]]:
     return components
 
 
-def reverse_graph(graph: Graph) -> Graph:
+def reverse_graph(graph: Graph, copy: bool = True) -> Graph:
     """
     Đảo ngược hướng của tất cả các cạnh (chỉ áp dụng cho đồ thị có hướng)
     Args:
         graph: Đồ thị cần đảo ngược
+        copy: False để trả về góc nhìn đảo chiều chỉ-đọc ReversedGraphView (không sao chép
+            cạnh, kể cả với đồ thị vô hướng)
     Returns:
         Đồ thị đảo ngược
     """
+    if not copy:
+        return graph.reverse_view()
+    
     if not graph.is_directed():
         return copy_graph(graph)
     
@@ -215,8 +259,7 @@ def reverse_graph(graph: Graph) -> Graph:
         reversed_graph.add_vertex(vertex)
     
     # Đảo ngược các cạnh
-    for u, v, weight in graph.get_edges():
-        reversed_graph.add_edge(v, u, weight)
+    reversed_graph.add_edges_from((v, u, weight) for u, v, weight in graph.iter_edges())
     
     return reversed_graph
 
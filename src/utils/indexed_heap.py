@@ -0,0 +1,169 @@
+"""
+Hàng đợi ưu tiên có chỉ mục (d-ary heap) hỗ trợ giảm khóa
+Dùng khi gọi dijkstra(..., decrease_key=True) và prim(..., decrease_key=True): hàng đợi
+chỉ giữ O(V) phần tử thay vì O(E) bản ghi của heapq, nhưng heap viết bằng Python nên
+chậm hơn heapq; mặc định vẫn là heapq
+- dijkstra trên CSRGraph không hỗ trợ decrease_key (báo ValueError)
+- dijkstra_with_callback và prim_with_callback luôn dùng heapq: các sự kiện trực quan hóa
+  được phát theo từng bản ghi lấy ra khỏi heap
+"""
+from typing import List, Tuple
+
+
+class IndexedHeap:
+    """
+    Heap d-phân chứa các phần tử là số nguyên 0..capacity-1 (vd: mã đỉnh), mỗi phần tử
+    xuất hiện tối đa một lần cùng khóa của nó
+    - decrease_key cập nhật khóa tại chỗ thay vì đẩy bản ghi trùng (heapq + xóa lười),
+      nên heap luôn có tối đa capacity phần tử
+    - Phần tử có khóa bằng nhau được lấy theo thứ tự mã tăng dần (giống heapq với (khóa, mã))
+    """
+    
+    def __init__(self, capacity: int, arity: int = 4):
+        """
+        Khởi tạo heap rỗng
+        Args:
+            capacity: Số phần tử tối đa (phần tử hợp lệ là 0..capacity-1)
+            arity: Số con của mỗi nút (4 thường nhanh hơn heap nhị phân vì cây thấp hơn)
+        """
+        if arity < 2:
+            raise ValueError("arity phải >= 2")
+        self.arity = arity
+        self._heap: List[int] = []                # Các phần tử theo thứ tự heap
+        self._keys: List[float] = [0.0] * capacity  # Khóa theo phần tử
+        self._position: List[int] = [-1] * capacity  # Vị trí trong _heap, -1 nếu không có
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+    
+    def __contains__(self, item: int) -> bool:
+        return self._position[item] >= 0
+    
+    def key(self, item: int) -> float:
+        """Khóa hiện tại của phần tử (phần tử phải đang ở trong heap)"""
+        if self._position[item] < 0:
+            raise KeyError(item)
+        return self._keys[item]
+    
+    def peek(self) -> Tuple[int, float]:
+        """Phần tử có khóa nhỏ nhất (không lấy ra)"""
+        item = self._heap[0]
+        return item, self._keys[item]
+    
+    def push(self, item: int, key: float):
+        """
+        Thêm phần tử mới
+        Args:
+            item: Phần tử (chưa có trong heap)
+            key: Khóa
+        """
+        if self._position[item] >= 0:
+            raise ValueError(f"Phần tử {item} đã có trong heap")
+        self._keys[item] = key
+        self._position[item] = len(self._heap)
+        self._heap.append(item)
+        self._sift_up(len(self._heap) - 1)
+    
+    def decrease_key(self, item: int, key: float):
+        """
+        Giảm khóa của phần tử đang có trong heap
+        Args:
+            item: Phần tử
+            key: Khóa mới (không lớn hơn khóa hiện tại)
+        """
+        position = self._position[item]
+        if position < 0:
+            raise KeyError(item)
+        if key > self._keys[item]:
+            raise ValueError("Khóa mới lớn hơn khóa hiện tại")
+        self._keys[item] = key
+        self._sift_up(position)
+    
+    def push_or_decrease(self, item: int, key: float) -> bool:
+        """
+        Thêm phần tử, hoặc giảm khóa nếu phần tử đã có và key nhỏ hơn khóa hiện tại
+        Returns:
+            True nếu heap thay đổi
+        """
+        position = self._position[item]
+        if position < 0:
+            self.push(item, key)
+            return True
+        if key < self._keys[item]:
+            self._keys[item] = key
+            self._sift_up(position)
+            return True
+        return False
+    
+    def pop(self) -> Tuple[int, float]:
+        """
+        Lấy ra phần tử có khóa nhỏ nhất
+        Returns:
+            Tuple (phần_tử, khóa)
+        """
+        heap = self._heap
+        top = heap[0]
+        last = heap.pop()
+        self._position[top] = -1
+        if heap:
+            heap[0] = last
+            self._position[last] = 0
+            self._sift_down(0)
+        return top, self._keys[top]
+    
+    def _sift_up(self, position: int):
+        """Đẩy phần tử tại position lên cho đến khi không nhỏ hơn nút cha"""
+        heap = self._heap
+        keys = self._keys
+        positions = self._position
+        arity = self.arity
+        item = heap[position]
+        key = keys[item]
+        while position > 0:
+            parent_position = (position - 1) // arity
+            parent = heap[parent_position]
+            parent_key = keys[parent]
+            if key < parent_key or (key == parent_key and item < parent):
+                heap[position] = parent
+                positions[parent] = position
+                position = parent_position
+            else:
+                break
+        heap[position] = item
+        positions[item] = position
+    
+    def _sift_down(self, position: int):
+        """Đẩy phần tử tại position xuống cho đến khi không lớn hơn các nút con"""
+        heap = self._heap
+        keys = self._keys
+        positions = self._position
+        arity = self.arity
+        size = len(heap)
+        item = heap[position]
+        key = keys[item]
+        while True:
+            first = position * arity + 1
+            if first >= size:
+                break
+            # Tìm con nhỏ nhất
+            best = first
+            best_item = heap[first]
+            best_key = keys[best_item]
+            for child in range(first + 1, min(first + arity, size)):
+                child_item = heap[child]
+                child_key = keys[child_item]
+                if child_key < best_key or (child_key == best_key and child_item < best_item):
+                    best = child
+                    best_item = child_item
+                    best_key = child_key
+            if best_key < key or (best_key == key and best_item < item):
+                heap[position] = best_item
+                positions[best_item] = position
+                position = best
+            else:
+                break
+        heap[position] = item
+        positions[item] = position
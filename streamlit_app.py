@@ -6,7 +6,6 @@
 import streamlit as st
 import networkx as nx
 import plotly.graph_objects as go
-import json
 import random
 import time
 from io import BytesIO, StringIO
@@ -21,10 +20,11 @@ except ImportError:
 
 # Import các module từ project
 from src.core.graph import Graph, GraphType
-from src.core.representations import AdjacencyMatrix, AdjacencyList, EdgeList
-from src.core.file_io import graph_to_dict, dict_to_graph
+from src.core.representations import convert_representation
+from src.core.file_io import read_json, read_txt, write_json
+from src.utils.helpers import cached_by_version
 from src.algorithms.traversal import bfs, dfs
-from src.algorithms.shortest_path import dijkstra, find_shortest_path
+from src.algorithms.shortest_path import dijkstra, find_shortest_path, euclidean_heuristic
 from src.algorithms.bipartite import is_bipartite, get_bipartite_sets
 from src.algorithms.minimum_spanning_tree import prim, kruskal, prim_with_callback, kruskal_with_callback
 from src.algorithms.max_flow import ford_fulkerson
@@ -371,62 +371,7 @@ def graph_to_txt_string(graph: Graph) -> str:
 
 def txt_string_to_graph(txt_content: str) -> Graph:
     """Chuyển chuỗi TXT thành đồ thị"""
-    lines = [line.strip() for line in txt_content.strip().split('\n') if line.strip() and not line.strip().startswith('#')]
-    
-    if not lines:
-        raise ValueError("File rỗng hoặc không hợp lệ")
-    
-    graph_type_str = lines[0].lower()
-    graph_type = GraphType.DIRECTED if graph_type_str == 'directed' else GraphType.UNDIRECTED
-    graph = Graph(graph_type)
-    
-    idx = 1
-    # Bỏ qua số đỉnh nếu có
-    if idx < len(lines):
-        try:
-            int(lines[idx])
-            idx += 1
-        except ValueError:
-            pass
-    
-    # Đọc đỉnh (nếu tất cả trên một dòng)
-    if idx < len(lines):
-        parts = lines[idx].split()
-        if len(parts) > 2 or (len(parts) <= 2 and not any(c.isdigit() and '.' not in lines[idx] for c in lines[idx])):
-            # Nhiều phần tử = danh sách đỉnh
-            for v_str in parts:
-                try:
-                    v = int(v_str)
-                except ValueError:
-                    v = v_str
-                graph.add_vertex(v)
-            idx += 1
-    
-    # Bỏ qua số cạnh nếu có
-    if idx < len(lines):
-        try:
-            int(lines[idx])
-            idx += 1
-        except ValueError:
-            pass
-    
-    # Đọc các cạnh
-    while idx < len(lines):
-        parts = lines[idx].split()
-        if len(parts) >= 2:
-            try:
-                u = int(parts[0])
-            except ValueError:
-                u = parts[0]
-            try:
-                v = int(parts[1])
-            except ValueError:
-                v = parts[1]
-            weight = float(parts[2]) if len(parts) > 2 else 1.0
-            graph.add_edge(u, v, weight)
-        idx += 1
-    
-    return graph
+    return read_txt(StringIO(txt_content))
 
 
 def create_graph_figure(graph: Graph, 
@@ -636,9 +581,13 @@ def parse_vertex(vertex_str: str):
 
 
 def get_graph_info_dict(graph: Graph) -> dict:
-    """Lấy thông tin đồ thị dạng dict"""
+    """Lấy thông tin đồ thị dạng dict (chỉ tính lại khi đồ thị thay đổi)"""
+    return dict(cached_by_version(graph, 'streamlit_info', _compute_graph_info_dict))
+
+
+def _compute_graph_info_dict(graph: Graph) -> dict:
+    """Tính thông tin đồ thị cho get_graph_info_dict"""
     vertices = graph.get_vertices()
-    edges = graph.get_edges()
     
     if not vertices:
         return {
@@ -660,11 +609,11 @@ def get_graph_info_dict(graph: Graph) -> dict:
     return {
         'type': 'Có hướng' if graph.is_directed() else 'Vô hướng',
         'vertices': len(vertices),
-        'edges': len(edges),
+        'edges': graph.edge_count(),
         'avg_degree': avg_degree,
         'min_degree': min(degrees) if degrees else 0,
         'max_degree': max(degrees) if degrees else 0,
-        'total_weight': sum(w for _, _, w in edges),
+        'total_weight': graph.total_weight(),
         'is_connected': is_connected
     }
 
@@ -803,8 +752,9 @@ def main():
             file_format = st.radio("Định dạng:", ["JSON", "TXT"], horizontal=True)
             
             if file_format == "JSON":
-                graph_data = graph_to_dict(st.session_state.graph)
-                json_str = json.dumps(graph_data, indent=2, ensure_ascii=False)
+                json_buffer = StringIO()
+                write_json(st.session_state.graph, json_buffer)
+                json_str = json_buffer.getvalue()
                 st.download_button(
                     label="Tải xuống (JSON)",
                     data=json_str,
@@ -829,8 +779,7 @@ def main():
                 file_name = uploaded_file.name.lower()
                 
                 if file_name.endswith('.json'):
-                    data = json.loads(file_content)
-                    st.session_state.graph = dict_to_graph(data)
+                    st.session_state.graph = read_json(StringIO(file_content))
                 else:
                     st.session_state.graph = txt_string_to_graph(file_content)
                 
@@ -1004,7 +953,14 @@ def main():
                         end_v = st.selectbox("Đến:", vertices, key="sp_end")
                     
                     if st.button("Tìm đường", use_container_width=True, key="run_sp"):
-                        path, distance = find_shortest_path(st.session_state.graph, start_v, end_v)
+                        graph = st.session_state.graph
+                        pos = st.session_state.get('pos')
+                        if pos:
+                            # Có tọa độ vẽ: A* với heuristic Euclid
+                            path, distance = find_shortest_path(graph, start_v, end_v, method='astar',
+                                                                heuristic=euclidean_heuristic(graph, pos))
+                        else:
+                            path, distance = find_shortest_path(graph, start_v, end_v)
                         st.session_state.last_result = {
                             'type': 'Shortest Path',
                             'path': path,
@@ -1335,7 +1291,7 @@ def main():
             with rep_tabs[0]:
                 st.markdown("#### Ma trận kề (Adjacency Matrix)")
                 
-                adj_matrix = AdjacencyMatrix(st.session_state.graph)
+                adj_matrix = convert_representation(st.session_state.graph, 'matrix')
                 vertices = adj_matrix.vertices
                 matrix = adj_matrix.get_matrix()
                 
@@ -1354,14 +1310,14 @@ def main():
                 with st.expander("Xem dạng văn bản"):
                     header = "     " + "".join([f"{v:>6}" for v in vertices])
                     st.code(header)
-                    for i, v in enumerate(vertices):
-                        row = f"{v:>4} |" + "".join([f"{matrix[i][j]:>6.1f}" for j in range(len(vertices))])
+                    for v, values in zip(vertices, matrix.tolist()):
+                        row = f"{v:>4} |" + "".join([f"{x:>6.1f}" for x in values])
                         st.code(row)
             
             with rep_tabs[1]:
                 st.markdown("#### Danh sách kề (Adjacency List)")
                 
-                adj_list = AdjacencyList(st.session_state.graph)
+                adj_list = convert_representation(st.session_state.graph, 'list')
                 adj_dict = adj_list.get_list()
                 
                 for vertex in sorted(adj_dict.keys(), key=str):
@@ -1380,7 +1336,7 @@ def main():
             with rep_tabs[2]:
                 st.markdown("#### Danh sách cạnh (Edge List)")
                 
-                edge_list = EdgeList(st.session_state.graph)
+                edge_list = convert_representation(st.session_state.graph, 'edges')
                 edges = edge_list.get_edges()
                 
                 st.write(f"**Tổng số cạnh:** {len(edges)}")
@@ -1,13 +1,31 @@
 """
 Test các thuật toán để đảm bảo hoạt động đúng
 """
+import gc
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import weakref
+from io import StringIO
+import numpy as np
 from src.core.graph import Graph, GraphType
-from src.algorithms.traversal import bfs, dfs
-from src.algorithms.shortest_path import dijkstra, find_shortest_path
+from src.core.csr import CSRGraph
+from src.core.representations import convert_representation, AdjacencyMatrix, BitMatrix
+from src.algorithms.traversal import bfs, dfs, bfs_shortest_path
+from src.algorithms.shortest_path import (dijkstra, find_shortest_path, astar, floyd_warshall,
+                                         floyd_warshall_matrix, floyd_warshall_path,
+                                         euclidean_heuristic)
 from src.algorithms.minimum_spanning_tree import prim, kruskal
 from src.algorithms.max_flow import ford_fulkerson
 from src.algorithms.eulerian import is_eulerian, fleury, hierholzer
 from src.algorithms.bipartite import is_bipartite
+from src.utils.config import GRAPH_CACHE_SUFFIX, JOURNAL_SUFFIX
+from src.core.journal import GraphJournal, read_journal
+from src.core.file_io import (save_graph, load_graph, read_txt, read_json, write_json, graph_to_dict,
+                              import_from_txt_parallel, detect_compression)
+from src.core.dataset_formats import export_to_dimacs_max, import_from_dimacs_max, export_to_snap
 
 print("="*60)
 print("TEST CÁC THUẬT TOÁN")
@@ -112,6 +130,595 @@ elif euler_type == 'path':
 else:
     print("    Euler hoạt động đúng (không có đường đi)")
 
+# Test 7: Ảnh chụp CSR
+print("\n7. TEST ẢNH CHỤP CSR")
+csr = g2.freeze()
+csr_path, csr_distance = find_shortest_path(csr, 'a', 'd')
+assert (csr_path, csr_distance) == (path, distance)
+assert bfs(csr, 'a') == bfs(g2, 'a')
+print(f"   Dijkstra trên CSR: {csr_path}, độ dài {csr_distance}")
+# Sau khi xóa đỉnh (mã nội bộ bị hoán vị) ảnh chụp vẫn giữ thứ tự get_vertices()
+g_removed = Graph()
+g_removed.add_edges_from([(v, (v + 1) % 6, v + 1) for v in range(6)] + [(0, 3, 2), (1, 4, 7), (2, 5, 3)])
+g_removed.remove_vertex(0)
+g_removed.add_edge(6, 2, 4)
+csr_removed = g_removed.freeze()
+assert csr_removed.get_vertices() == g_removed.get_vertices()
+assert is_bipartite(csr_removed) == is_bipartite(g_removed)
+assert prim(csr_removed) == prim(g_removed)
+assert dfs(csr_removed, 1) == dfs(g_removed, 1)
+print("    Ảnh chụp CSR hoạt động đúng")
+
+# Test 8: A*
+print("\n8. TEST A*")
+pos2 = {'a': (0, 0), 'b': (1, 0), 'c': (2, 1), 'd': (3, 0)}
+astar_path, astar_distance = astar(g2, 'a', 'd', pos=pos2)
+assert astar_distance == distance
+print(f"   A* theo tọa độ: {astar_path}, độ dài {astar_distance}")
+# Thiếu tọa độ của w: cạnh x-w, w-t không được tính vào hệ số, heuristic phải về 0
+g_partial = Graph()
+g_partial.add_edges_from([('s', 'x', 10), ('x', 'w', 1), ('w', 't', 1), ('s', 't', 15)])
+_, partial_distance = astar(g_partial, 's', 't', pos={'s': (0, 0), 'x': (0, 10), 't': (1, 0)})
+assert partial_distance == dijkstra(g_partial, 's')[0]['t'] == 12
+print(f"   A* khi thiếu tọa độ: độ dài {partial_distance}")
+# Hệ số được lưu đệm theo (phiên bản, pos): dời đỉnh bằng pos mới hoặc thêm cạnh phải tính lại
+g_scale = Graph()
+g_scale.add_edge('p', 'q', 2)
+pos_scale = {'p': (0, 0), 'q': (1, 0)}
+assert euclidean_heuristic(g_scale, pos_scale)('p', 'q') == 2.0
+assert euclidean_heuristic(g_scale, pos_scale)('p', 'q') == 2.0
+assert euclidean_heuristic(g_scale, {'p': (0, 0), 'q': (2, 0)})('p', 'q') == 2.0
+g_scale.add_edge('q', 'r', 1)
+assert euclidean_heuristic(g_scale, pos_scale)('p', 'q') == 0.0  # r thiếu tọa độ
+pos_scale = dict(pos_scale, r=(2, 0))
+assert euclidean_heuristic(g_scale, pos_scale)('p', 'q') == 1.0
+print("    A* hoạt động đúng")
+
+
+def random_graph(graph_type, n, m, seed, max_weight=10):
+    """Đồ thị ngẫu nhiên n đỉnh, tối đa m cạnh trọng số nguyên dương (dùng cho các test dưới)"""
+    rng = random.Random(seed)
+    graph = Graph(graph_type)
+    for v in range(n):
+        graph.add_vertex(v)
+    graph.add_edges_from((rng.randrange(n), rng.randrange(n), rng.randint(1, max_weight))
+                         for _ in range(m))
+    return graph
+
+
+# Test 9: Tìm kiếm hai chiều
+print("\n9. TEST TÌM KIẾM HAI CHIỀU")
+for graph_type in (GraphType.UNDIRECTED, GraphType.DIRECTED):
+    g9 = random_graph(graph_type, 40, 80, seed=9)
+    for s in range(0, 40, 7):
+        distances = dijkstra(g9, s)[0]
+        for t in range(40):
+            bi_path, bi_distance = find_shortest_path(g9, s, t, method='bidirectional')
+            assert bi_distance == distances[t]
+            if bi_path is not None:
+                assert bi_path[0] == s and bi_path[-1] == t
+                assert sum(g9.get_weight(u, v) for u, v in zip(bi_path, bi_path[1:])) == bi_distance
+            one_way = bfs_shortest_path(g9, s, t)
+            two_way = bfs_shortest_path(g9, s, t, method='bidirectional')
+            assert (one_way is None) == (two_way is None)
+            if two_way is not None:
+                assert len(two_way) == len(one_way)
+                assert all(g9.has_edge(u, v) for u, v in zip(two_way, two_way[1:]))
+g_negative = Graph(GraphType.DIRECTED)
+g_negative.add_edges_from([('a', 'b', 2), ('b', 'c', -1), ('a', 'c', 2)])
+try:
+    find_shortest_path(g_negative, 'a', 'c', method='bidirectional')
+    assert False, "Dijkstra hai chiều phải từ chối trọng số âm"
+except ValueError:
+    pass
+print("   Dijkstra/BFS hai chiều khớp với tìm kiếm một chiều")
+print("    Tìm kiếm hai chiều hoạt động đúng")
+
+
+def edge_set(graph):
+    """Tập cạnh chuẩn hóa (vô hướng: đầu nhỏ trước) để so sánh đồ thị sau khi đọc/ghi"""
+    if graph.is_directed():
+        return {(u, v, float(w)) for u, v, w in graph.iter_edges()}
+    return {(min(u, v), max(u, v), float(w)) for u, v, w in graph.iter_edges()}
+
+
+def weight_types(graph):
+    """Tập kiểu dữ liệu của các trọng số cạnh"""
+    return {type(w) for _, _, w in graph.iter_edges()}
+
+
+def same_graph(a, b):
+    """Hai đồ thị có cùng loại, tập đỉnh và tập cạnh"""
+    return (a.graph_type == b.graph_type and set(a.get_vertices()) == set(b.get_vertices())
+            and edge_set(a) == edge_set(b))
+
+
+# Test 10: Đọc/ghi file
+print("\n10. TEST ĐỌC/GHI FILE")
+g10_list = [random_graph(GraphType.UNDIRECTED, 30, 60, seed=10),
+            random_graph(GraphType.DIRECTED, 30, 60, seed=11)]
+with tempfile.TemporaryDirectory() as tmp_dir:
+    for g10 in g10_list:
+        name = os.path.join(tmp_dir, g10.graph_type.value)
+        
+        # TXT: đọc theo khối nhỏ, bỏ qua dòng trống và comment
+        save_graph(g10, name + '.txt')
+        assert same_graph(load_graph(name + '.txt'), g10)
+        with open(name + '.txt') as f:
+            text = f.read()
+        assert same_graph(read_txt(StringIO('# comment\n\n' + text), chunk_size=7), g10)
+        # Phân tích song song: chỉ chạy khi tiến trình con được fork, vì script này
+        # không có khối if __name__ == '__main__' cho cách khởi tạo spawn
+        if multiprocessing.get_start_method() == 'fork':
+            parallel = import_from_txt_parallel(name + '.txt', workers=2)
+            assert same_graph(parallel, g10)
+            assert parallel.get_vertices() == load_graph(name + '.txt').get_vertices()
+            assert edge_set(import_from_txt_parallel(name + '.txt', workers=2, readonly=True)) \
+                == edge_set(g10)
+        
+        # Nhị phân CSR: đọc thành Graph, hoặc mmap thành CSRGraph chỉ-đọc
+        save_graph(g10, name + '.bin')
+        assert same_graph(load_graph(name + '.bin'), g10)
+        mapped = load_graph(name + '.bin', readonly=True)
+        assert isinstance(mapped, CSRGraph) and edge_set(mapped) == edge_set(g10)
+        assert dijkstra(mapped, 0) == dijkstra(g10, 0)
+        del mapped
+        
+        # JSON: ghi dạng luồng (cùng nội dung với graph_to_dict), đọc lại theo khối nhỏ
+        save_graph(g10, name + '.json')
+        assert same_graph(load_graph(name + '.json'), g10)
+        buffer = StringIO()
+        write_json(g10, buffer, indent=4)
+        expected = graph_to_dict(g10)
+        assert json.loads(buffer.getvalue()) == {key: expected[key]
+                                                 for key in ('graph_type', 'vertices', 'edges')}
+        assert same_graph(read_json(StringIO(buffer.getvalue()), chunk_size=5), g10)
+        
+        # File nén: nhận biết qua đuôi file và magic bytes
+        for suffix in ('.json.gz', '.txt.bz2', '.bin.xz'):
+            save_graph(g10, name + suffix)
+            assert same_graph(load_graph(name + suffix), g10)
+        os.replace(name + '.json.gz', name + '.packed')
+        assert detect_compression(name + '.packed') == 'gzip'
+        assert same_graph(load_graph(name + '.packed', format='json'), g10)
+    # Dạng TXT cũ: mỗi đỉnh một dòng, không được nhầm với phần đầu "n / đỉnh / m"
+    legacy = read_txt(StringIO('DIRECTED\n1\n2\n3\n4\n1 2 5\n'))
+    assert legacy.get_vertices() == [1, 2, 3, 4] and legacy.get_edges() == [(1, 2, 5.0)]
+    assert read_txt(StringIO('UNDIRECTED\n1\n2\n3\n')).get_vertices() == [1, 2, 3]
+    save_graph(g2, os.path.join(tmp_dir, 'labels.bin'))
+    assert same_graph(load_graph(os.path.join(tmp_dir, 'labels.bin')), g2)
+    
+    # Cache nhị phân đặt cạnh file nguồn: chỉ tạo khi bật cache=True
+    source = os.path.join(tmp_dir, 'cached.txt')
+    save_graph(g10_list[0], source)
+    load_graph(source)
+    assert not os.path.exists(source + GRAPH_CACHE_SUFFIX)
+    assert same_graph(load_graph(source, cache=True), g10_list[0])
+    assert os.path.exists(source + GRAPH_CACHE_SUFFIX)
+    assert same_graph(load_graph(source, cache=True), g10_list[0])
+    os.utime(source, ns=(0, 0))  # Chỉ đổi mtime: nội dung trùng mã băm, cache vẫn dùng được
+    assert same_graph(load_graph(source, cache=True, readonly=True).to_graph(), g10_list[0])
+    save_graph(g10_list[1], source)  # Nguồn thay đổi: phải phân tích lại
+    assert same_graph(load_graph(source, cache=True), g10_list[1])
+    
+    # Trọng số nguyên vẫn là int sau mọi định dạng (kể cả cache và CSR), số thực vẫn là float
+    assert weight_types(load_graph(source, cache=True)) == {int}
+    g_float = Graph()
+    g_float.add_edges_from([(1, 2, 2.5), (2, 3, 1)])
+    for suffix in ('.txt', '.json', '.bin', '.bin.gz'):
+        path = os.path.join(tmp_dir, 'types' + suffix)
+        save_graph(g10_list[0], path)
+        assert weight_types(load_graph(path)) == weight_types(load_graph(path, readonly=True)) == {int}
+        save_graph(g_float, path)
+        assert load_graph(path).get_weight(1, 2) == 2.5
+        assert load_graph(path, readonly=True).get_weight(1, 2) == 2.5
+    if multiprocessing.get_start_method() == 'fork':
+        save_graph(g10_list[0], os.path.join(tmp_dir, 'types.txt'))
+        assert weight_types(import_from_txt_parallel(os.path.join(tmp_dir, 'types.txt'), workers=2,
+                                                     readonly=True)) == {int}
+print("   Đồ thị giữ nguyên sau khi ghi rồi đọc lại")
+print("    Đọc/ghi file hoạt động đúng")
+
+# Test 11: Nhật ký thay đổi
+print("\n11. TEST NHẬT KÝ THAY ĐỔI")
+with tempfile.TemporaryDirectory() as tmp_dir:
+    snapshot = os.path.join(tmp_dir, 'journal.json')
+    g11 = random_graph(GraphType.DIRECTED, 20, 40, seed=20)
+    journal = GraphJournal(g11, snapshot)
+    g11.add_edge(0, 'mới', 2.5)
+    g11.add_edge(0, 'mới', 4.0)  # Cập nhật trọng số
+    g11.remove_vertex(3)
+    g11.remove_edge(*next(iter(g11.iter_edges()))[:2])
+    g11.add_vertex('lẻ')
+    journal.close()
+    # Các thay đổi nằm trong nhật ký, ảnh chụp chưa đổi
+    assert read_journal(snapshot)[0] and 'mới' not in load_graph(snapshot, journal=False).get_vertices()
+    assert same_graph(load_graph(snapshot), g11)
+    
+    # Ghi tiếp vào nhật ký sau khi tải lại; bản ghi ghi dở ở cuối bị bỏ qua
+    g11 = load_graph(snapshot)
+    with GraphJournal(g11, snapshot, resume=True):
+        g11.add_edges_from([(1, 2, 7.0), (2, 1, 8.0), ('n1', 'n2', 1.0)])
+    # Thêm hàng loạt giữ đường nhanh: một bản ghi mỗi cạnh, đỉnh mới không có bản ghi riêng
+    assert [op[1:] for op in read_journal(snapshot)[0][-3:]] == [(1, 2, 7.0), (2, 1, 8.0), ('n1', 'n2', 1.0)]
+    with open(snapshot + JOURNAL_SUFFIX, 'ab') as f:
+        f.write(b'\x10\x00')
+    assert same_graph(load_graph(snapshot), g11)
+    
+    # Gộp: ảnh chụp mới chứa mọi thay đổi, nhật ký rỗng
+    g11 = load_graph(snapshot)
+    journal = GraphJournal(g11, snapshot, resume=True)
+    g11.clear()
+    g11.add_edge('x', 'y', 1.0)
+    journal.compact()
+    assert read_journal(snapshot)[0] == []
+    journal.close()
+    assert same_graph(load_graph(snapshot, journal=False), g11)
+    
+    # Ảnh chụp bị ghi đè ở nơi khác: nhật ký cũ hết hiệu lực và không được ghi tiếp
+    with GraphJournal(g11, snapshot):
+        g11.add_edge('y', 'z', 2.0)
+    save_graph(random_graph(GraphType.DIRECTED, 5, 5, seed=21), snapshot)
+    before = open(snapshot).read()
+    assert read_journal(snapshot) is None and 'z' not in load_graph(snapshot).get_vertices()
+    try:
+        GraphJournal(load_graph(snapshot), snapshot, resume=True)
+        assert False, "Không được ghi tiếp nhật ký không khớp ảnh chụp"
+    except ValueError:
+        pass
+    assert open(snapshot).read() == before
+print("   Ảnh chụp + nhật ký khớp với đồ thị sau mỗi bước")
+print("    Nhật ký thay đổi hoạt động đúng")
+
+
+def matrix_entries(representation):
+    """Các ô khác 0 của ma trận kề theo nhãn đỉnh {(u, v): trọng_số}"""
+    vertices = representation.vertices
+    rows, cols = representation.matrix.nonzero()
+    return {(vertices[i], vertices[j]): representation.matrix[i, j] for i, j in zip(rows, cols)}
+
+
+# Test 12: Bộ đệm biểu diễn
+print("\n12. TEST BỘ ĐỆM BIỂU DIỄN")
+g12 = random_graph(GraphType.UNDIRECTED, 15, 30, seed=12)
+sparse = convert_representation(g12, 'sparse')
+assert convert_representation(g12, 'sparse') is sparse
+assert convert_representation(g12, 'sparse', use_cache=False) is not sparse
+g12.add_edge(0, 1, 9)
+assert convert_representation(g12, 'sparse') is not sparse  # Phiên bản đổi: dựng lại
+convert_representation(g12, 'matrix')
+convert_representation(g12.freeze(), 'bits')
+g12_ref = weakref.ref(g12)
+del g12, sparse
+gc.collect()
+assert g12_ref() is None  # Bộ đệm không giữ đồ thị sống
+
+# Ma trận kề và danh sách cạnh được lưu đệm cập nhật tại chỗ theo từng thay đổi
+g12 = random_graph(GraphType.DIRECTED, 15, 30, seed=13)
+matrix = convert_representation(g12, 'matrix')
+edges = convert_representation(g12, 'edges')
+edges.sort_by_weight()
+AdjacencyMatrix(g12)  # Đối tượng không lưu đệm không theo dõi đồ thị
+g12.add_edge(0, 'mới', 4)
+g12.add_edge(1, 2, 6)
+g12.remove_vertex(5)
+g12.remove_edge(*next(iter(g12.iter_edges()))[:2])
+assert convert_representation(g12, 'matrix') is matrix
+assert matrix_entries(matrix) == matrix_entries(AdjacencyMatrix(g12))
+assert convert_representation(g12, 'edges') is edges
+assert len(edges.get_edges()) == g12.edge_count() and set(edges.get_edges()) == set(g12.get_edges())
+assert all(a[2] <= b[2] for a, b in zip(edges.get_edges(), edges.get_edges()[1:]))  # Vẫn đúng thứ tự
+# Thêm hàng loạt: giữ đường thêm nhanh, lần chuyển đổi sau dựng lại đối tượng mới
+g12.add_edges_from([(i, i + 1, 1) for i in range(20, 40)])
+assert convert_representation(g12, 'matrix') is not matrix
+assert matrix_entries(convert_representation(g12, 'matrix')) == matrix_entries(AdjacencyMatrix(g12))
+assert set(convert_representation(g12, 'edges').get_edges()) == set(g12.get_edges())
+print("   Kết quả chuyển đổi được dùng lại, cập nhật tại chỗ và thu hồi cùng đồ thị")
+print("    Bộ đệm biểu diễn hoạt động đúng")
+
+# Test 13: Floyd-Warshall
+print("\n13. TEST FLOYD-WARSHALL")
+for graph_type in (GraphType.UNDIRECTED, GraphType.DIRECTED):
+    g13 = random_graph(graph_type, 25, 50, seed=25)
+    fw_distances, _ = floyd_warshall(g13)
+    dist_matrix, next_matrix, fw_vertices = floyd_warshall_matrix(g13)
+    for s in g13.get_vertices():
+        distances = dijkstra(g13, s)[0]
+        for t in g13.get_vertices():
+            assert fw_distances[(s, t)] == distances[t]
+            fw_path = floyd_warshall_path(next_matrix, fw_vertices, s, t)
+            if distances[t] == float('inf'):
+                assert fw_path is None
+            else:
+                assert fw_path[0] == s and fw_path[-1] == t
+                assert sum(g13.get_weight(u, v) for u, v in zip(fw_path, fw_path[1:])) == distances[t]
+print("   Floyd-Warshall khớp với Dijkstra từ mọi đỉnh")
+print("    Floyd-Warshall hoạt động đúng")
+
+# Test 14: Định dạng bộ dữ liệu chuẩn
+print("\n14. TEST ĐỊNH DẠNG BỘ DỮ LIỆU")
+
+
+def relabel(graph, mapping, graph_type=None):
+    """Bản sao đồ thị với nhãn đỉnh đổi theo mapping (tùy chọn đổi loại đồ thị)"""
+    result = Graph(graph_type or graph.graph_type)
+    for v in graph.get_vertices():
+        result.add_vertex(mapping[v])
+    for u, v, w in graph.iter_edges():
+        result.add_edge(mapping[u], mapping[v], w)
+        if graph_type is not None and not graph.is_directed():
+            result.add_edge(mapping[v], mapping[u], w)
+    return result
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    for graph_type in (GraphType.UNDIRECTED, GraphType.DIRECTED):
+        g14 = random_graph(graph_type, 20, 50, seed=19)
+        g14.add_vertex(20)  # Đỉnh cô lập
+        # DIMACS/Matrix Market đánh số lại đỉnh 0..20 thành 1..21 theo get_vertices()
+        one_based = {v: i for i, v in enumerate(g14.get_vertices(), 1)}
+        save_graph(g14, os.path.join(tmp, 'g.gr'))
+        assert same_graph(load_graph(os.path.join(tmp, 'g.gr')),
+                          relabel(g14, one_based, GraphType.DIRECTED))  # Cạnh vô hướng thành 2 cung
+        save_graph(g14, os.path.join(tmp, 'g.mtx.gz'))
+        assert same_graph(load_graph(os.path.join(tmp, 'g.mtx.gz')), relabel(g14, one_based))
+        # SNAP giữ nhãn và trọng số (mặc định) nhưng bỏ đỉnh cô lập
+        save_graph(g14, os.path.join(tmp, 'g.snap'), format='snap')
+        g_snap = load_graph(os.path.join(tmp, 'g.snap'), format='snap')
+        assert g_snap.graph_type == graph_type and edge_set(g_snap) == edge_set(g14)
+        assert 20 not in g_snap.get_vertices()
+    
+    g_flow = random_graph(GraphType.DIRECTED, 15, 40, seed=19)
+    export_to_dimacs_max(g_flow, os.path.join(tmp, 'g.max'), 0, 14)
+    g_max, source, sink = import_from_dimacs_max(os.path.join(tmp, 'g.max'))
+    assert (source, sink) == (1, 15) and same_graph(g_max, relabel(g_flow, {v: v + 1 for v in range(15)}))
+    # Trọng số đều bằng 1: không ghi cột trọng số, nhãn chuỗi được giữ nguyên
+    g_unit = Graph()
+    g_unit.add_edges_from([('a', 'b', 1), ('b', 'c', 1)])
+    export_to_snap(g_unit, os.path.join(tmp, 'unit.txt'))
+    with open(os.path.join(tmp, 'unit.txt')) as f:
+        assert f.read().splitlines()[-1] == 'b\tc'
+    assert same_graph(load_graph(os.path.join(tmp, 'unit.txt'), format='snap'), g_unit)
+print("   DIMACS (.gr, .max), Matrix Market và SNAP đọc lại đúng đồ thị đã ghi")
+print("    Định dạng bộ dữ liệu hoạt động đúng")
+
+# Test 15: Hàng đợi giảm khóa
+print("\n15. TEST HÀNG ĐỢI GIẢM KHÓA")
+for seed in range(5):
+    for graph_type in (GraphType.UNDIRECTED, GraphType.DIRECTED):
+        g15 = random_graph(graph_type, 60, 200, seed=seed)
+        for s in (0, 30):
+            distances, _ = dijkstra(g15, s)
+            heap_distances, heap_parent = dijkstra(g15, s, decrease_key=True)
+            assert heap_distances == distances
+            # Đường bằng nhau có thể khác cha, nhưng mỗi cha phải nằm trên một đường ngắn nhất
+            for v, p in heap_parent.items():
+                if p is not None:
+                    assert distances[p] + g15.get_weight(p, v) == distances[v]
+        if graph_type == GraphType.UNDIRECTED:
+            mst, total = prim(g15, 0)
+            heap_mst, heap_total = prim(g15, 0, decrease_key=True)
+            assert heap_total == total and len(heap_mst) == len(mst)
+try:
+    dijkstra(g15.freeze(), 0, decrease_key=True)
+    assert False, "CSRGraph không hỗ trợ decrease_key"
+except ValueError:
+    pass
+print("   decrease_key=True cho cùng khoảng cách và tổng trọng số cây khung như heapq")
+print("    Hàng đợi giảm khóa hoạt động đúng")
+
+# Test 16: Ma trận bit
+print("\n16. TEST MA TRẬN BIT")
+for graph_type in (GraphType.UNDIRECTED, GraphType.DIRECTED):
+    g16 = random_graph(graph_type, 150, 300, seed=12)  # Hơn 2 từ 64 bit mỗi hàng
+    bits = convert_representation(g16, 'bits')
+    assert isinstance(bits, BitMatrix)
+    neighbors = {v: set(g16.get_neighbors(v)) for v in g16.get_vertices()}
+    rng16 = random.Random(12)
+    for _ in range(300):
+        u, v = rng16.randrange(150), rng16.randrange(150)
+        assert bits.has_edge(u, v) == (v in neighbors[u])
+        assert bits.degree(u) == len(neighbors[u])
+        assert set(bits.common_neighbors(u, v)) == neighbors[u] & neighbors[v]
+        assert bits.common_neighbor_count(u, v) == len(neighbors[u] & neighbors[v])
+        assert bits.contains_all(u, bits.mask(neighbors[u] & neighbors[v]))
+    assert not bits.has_edge(0, 'không có')
+    assert int(bits.to_dense().sum()) == sum(len(targets) for targets in neighbors.values())
+    # Bao đóng bắc cầu: t đạt được từ s qua đường độ dài >= 1 (BFS từ các đỉnh kề của s)
+    closure = bits.transitive_closure()
+    for s in range(0, 150, 7):
+        reach = set()
+        for v in neighbors[s]:
+            if v not in reach:
+                reach.update(bfs(g16, v))
+        assert {t for t in range(150) if closure.has_edge(s, t)} == reach
+print("   has_edge, bậc, đỉnh kề chung và bao đóng bắc cầu khớp với đồ thị gốc")
+print("    Ma trận bit hoạt động đúng")
+
+# Test 17: Dừng sớm khi tìm đường tới một đích
+print("\n17. TEST DỪNG SỚM CỦA FIND_SHORTEST_PATH")
+for seed in range(3):
+    for graph_type in (GraphType.UNDIRECTED, GraphType.DIRECTED):
+        g17 = random_graph(graph_type, 40, 70, seed=seed)
+        g17.add_vertex('cô lập')  # Đích không đến được
+        for graph in (g17, g17.freeze()):
+            for s in (0, 13):
+                distances = dijkstra(g17, s)[0]
+                for t in g17.get_vertices():
+                    early_path, early_distance = find_shortest_path(graph, s, t)
+                    assert early_distance == distances[t]
+                    if distances[t] == float('inf'):
+                        assert early_path is None
+                    else:
+                        assert early_path[0] == s and early_path[-1] == t
+                        assert sum(g17.get_weight(u, v) for u, v in zip(early_path, early_path[1:])) \
+                            == distances[t]
+print("   Đường đi và độ dài khớp với Dijkstra đầy đủ, kể cả đích không đến được")
+print("    Dừng sớm hoạt động đúng")
+
+# Test 18: Cấu trúc dữ liệu đồ thị (so với dict tham chiếu {u: {v: trọng_số}})
+print("\n18. TEST CẤU TRÚC DỮ LIỆU ĐỒ THỊ")
+
+
+def random_operations(graph, reference, rng, steps):
+    """Áp dụng cùng các thao tác thêm/xóa ngẫu nhiên lên graph và dict tham chiếu"""
+    undirected = not graph.is_directed()
+    for _ in range(steps):
+        operation = rng.random()
+        u, v = rng.randrange(25), rng.randrange(25)
+        if operation < 0.6:
+            weight = rng.randint(1, 9)
+            graph.add_edge(u, v, weight)
+            reference.setdefault(u, {})[v] = weight
+            reference.setdefault(v, {})
+            if undirected:
+                reference[v][u] = weight
+        elif operation < 0.8:
+            graph.remove_edge(u, v)
+            reference.get(u, {}).pop(v, None)
+            if undirected:
+                reference.get(v, {}).pop(u, None)
+        elif operation < 0.95:
+            graph.remove_vertex(u)
+            if reference.pop(u, None) is not None:
+                for targets in reference.values():
+                    targets.pop(u, None)
+        else:
+            graph.add_vertex(u)
+            reference.setdefault(u, {})
+
+
+# Chỉ mục ngược: đỉnh vào và bậc vào sau mọi thao tác (kể cả remove_vertex)
+for track in (True, False):
+    g18 = Graph(GraphType.DIRECTED, track_predecessors=track)
+    reference = {}
+    random_operations(g18, reference, random.Random(3), 400)
+    reverse = g18.reverse_view()
+    for v in reference:
+        predecessors = {u for u, targets in reference.items() if v in targets}
+        assert set(g18.get_predecessors(v)) == set(reverse.get_neighbors(v)) == predecessors
+        assert g18.in_degree(v) == reverse.out_degree(v) == len(predecessors)
+print("   Chỉ mục ngược khớp với tham chiếu sau khi thêm/xóa cạnh và đỉnh")
+
+# Bộ đếm: số cạnh, tổng trọng số, bậc và phiên bản sau thêm/xóa/clear
+for graph_type in (GraphType.UNDIRECTED, GraphType.DIRECTED):
+    g18 = Graph(graph_type)
+    reference = {}
+    rng18 = random.Random(4)
+    for _ in range(20):
+        version = g18.version
+        random_operations(g18, reference, rng18, 20)
+        assert g18.version > version
+        pairs = {(u, v) if graph_type == GraphType.DIRECTED else frozenset((u, v))
+                 for u, targets in reference.items() for v in targets}
+        assert g18.edge_count() == len(pairs) == len(g18.get_edges())
+        assert g18.total_weight() == sum(w for _, _, w in g18.iter_edges())
+        assert all(g18.get_degree(v) == len(targets) for v, targets in reference.items())
+    version = g18.version
+    g18.remove_edge('không có', 0)
+    assert g18.version == version  # Không thay đổi: phiên bản giữ nguyên
+    g18.clear()
+    assert (g18.edge_count(), g18.total_weight(), g18.vertex_count()) == (0, 0, 0) and g18.version > version
+print("   Bộ đếm số cạnh, tổng trọng số và phiên bản luôn khớp sau thêm/xóa/clear")
+
+# Bộ duyệt không cấp phát: cùng nội dung với các hàm trả về list và với tham chiếu
+for graph_type in (GraphType.UNDIRECTED, GraphType.DIRECTED):
+    g18 = Graph(graph_type)
+    reference = {}
+    random_operations(g18, reference, random.Random(5), 300)
+    assert list(g18.iter_edges()) == g18.get_edges()
+    for v, targets in reference.items():
+        assert dict(g18.neighbor_items(v)) == targets
+        assert list(g18.iter_neighbors(v)) == g18.get_neighbors(v)
+    assert list(g18.neighbor_items('không có')) == [] and list(g18.iter_neighbors('không có')) == []
+print("   iter_edges, iter_neighbors và neighbor_items khớp với tham chiếu")
+
+# Thêm hàng loạt: tuple, mảng NumPy song song và trọng số mặc định giống add_edge lặp lại
+for graph_type in (GraphType.UNDIRECTED, GraphType.DIRECTED):
+    rng18 = random.Random(6)
+    edges = [(rng18.randrange(30), rng18.randrange(30), rng18.randint(1, 9)) for _ in range(200)]
+    one_by_one = Graph(graph_type)
+    for u, v, w in edges:
+        one_by_one.add_edge(u, v, w)
+    bulk = Graph(graph_type)
+    assert bulk.add_edges_from(edges[:100]) == 100
+    bulk.add_edges_from(sources=np.array([e[0] for e in edges[100:]]),
+                        targets=np.array([e[1] for e in edges[100:]]),
+                        weights=np.array([e[2] for e in edges[100:]]))
+    assert bulk.get_vertices() == one_by_one.get_vertices() and bulk.get_edges() == one_by_one.get_edges()
+    assert (bulk.edge_count(), bulk.total_weight()) == (one_by_one.edge_count(), one_by_one.total_weight())
+    assert all(type(u) is int and type(w) is int for u, _, w in bulk.iter_edges())  # Không giữ kiểu NumPy
+    if graph_type == GraphType.DIRECTED:
+        assert all(bulk.get_predecessors(v) == one_by_one.get_predecessors(v) for v in bulk.get_vertices())
+    unweighted = Graph(graph_type)
+    unweighted.add_edges_from([(u, v) for u, v, _ in edges], default_weight=2)
+    assert all(w == 2 for _, _, w in unweighted.iter_edges())
+print("   add_edges_from (tuple, mảng NumPy, trọng số mặc định) giống add_edge lặp lại")
+
+# Bản sao copy-on-write: sửa một phía (kể cả hàng loạt) không ảnh hưởng phía kia
+for graph_type in (GraphType.UNDIRECTED, GraphType.DIRECTED):
+    original = Graph(graph_type)
+    reference = {}
+    random_operations(original, reference, random.Random(7), 200)
+    clone = original.copy()
+    clone_reference = {v: dict(targets) for v, targets in reference.items()}
+    random_operations(clone, clone_reference, random.Random(8), 150)
+    random_operations(original, reference, random.Random(9), 150)
+    clone.add_edges_from([(30, 0, 5), (0, 31, 6)])
+    for u, v, w in ((30, 0, 5), (0, 31, 6)):
+        clone_reference.setdefault(u, {})[v] = w
+        clone_reference.setdefault(v, {})
+        if graph_type == GraphType.UNDIRECTED:
+            clone_reference[v][u] = w
+    for graph, expected in ((original, reference), (clone, clone_reference)):
+        assert set(graph.get_vertices()) == set(expected)
+        assert all(dict(graph.neighbor_items(v)) == targets for v, targets in expected.items())
+        assert graph.total_weight() == sum(w for _, _, w in graph.iter_edges())
+        if graph_type == GraphType.DIRECTED:
+            assert all(set(graph.get_predecessors(v)) == {u for u in expected if v in expected[u]}
+                       for v in expected)
+print("   Bản sao và đồ thị gốc độc lập sau khi sửa ở cả hai phía")
+
+
+def dense_reference(reference, vertices):
+    """Ma trận kề dày dựng từng ô từ dict tham chiếu theo thứ tự vertices"""
+    matrix = np.zeros((len(vertices), len(vertices)))
+    for i, u in enumerate(vertices):
+        for j, v in enumerate(vertices):
+            matrix[i, j] = reference[u].get(v, 0)
+    return matrix
+
+
+# Ma trận kề NumPy: mọi ô khớp với tham chiếu, vô hướng thì đối xứng
+for graph_type in (GraphType.UNDIRECTED, GraphType.DIRECTED):
+    g18 = Graph(graph_type)
+    reference = {}
+    random_operations(g18, reference, random.Random(10), 300)
+    adjacency = AdjacencyMatrix(g18)
+    assert adjacency.vertices == sorted(reference)
+    assert np.array_equal(adjacency.matrix, dense_reference(reference, adjacency.vertices))
+    if graph_type == GraphType.UNDIRECTED:
+        assert np.array_equal(adjacency.matrix, adjacency.matrix.T)
+print("   AdjacencyMatrix khớp từng ô với tham chiếu")
+
+# Ma trận thưa: dạng đặc, tích ma trận - vector và từng hàng khớp với ma trận dày
+for graph_type in (GraphType.UNDIRECTED, GraphType.DIRECTED):
+    g18 = Graph(graph_type)
+    reference = {}
+    random_operations(g18, reference, random.Random(11), 300)
+    sparse18 = convert_representation(g18, 'sparse')
+    dense = dense_reference(reference, sparse18.vertices)
+    x = np.random.default_rng(11).random(len(sparse18.vertices))
+    assert np.array_equal(sparse18.to_dense(), dense)
+    assert sparse18.nnz == np.count_nonzero(dense)
+    assert np.allclose(sparse18.matvec(x), dense @ x) and np.allclose(sparse18 @ x, dense @ x)
+    assert np.allclose(sparse18.rmatvec(x), x @ dense)
+    for i, v in enumerate(sparse18.vertices):
+        columns, values = sparse18.get_row(v)
+        assert dict(zip(columns.tolist(), values.tolist())) == {j: dense[i, j] for j in np.flatnonzero(dense[i])}
+print("   SparseMatrix khớp với ma trận dày (to_dense, matvec, rmatvec, get_row)")
+print("    Cấu trúc dữ liệu đồ thị hoạt động đúng")
+
 print("\n" + "="*60)
 print("TẤT CẢ THUẬT TOÁN HOẠT ĐỘNG ĐÚNG!")
 print("="*60)